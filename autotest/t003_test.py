@@ -1,5 +1,8 @@
 import flopy
 import os
+import shutil
+import numpy as np
+from flopy.utils.snapshot import load_snapshot
 
 def test_loadfreyberg():
     cwd = os.getcwd()
@@ -38,6 +41,110 @@ def test_loadtwrip():
     assert ml.load_fail is False
     return
 
+def test_loadfreyberg_parallel():
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    namefile = 'freyberg.nam'
+    ml = flopy.modflow.Modflow.load(namefile, model_ws=pth, check=False)
+    mlp = flopy.modflow.Modflow.load(namefile, model_ws=pth, check=False,
+                                     parallel=4)
+    assert mlp.load_fail is False
+    assert mlp.get_package_list() == ml.get_package_list()
+    assert list(mlp.load_times.keys()) == list(ml.load_times.keys())
+    assert (mlp.lpf.hk.array == ml.lpf.hk.array).all()
+    assert (mlp.wel.stress_period_data[0] ==
+            ml.wel.stress_period_data[0]).all()
+    assert mlp.output_fnames == ml.output_fnames
+    assert mlp.output_units == ml.output_units
+    assert mlp.external_fnames == ml.external_fnames
+    assert sorted(mlp.package_units) == sorted(ml.package_units)
+
+    # entries with the same file type do not replace each other
+    item = flopy.utils.mfreadnam.NamData('WEL', 'second.wel', None, {})
+    mlp._report_load(item, 0.)
+    assert mlp.load_times['WEL:second.wel'] == 0.
+    assert 'WEL' in mlp.load_times
+    return
+
+def test_loadlazy():
+    model_ws = os.path.join('temp', 't003')
+    m = flopy.modflow.Modflow('lazy', model_ws=model_ws, external_path='ref')
+    flopy.modflow.ModflowDis(m, nlay=2, nrow=10, ncol=12, nper=2)
+    flopy.modflow.ModflowBas(m)
+    hk = np.random.random((2, 10, 12)).astype(np.float32)
+    flopy.modflow.ModflowLpf(m, hk=hk, ipakcb=53)
+    flopy.modflow.ModflowWel(m, stress_period_data={0: [[0, 1, 1, -5.]]},
+                             ipakcb=53)
+    flopy.modflow.ModflowOc(m)
+    flopy.modflow.ModflowPcg(m)
+    m.write_input()
+
+    ml = flopy.modflow.Modflow.load('lazy.nam', model_ws=model_ws,
+                                    check=False)
+    mll = flopy.modflow.Modflow.load('lazy.nam', model_ws=model_ws,
+                                     lazy=True)
+
+    # only dis and bas6 are loaded
+    assert mll.get_package_list() == ml.get_package_list()
+    assert list(mll.load_times.keys()) == ['DIS', 'BAS6']
+
+    # packages and open/close arrays are loaded on access
+    u2d = mll.lpf.hk[0]
+    assert list(mll.load_times.keys()) == ['DIS', 'BAS6', 'LPF']
+    assert u2d.vtype == str
+    assert np.allclose(mll.lpf.hk.array, hk)
+
+    # the package list loads the remaining packages
+    assert [p.name[0] for p in mll.packagelist] == ml.get_package_list()
+    assert mll.output_units == ml.output_units
+    assert mll.external_units == ml.external_units
+    return
+
+
+def test_loadsnapshot():
+    model_ws = os.path.join('temp', 't003', 'snapshot')
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    if not os.path.isdir(model_ws):
+        os.makedirs(model_ws)
+    for f in os.listdir(pth):
+        if os.path.isfile(os.path.join(pth, f)):
+            shutil.copy(os.path.join(pth, f), model_ws)
+    snapshot = os.path.join(model_ws, 'freyberg.snapshot')
+    for ext in ('.json', '.dat'):
+        if os.path.isfile(snapshot + ext):
+            os.remove(snapshot + ext)
+
+    # the first call loads the input files and saves the snapshot
+    ml = flopy.modflow.Modflow.load_snapshot('freyberg.nam',
+                                             model_ws=model_ws, check=False)
+    assert os.path.isfile(snapshot + '.json')
+    assert len(ml.load_times) > 0
+
+    # the second call loads the snapshot
+    ms = flopy.modflow.Modflow.load_snapshot('freyberg.nam',
+                                             model_ws=model_ws, check=False)
+    assert ms is not ml
+    assert ms.get_package_list() == ml.get_package_list()
+    assert np.array_equal(ms.lpf.hk.array, ml.lpf.hk.array)
+    assert np.array_equal(ms.wel.stress_period_data[0],
+                          ml.wel.stress_period_data[0])
+
+    # a new snapshot replaces the files, the loaded model keeps its data
+    shutil.copy(snapshot + '.json', snapshot + '.old.json')
+    ml.save_snapshot(snapshot)
+    assert np.array_equal(ms.lpf.hk.array, ml.lpf.hk.array)
+    assert load_snapshot(snapshot) is not None
+    # the data file is not read with the manifest of another snapshot
+    shutil.copy(snapshot + '.old.json', snapshot + '.json')
+    assert load_snapshot(snapshot) is None
+    ml.save_snapshot(snapshot)
+
+    # the snapshot is not used when an input file changes
+    f = open(os.path.join(model_ws, 'freyberg.wel'), 'a')
+    f.write('\n')
+    f.close()
+    assert load_snapshot(snapshot) is None
+    return
+
 
 if __name__ == '__main__':
     test_loadfreyberg()
@@ -3,6 +3,7 @@ import shutil
 import numpy as np
 import flopy
 from flopy.utils.util_array import Util2d, Util3d, Transient2d, Transient3d
+from flopy.utils.util_array import ArrayFormat
 
 out_dir = os.path.join("temp", "t004")
 if os.path.exists(out_dir):
@@ -30,6 +31,80 @@ def test_transient2d():
     assert np.array_equal(m4d, m4d2)
 
 
+def test_transient2d_compact():
+    ml = flopy.modflow.Modflow()
+    dis = flopy.modflow.ModflowDis(ml, nrow=10, ncol=12, nper=6)
+    a = np.random.random((10, 12)).astype(np.float32)
+    rech = {1: np.zeros((10, 12), dtype=np.float32) + 1.0e-3,
+            2: a, 3: a.copy(), 5: 2.0e-3}
+    # by default every entry is kept as given
+    t2d = Transient2d(ml, (10, 12), np.float32, rech, "rech")
+    assert sorted(t2d.transient_2ds.keys()) == [1, 2, 3, 5]
+    assert t2d[1].vtype == np.ndarray
+    kper_index, arrays = t2d.get_compact()
+    assert list(kper_index) == [0, 1, 2, 3, 3, 4]
+
+    t2d = Transient2d(ml, (10, 12), np.float32, rech, "rech", compact=True)
+
+    # identical periods are reused and uniform arrays are constants
+    assert sorted(t2d.transient_2ds.keys()) == [1, 2, 5]
+    assert t2d.get_kper_entry(3)[0] == -1
+    assert t2d[1].vtype == np.float32
+
+    kper_index, arrays = t2d.get_compact()
+    assert list(kper_index) == [0, 1, 2, 2, 2, 3]
+    assert len(arrays) == 4
+    for arr in arrays:
+        assert not arr.flags.writeable
+
+    view = t2d.array_view
+    dense = t2d.array
+    assert view.shape == dense.shape == (6, 1, 10, 12)
+    assert np.array_equal(np.asarray(view), dense)
+    for kper in range(ml.nper):
+        assert np.array_equal(view[kper], dense[kper])
+    assert np.array_equal(view[1:5, 0, 3], dense[1:5, 0, 3])
+    assert view[4, 0, 2, 3] == a[2, 3]
+
+
+def test_transient2d_compact_load():
+    model_ws = os.path.join(out_dir, 'compact')
+    if not os.path.exists(model_ws):
+        os.makedirs(model_ws)
+    ml = flopy.modflow.Modflow('compact', model_ws=model_ws)
+    dis = flopy.modflow.ModflowDis(ml, nrow=2, ncol=3, nper=4)
+    fname = os.path.join(model_ws, 'compact.rch')
+    with open(fname, 'w') as f:
+        f.write('3 0\n')
+        f.write('1\nINTERNAL 1.0 (FREE) -1\n1 2 3\n4 5 6\n')
+        f.write('-1\n')
+        f.write('1\nCONSTANT 2.0\n')
+        f.write('-1\n')
+
+    # by default every stress period has an entry
+    rch = flopy.modflow.ModflowRch.load(fname, ml, check=False)
+    assert sorted(rch.rech.transient_2ds.keys()) == [0, 1, 2, 3]
+
+    # the stress periods that reuse the previous array are not stored
+    rch = flopy.modflow.ModflowRch.load(fname, ml, check=False,
+                                        compact=True)
+    assert sorted(rch.rech.transient_2ds.keys()) == [0, 2]
+    assert [rch.rech.get_kper_entry(kper)[0] for kper in range(4)] == \
+           [1, -1, 1, -1]
+    assert np.array_equal(rch.rech.array[1, 0], [[1, 2, 3], [4, 5, 6]])
+    assert np.array_equal(rch.rech.array[3, 0], np.zeros((2, 3)) + 2.)
+    rch.write_file()
+    with open(fname) as f:
+        itmp = [int(line.split()[0]) for line in f.readlines()
+                if 'Stress period' in line]
+    assert itmp == [1, -1, 1, -1]
+
+    evt = flopy.modflow.ModflowEvt(ml, evtr={0: 1e-3, 1: 1e-3, 3: 2e-3},
+                                   compact=True)
+    assert sorted(evt.evtr.transient_2ds.keys()) == [0, 3]
+    assert evt.surf.compact and evt.exdp.compact and evt.ievt.compact
+
+
 def test_transient3d():
     nlay = 3
     nrow = 4
@@ -441,6 +516,214 @@ def test_util3d():
     return
 
 
+def test_array_view():
+    ml = flopy.modflow.Modflow()
+    a = np.random.random((3, 4, 5)).astype(np.float32)
+    u3d = Util3d(ml, (3, 4, 5), np.float32, a, 'test')
+
+    # the layers are views of the 3-D array and are not copied
+    v = u3d.array_view
+    assert not v.flags.writeable
+    assert np.shares_memory(v, a)
+    assert np.shares_memory(u3d[1].array_view, a)
+    assert u3d.array_view is v
+    assert u3d[1, 2, 3] == a[1, 2, 3]
+
+    # the view of a constant is not expanded
+    u2d = Util2d(ml, (4, 5), np.float32, 3., 'test')
+    assert u2d.array_view.strides == (0, 0)
+    assert np.array_equal(u2d.array_view, u2d.array)
+
+    # the view is reset when the value or the multiplier is assigned
+    u2d.cnstnt = 2.0
+    assert u2d.array_view[0, 0] == 6.
+    u3d[1] = 7.
+    v2 = u3d.array_view
+    assert v2 is not v
+    assert np.array_equal(v2[1], np.zeros((4, 5)) + 7.)
+    assert np.array_equal(v2[0], a[0])
+    u3d.cnstnt = 2.0
+    assert np.array_equal(u3d.array_view, u3d.array)
+    assert np.array_equal(u3d.array_view[0], a[0] * 2.)
+
+    # changes to the array are seen by the view
+    u2d = Util2d(ml, (4, 5), np.float32, a[0].copy(), 'test')
+    u2d._array[0, 0] = 5.
+    assert u2d.array_view[0, 0] == 5.
+    u3d = Util3d(ml, (3, 4, 5), np.float32, a.copy(), 'test')
+    u3d[0]._array[0, 0] = 3.
+    assert u3d.array[0, 0, 0] == u3d.array_view[0, 0, 0] == 3.
+
+    # the layers of a list of arrays are stored in one 3-D array
+    u3d = Util3d(ml, (3, 4, 5), np.float32, list(a), 'test')
+    v = u3d.array_view
+    assert v.base is not None and v.shape == (3, 4, 5)
+    assert np.array_equal(v, a)
+    assert np.shares_memory(u3d[2]._array, v)
+    assert u3d.array_view is v
+    assert '_array_view_cache' not in u3d.__getstate__()
+    assert '_array_view' not in u3d[0].__getstate__()
+
+
+def test_array_view_load():
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+
+    ml = flopy.modflow.Modflow()
+    text = 'INTERNAL 1.0 (FREE) -1\n1 2\n3 4\n' + \
+           'INTERNAL 1.0 (FREE) -1\n5 6\n7 8\n'
+    f = StringIO(text)
+    u3d = Util3d.load(f, ml, (2, 2, 2), np.float32, 'test')
+
+    # a loaded array is a view of the layers, built once
+    v = u3d.array_view
+    assert np.array_equal(v, np.arange(1., 9.).reshape(2, 2, 2))
+    assert np.shares_memory(v, u3d[0]._array)
+    assert np.shares_memory(v, u3d[1]._array)
+    assert u3d.array_view is v
+    u3d[1]._array[0, 0] = 10.
+    assert u3d[1, 0, 0] == 10.
+
+    # the multiplied array is cached until a layer or cnstnt is assigned
+    u3d.cnstnt = 2.
+    v2 = u3d.array_view
+    assert v2 is not v and u3d.array_view is v2
+    assert v2[1, 0, 0] == 20.
+    u3d[0].cnstnt = 3.
+    v3 = u3d.array_view
+    assert v3 is not v2
+    assert v3[0, 0, 0] == 3.
+    u3d[1] = 1.
+    assert u3d.array_view is not v3
+    assert u3d[1, 0, 0] == 2.
+
+
+def test_array_pool():
+    pool = flopy.utils.ArrayPool()
+    botm = -np.arange(1., 4.)[:, None, None] * np.ones((3, 5, 6))
+    hk = np.random.random((5, 6)).astype(np.float32)
+    models = []
+    npool = []
+    for i in range(3):
+        ml = flopy.modflow.Modflow()
+        ml.array_pool = pool
+        dis = flopy.modflow.ModflowDis(ml, 3, 5, 6, botm=botm.copy())
+        lpf = flopy.modflow.ModflowLpf(ml, hk=[hk.copy(), 1., 2.])
+        models.append(ml)
+        npool.append(len(pool))
+
+    # identical arrays are stored once
+    m0, m1, m2 = models
+    assert npool[0] > 0 and npool[0] == npool[1] == npool[2]
+    assert m0.dis.botm[1]._array is m2.dis.botm[1]._array
+    assert m0.lpf.hk[0]._array is m1.lpf.hk[0]._array
+    assert np.shares_memory(m0.dis.botm.array_view, m1.dis.botm[0]._array)
+    assert not m0.lpf.hk[0]._array.flags.writeable
+
+    # copy-on-write
+    m1.lpf.hk[0] = hk * 2.
+    m2.lpf.hk[0][2, 3] = 10.
+    assert np.array_equal(m0.lpf.hk[0].array, hk)
+    assert np.array_equal(m1.lpf.hk[0].array, hk * 2.)
+    assert m2.lpf.hk[0].array[2, 3] == 10.
+    assert m0.lpf.hk[0].array[2, 3] == hk[2, 3]
+
+
+def test_mmap_load():
+    model_ws = os.path.join(out_dir, 'mmap')
+    hk = np.random.random((2, 5, 6)).astype(np.float32)
+    wd = flopy.modflow.ModflowWel.get_empty(ncells=3)
+    wd['k'] = [0, 1, 1]
+    wd['i'] = [0, 2, 4]
+    wd['j'] = [5, 3, 0]
+    wd['flux'] = [-100., -200., -300.]
+    ml = flopy.modflow.Modflow('mmap', model_ws=model_ws,
+                               external_path='ref')
+    dis = flopy.modflow.ModflowDis(ml, 2, 5, 6, nper=2)
+    bas = flopy.modflow.ModflowBas(ml)
+    lpf = flopy.modflow.ModflowLpf(ml, hk=hk)
+    for k in range(2):
+        lpf.hk[k].fmtin = '(BINARY)'
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data={0: wd},
+                                   binary=True)
+    ml.write_input()
+
+    m = flopy.modflow.Modflow.load('mmap.nam', model_ws=model_ws, mmap=True,
+                                   check=False)
+    assert m.lpf.hk[0].vtype == str
+    assert np.array_equal(m.lpf.hk.array, hk)
+    assert not m.lpf.hk[1]._array.flags.writeable
+    assert isinstance(m.lpf.hk[1]._array.base, np.memmap)
+    spd = m.wel.stress_period_data
+    assert spd.binary and spd.vtype[0] == str
+    assert spd.get_itmp(0) == 3
+    assert np.array_equal(spd[0], wd)
+
+    # assigning values does not change the mapped file
+    m.lpf.hk[1] = 5.
+    assert np.array_equal(flopy.modflow.Modflow.load(
+        'mmap.nam', model_ws=model_ws, mmap=True,
+        check=False).lpf.hk.array, hk)
+
+    # the files are copied to another workspace
+    model_ws2 = os.path.join(out_dir, 'mmap2')
+    m.lpf.hk[1] = hk[1]
+    m.change_model_ws(model_ws2)
+    m.write_input()
+    for fname in [m.lpf.hk[0].filename, m.wel.stress_period_data
+            .get_filename(0)]:
+        f1 = os.path.join(model_ws, 'ref', fname)
+        f2 = os.path.join(model_ws2, fname)
+        assert open(f1, 'rb').read() == open(f2, 'rb').read()
+    m2 = flopy.modflow.Modflow.load('mmap.nam', model_ws=model_ws2,
+                                    check=False)
+    assert np.array_equal(m2.lpf.hk.array, hk)
+    assert np.array_equal(m2.wel.stress_period_data[0], wd)
+    assert np.array_equal(m2.wel.stress_period_data[1], wd)
+    # stress periods are not deduplicated by default
+    assert os.path.exists(os.path.join(model_ws2, spd.get_filename(1)))
+
+
+def test_namefile_pool():
+    model_ws = os.path.join(out_dir, 'namfile_pool')
+    if not os.path.exists(model_ws):
+        os.makedirs(model_ws)
+    namfile = os.path.join(model_ws, 'test.nam')
+    with open(namfile, 'w') as f:
+        for unit in range(20, 25):
+            fname = 'data{}.dat'.format(unit)
+            f.write('DATA {} {}\n'.format(unit, fname))
+            with open(os.path.join(model_ws, fname), 'w') as fd:
+                fd.write(''.join('{} {}\n'.format(unit, i)
+                                 for i in range(3)))
+    ext_unit_dict = flopy.utils.parsenamefile(namfile, {}, verbose=False,
+                                              maxopen=2)
+    assert len(ext_unit_dict.pool) == 0
+
+    # files are opened when used and closed when more than maxopen files
+    # are open, reading continues at the same position
+    for i in range(3):
+        for unit in range(20, 25):
+            line = ext_unit_dict[unit].filehandle.readline()
+            assert line == '{} {}\n'.format(unit, i)
+            assert len(ext_unit_dict.pool) <= 2
+    with ext_unit_dict[20].handle() as f20:
+        for unit in range(21, 25):
+            ext_unit_dict[unit].filehandle
+        assert not f20.closed
+    ext_unit_dict.close()
+    assert ext_unit_dict[21].filehandle.readline() == ''
+
+    # unit numbers by file name
+    fname = os.path.join(model_ws, 'data22.dat')
+    assert ext_unit_dict.get_unit(fname) == 22
+    ext_unit_dict.pop(22)
+    assert ext_unit_dict.get_unit(fname) is None
+    ext_unit_dict.close()
+
+
 def test_arrayformat():
     ml = flopy.modflow.Modflow(model_ws=out_dir)
     u2d = Util2d(ml, (15, 2), np.float32, np.ones((15, 2)), 'test')
@@ -567,6 +850,105 @@ def test_mflist():
     assert flx1.sum() == flx2.sum()
 
 
+def test_mflist_compact():
+    ml = flopy.modflow.Modflow()
+    dis = flopy.modflow.ModflowDis(ml, 2, 5, 6, 8)
+    ra = flopy.modflow.ModflowWel.get_empty(4)
+    ra['k'] = [0, 1, 1, 0]
+    ra['i'] = [1, 2, 2, 4]
+    ra['j'] = [3, 0, 0, 5]
+    ra['flux'] = [1., 2., 3., 4.]
+    sp_data = {2: ra, 4: 0, 6: ra}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    mfl = wel.stress_period_data
+
+    # duplicate cells are summed for flux
+    flux = mfl.to_array(2)['flux']
+    assert flux[1, 2, 0] == 5.
+    assert flux.sum() == 10.
+
+    # stress periods without data share the same arrays
+    kper_index, arrays = mfl.get_compact(mask=True)
+    assert list(kper_index) == [0, 0, 1, 1, 0, 0, 1, 1]
+    assert len(arrays['flux']) == 2
+
+    view = mfl.masked_4D_arrays_view['flux']
+    m4d = mfl.masked_4D_arrays['flux']
+    assert view.shape == m4d.shape == (8, 2, 5, 6)
+    assert np.array_equal(np.isnan(np.array(view)), np.isnan(m4d))
+    assert np.array_equal(np.nan_to_num(view[3]), flux)
+
+    # only the stress periods where the data changes are returned
+    sp_data = flopy.utils.MfList.masked4D_arrays_to_stress_period_data(
+        flopy.modflow.ModflowWel.get_default_dtype(), {'flux': view})
+    assert sorted(sp_data.keys()) == [0, 2, 4, 6]
+    assert len(sp_data[0]) == 0
+    assert sp_data[2]['flux'].sum() == 10.
+
+
+def test_mflist_write():
+    ml = flopy.modflow.Modflow('mflist', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 1, 10, 10, 4)
+    bas = flopy.modflow.ModflowBas(ml)
+    sp0 = [[0, 1, 1, 1.0], [0, 1, 2, 2.5], [0, 1, 3, -3.0e-6]]
+    sp_data = {0: sp0, 1: sp0, 2: [[0, 2, 4, 4.0]]}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    ml.write_input()
+
+    # the data of every stress period is written
+    lines = open(wel.fn_path).readlines()
+    itmp = [int(line.split()[0]) for line in lines
+            if '# stress period' in line]
+    assert itmp == [3, 3, 1, -1]
+    assert lines[4].split() == ['1', '2', '3', '2.5000000E+00']
+
+    # identical consecutive stress periods are written with ITMP=-1
+    f = open(wel.fn_path, 'w')
+    f.write(''.join(lines[:2]))
+    wel.stress_period_data.write_transient(f, dedupe=True)
+    f.close()
+    lines = open(wel.fn_path).readlines()
+    itmp = [int(line.split()[0]) for line in lines
+            if '# stress period' in line]
+    assert itmp == [3, -1, 1, -1]
+
+    ml2 = flopy.modflow.Modflow.load('mflist.nam', model_ws=out_dir,
+                                     check=False)
+    for kper in range(4):
+        assert np.array_equal(ml2.wel.stress_period_data[kper],
+                              wel.stress_period_data[kper])
+
+
+def test_util2d_array2string():
+    from io import StringIO
+    np.random.seed(2)
+    shape = (7, 23)
+    arrays = [np.random.random(shape).astype(np.float32) * 1.0e5,
+              np.random.randint(-9999, 9999, shape)]
+    arrays[0][0, :3] = [0., np.nan, -np.inf]
+    for a in arrays:
+        for fmt in ['(10G15.6)', '(20I5)', '(23F10.3)', '(1E12.4)',
+                    '(5ES13.5)']:
+            if 'I' in fmt and a.dtype.kind == 'f':
+                continue
+            column_length, output_fmt = Util2d._get_output_format(fmt)
+            s1 = Util2d._array2string_loop(shape[0], shape[1], a,
+                                           column_length, output_fmt)
+            s2 = Util2d.array2string(shape, a, fortran_format=fmt)
+            assert s1 == s2, 'array2string error for {}'.format(fmt)
+        s1 = Util2d.array2string(shape[1:], a[0],
+                                 python_format=[6, '{0:12.4e}'])
+        s2 = Util2d._array2string_loop(1, shape[1], a[0:1], 6, '{0:12.4e}')
+        assert s1 == s2
+
+        # free format is written with the default numpy format
+        f1, f2 = StringIO(), StringIO()
+        Util2d.write_txt(shape, f1, a)
+        np.savetxt(f2, a, ArrayFormat.get_default_numpy_fmt(a.dtype),
+                   delimiter='')
+        assert f1.getvalue() == f2.getvalue()
+
+
 def test_how():
     import numpy as np
     import flopy
@@ -594,6 +976,104 @@ def test_util3d_reset():
     ml.bas6.strt = arr
 
 
+def test_util2d_load_block():
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+
+    f = StringIO('3\n1 2 1 4 1.5\n3 3 1 2 2.5\n3 3 3 4 3.5\nnext line\n')
+    data = Util2d.load_block((3, 4), f, np.float32)
+    assert f.readline() == 'next line\n'
+    assert np.array_equal(data, [[1.5, 1.5, 1.5, 1.5],
+                                 [1.5, 1.5, 1.5, 1.5],
+                                 [2.5, 2.5, 3.5, 3.5]])
+
+    # the blocks must cover the array
+    f = StringIO('1\n1 2 1 4 1.5\n')
+    try:
+        Util2d.load_block((3, 4), f, np.float32)
+        assert False, 'load_block did not raise an exception'
+    except Exception as e:
+        assert 'np.NaN' in str(e)
+
+
+def test_util3d_load_species():
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+
+    ml = flopy.modflow.Modflow()
+    a = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    lines = []
+    for k in range(2):
+        lines.append('INTERNAL 1.0 (FREE) -1\n')
+        lines.extend([' '.join(str(v) for v in a[k, i]) + '\n'
+                      for i in range(3)])
+    lines.append('CONSTANT 2.5\n')
+    lines.append('INTERNAL 2.0 (FREE) -1\n')
+    lines.append('12*1.5\n')
+    lines.append('INTERNAL 1.0 (FREE) -1\n')
+    lines.append(' '.join(str(v) for v in a[1].ravel()) + '\n')
+    lines.append('INTERNAL 1.0 (4F5.0) -1\n')
+    lines.extend([''.join('{:5.0f}'.format(v) for v in a[0, i]) + '\n'
+                  for i in range(3)])
+    lines.append('next line\n')
+    f = StringIO(''.join(lines))
+    u3ds = Util3d.load_species(f, ml, (2, 3, 4), np.float32,
+                               ['s1', 's2', 's3'])
+    assert f.readline() == 'next line\n'
+    assert np.array_equal(u3ds[0].array, a)
+    assert np.array_equal(u3ds[1].array[0], np.zeros((3, 4)) + 2.5)
+    assert np.array_equal(u3ds[1].array[1], np.zeros((3, 4)) + 3.0)
+    assert np.array_equal(u3ds[2].array, a[::-1])
+
+    # 2-D arrays
+    f = StringIO('INTERNAL 1.0 (FREE) -1\n1 2\n3 4\nCONSTANT 1.0\n')
+    u2ds = Util3d.load_species(f, ml, (2, 2), np.float32, ['s1', 's2'])
+    assert np.array_equal(u2ds[0].array, [[1., 2.], [3., 4.]])
+    assert np.array_equal(u2ds[1].array, np.ones((2, 2)))
+
+
+def test_util2d_load_txt():
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+
+    def load(text, shape, dtype, fmtin, compare=True):
+        # the line following the array must not be consumed
+        f = StringIO(text + 'next line\n')
+        data = Util2d.load_txt(shape, f, dtype, fmtin)
+        assert f.readline() == 'next line\n'
+        if compare:
+            fallback = Util2d._load_txt_fallback(shape, StringIO(text),
+                                                 dtype, fmtin)
+            assert np.array_equal(data, fallback)
+        return data
+
+    a = np.arange(12, dtype=np.float32).reshape(3, 4) / 3.
+    text = ''.join(['{0:15.6E}'.format(v) + ('\n' if i % 5 == 4 else '')
+                    for i, v in enumerate(a.ravel())]) + '\n'
+    assert np.allclose(load(text, (3, 4), np.float32, '(FREE)'), a)
+    assert np.allclose(load(text, (3, 4), np.float32, '(5E15.6)'), a)
+
+    # repeat counts, commas and values past the end of the array
+    data = load('3*1.0 2.0 5*3.5\n3*7.0 8.0 9.0\n', (3, 4), np.float32,
+                '(FREE)')
+    data = load('3*1.0, 2.0, 5*3.5\n3*7.0 8.0 9.0\n', (3, 4), np.float32,
+                '(FREE)', compare=False)
+    assert np.array_equal(data.ravel(), [1., 1., 1., 2., 3.5, 3.5, 3.5,
+                                         3.5, 3.5, 7., 7., 7.])
+
+    # fixed format integers that touch
+    ia = np.arange(100, 112).reshape(3, 4) * -1
+    text = ''.join(['{0:4d}'.format(v) + ('\n' if i % 5 == 4 else '')
+                    for i, v in enumerate(ia.ravel())]) + '\n'
+    data = load(text, (3, 4), np.int32, '(5I4)')
+    assert np.array_equal(data, ia)
+
 
 if __name__ == '__main__':
     # test_util3d_reset()
@@ -51,6 +51,149 @@ def test_modflow_unstructured():
 
     return
 
+def test_list_block_load():
+    import numpy as np
+    import flopy
+    from flopy.pakbase import Package
+    mf = flopy.modflow.Modflow(model_ws=cpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=3, nrow=20, ncol=20, nper=3)
+
+    # free format, extra values, fixed format and mixed stress periods
+    nwel = 50
+    k = np.arange(nwel) % 3 + 1
+    i = np.arange(nwel) % 20 + 1
+    j = np.arange(nwel) // 3 + 1
+    q = np.linspace(-1000., 1000., nwel)
+    iface = np.arange(nwel) % 6
+    blocks = [['{} {} {} {:.6g} {}\n'.format(*r)
+               for r in zip(k, i, j, q, iface)],
+              ['  {}\t{} {}   {:.8e} {} extra 7\n'.format(*r)
+               for r in zip(k, i, j, q, iface)],
+              ['{:10d}{:10d}{:10d}{:10.2f}{:10d}\n'.format(*r)
+               for r in zip(k, i, j, q * 1e5, iface)]]
+    blocks[2][::2] = blocks[0][::2]
+    fname = os.path.join(cpth, 'blocks.wel')
+    f = open(fname, 'w')
+    f.write('{} 0 aux iface\n'.format(nwel))
+    for lines in blocks:
+        f.write('{} 0\n'.format(nwel))
+        f.writelines(lines)
+    f.close()
+
+    wel = flopy.modflow.ModflowWel.load(fname, mf, check=False)
+    for kper, lines in enumerate(blocks):
+        ra = wel.stress_period_data[kper]
+        ra0 = flopy.modflow.ModflowWel.get_empty(nwel, aux_names=['iface'])
+        ra0 = Package._read_list_lines(lines, ra0)
+        for name in ['k', 'i', 'j']:
+            ra0[name] -= 1
+        for name in ra0.dtype.names:
+            assert np.array_equal(ra[name], ra0[name])
+    return
+
+
+def test_write_input_parallel():
+    import filecmp
+    import numpy as np
+    import flopy
+    np.random.seed(0)
+    nlay, nrow, ncol = 3, 20, 30
+    for name, parallel in (('serial', False), ('parallel', 2)):
+        model_ws = os.path.join(cpth, name)
+        mf = flopy.modflow.Modflow('par', model_ws=model_ws,
+                                   external_path='ref')
+        flopy.modflow.ModflowDis(mf, nlay, nrow, ncol, nper=2,
+                                 botm=[-1., -2., -3.])
+        flopy.modflow.ModflowBas(mf, strt=np.arange(nlay * nrow * ncol,
+                                                    dtype=float).reshape(
+            (nlay, nrow, ncol)))
+        lpf = flopy.modflow.ModflowLpf(mf, hk=np.linspace(1., 2., nrow * ncol)
+                                       .reshape((nrow, ncol)))
+        # arrays written with external unit numbers
+        for u2d in lpf.vka.util_2ds:
+            u2d.how = 'external'
+        flopy.modflow.ModflowWel(mf, stress_period_data={
+            0: [[0, 1, 1, -1.], [1, 2, 3, -2.]]})
+        flopy.modflow.ModflowOc(mf)
+        flopy.modflow.ModflowPcg(mf)
+        mf.write_input(parallel=parallel, incremental=True)
+        if parallel:
+            assert mf.external_fnames == external_fnames
+            assert mf.external_units == external_units
+            assert sorted(os.path.relpath(k, model_ws)
+                          for k in mf._write_hashes) == written
+        else:
+            external_fnames = mf.external_fnames
+            external_units = mf.external_units
+            written = sorted(os.path.relpath(k, model_ws)
+                             for k in mf._write_hashes)
+            assert len(external_units) == nlay
+
+    # the parallel writer writes the same files as the serial writer
+    for pth in ('', 'ref'):
+        cmp = filecmp.dircmp(os.path.join(cpth, 'serial', pth),
+                             os.path.join(cpth, 'parallel', pth))
+        assert len(cmp.same_files) > 0
+        assert cmp.left_only == cmp.right_only == []
+        _, diff, errors = filecmp.cmpfiles(cmp.left, cmp.right,
+                                           cmp.common_files, shallow=False)
+        assert diff == errors == []
+
+
+def test_write_input_incremental():
+    import numpy as np
+    import flopy
+    model_ws = os.path.join(cpth, 'incremental')
+    mf = flopy.modflow.Modflow('inc', model_ws=model_ws, external_path='ref')
+    flopy.modflow.ModflowDis(mf, 2, 10, 10, botm=[-1., -2.])
+    flopy.modflow.ModflowBas(mf)
+    lpf = flopy.modflow.ModflowLpf(mf, hk=np.random.random((2, 10, 10)))
+    wel = flopy.modflow.ModflowWel(mf, stress_period_data={
+        0: [[0, 1, 1, -1.]]})
+    mf.write_input(incremental=True)
+
+    # change the modification time of the files to find the files that
+    # are written
+    files = []
+    for root, dirs, fnames in os.walk(model_ws):
+        files += [os.path.join(root, f) for f in fnames]
+
+    def touch():
+        for fpth in files:
+            os.utime(fpth, (0, 0))
+        mf._write_hashes = dict((k, (v[0], v[1], 0))
+                                for k, v in mf._write_hashes.items())
+
+    def written():
+        return sorted(os.path.basename(fpth) for fpth in files
+                      if os.path.getmtime(fpth) != 0)
+
+    touch()
+    mf.write_input(incremental=True)
+    assert written() == ['inc.nam']
+
+    # only the changed package and array are written
+    hk = lpf.hk.array
+    hk[1] += 1.
+    lpf.hk = hk
+    touch()
+    mf.write_input(incremental=True)
+    assert written() == ['hk_layer_2.ref', 'inc.lpf', 'inc.nam']
+
+    # changes in place are found
+    wel.stress_period_data[0]['flux'] = -2.
+    touch()
+    mf.write_input(incremental=True)
+    assert written() == ['WEL_0000.dat', 'inc.nam', 'inc.wel']
+
+    # all of the files are written without incremental
+    touch()
+    mf.write_input()
+    assert len(written()) == len(files)
+
 
 if __name__ == '__main__':
     test_modflow_unstructured()
+    test_list_block_load()
+    test_write_input_parallel()
+    test_write_input_incremental()
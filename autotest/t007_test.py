@@ -798,6 +798,24 @@ def test_get_rc_from_node_coordinates():
     assert np.array_equal(r, np.array([9, 7]))
     assert np.array_equal(c, np.array([0, 1]))
 
+def test_sr_get_rc():
+    delr, delc = np.ones(10) * 100., np.ones(5) * 50.
+    sr = flopy.utils.SpatialReference(delr=delr, delc=delc, xll=1000.,
+                                      yll=2000., rotation=30.)
+    i = np.array([0, 4, 2, 3])
+    j = np.array([0, 9, 5, 7])
+    x, y = sr.xcentergrid[i, j], sr.ycentergrid[i, j]
+    r, c = sr.get_rc(x, y)
+    assert np.array_equal(r, i)
+    assert np.array_equal(c, j)
+    assert sr.get_rc(x[2], y[2]) == (2, 5)
+
+    # points outside of the grid are assigned to the nearest row/column
+    x, y = sr.transform(np.array([-10., 1010.]), np.array([300., -10.]))
+    r, c = sr.get_rc(x, y)
+    assert np.array_equal(r, [0, 4])
+    assert np.array_equal(c, [0, 9])
+
 def test_netcdf_classmethods():
     import os
     import flopy
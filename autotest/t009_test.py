@@ -183,6 +183,14 @@ def test_sfr():
     chk.slope(maximum_slope=1.0)
     assert 'maximum slope' in chk.warnings
 
+    # an outreach that is not a reach
+    sfr.reach_data.outreach[reach_inds] = sfr.reach_data.reachID.max() + 1
+    try:
+        sfr.get_slopes()
+        assert False, 'get_slopes did not raise an exception'
+    except Exception as e:
+        assert 'is not a reach number' in str(e)
+
 
 def test_sfr_renumbering():
     # test segment renumbering
@@ -440,6 +448,64 @@ def test_SfrFile():
         assert df.shape == (1080, 20)
 
 
+def test_routing_graph():
+    from flopy.modflow.mfsfr2 import RoutingGraph, find_path
+    # 2 -> 4 -> 8 -> outlet, 6 -> 4, 10 -> lake 1, 12 -> 14 -> 12 (circle)
+    nseg = [2, 4, 6, 8, 10, 12, 14, 16]
+    outseg = [4, 8, 4, 0, -1, 14, 12, 12]
+    g = RoutingGraph(nseg, outseg)
+    assert g.path(2) == [2, 4, 8, 0]
+    assert g.path(2, end=4) == [2, 4]
+    assert g.path(10) == [10, -1, 0]
+    assert g.path(16) is None
+    assert g.nseg[g.circular].tolist() == [12, 14, 16]
+    assert g.upstream(8).tolist() == [2, 4, 6]
+    assert g.upstream(2).tolist() == []
+    assert g.headwaters.tolist() == [2, 6, 10, 16]
+    assert g.outlets.tolist() == [8, 8, 8, 8, -1, 0, 0, 0]
+    assert g.accumulate(np.ones(8))[3] == 4
+    upsegs = g.get_upsegs()
+    assert upsegs[4] == [2, 6] and upsegs[8] == [2, 4, 6]
+    # each segment is before its downstream segment
+    order = g.nseg[g.order].tolist()
+    assert order.index(2) < order.index(4) < order.index(8)
+
+    # same paths as the depth first search
+    graph = dict(zip(nseg, outseg))
+    graph.update({0: 0, -1: 0})
+    paths = g.get_paths()
+    for s in graph.keys():
+        assert paths[s] == find_path(dict(graph), s)
+
+    # the graph of a package is updated when the routing changes
+    m = flopy.modflow.Modflow()
+    sd = flopy.modflow.ModflowSfr2.get_empty_segment_data(8)
+    sd['nseg'] = nseg
+    sd['outseg'] = outseg
+    rd = flopy.modflow.ModflowSfr2.get_empty_reach_data(8)
+    rd['iseg'] = nseg
+    rd['ireach'] = 1
+    sfr = flopy.modflow.ModflowSfr2(m, reach_data=rd, segment_data={0: sd})
+    assert sfr.get_routing_graph() is sfr.get_routing_graph()
+    assert sfr.paths[12] is None
+    sfr.segment_data[0]['outseg'][6] = 0
+    assert sfr.paths[12] == [12, 14, 0]
+    sfr.paths[12].append(99)
+    assert sfr.paths[12] == [12, 14, 0]
+    paths = sfr.paths
+    assert paths == sfr.get_routing_graph().get_paths()
+    try:
+        paths[12] = [12, 0]
+        assert False, 'paths can be assigned'
+    except TypeError:
+        pass
+    assert sfr.get_upsegs()[0][14] == [12, 16]
+    assert sfr._get_headwaters().tolist() == [2, 6, 10, 16]
+    sfr.get_outlets()
+    assert sfr.outlets[0][16] == 14
+    assert sfr.outsegs[0][0].tolist() == [2, 4, 8, 0]
+
+
 def test_sfr_plot():
     #m = flopy.modflow.Modflow.load('test1ss.nam', model_ws=path, verbose=False)
     #sfr = m.get_package('SFR')
@@ -458,4 +524,5 @@ if __name__ == '__main__':
     test_assign_layers()
     test_SfrFile()
     test_const()
+    test_routing_graph()
     pass
@@ -49,11 +49,109 @@ def test_mt3d_multispecies():
     # Load the MT3D model into mt2 and then write it out
     fname = modelname + '.nam'
     mt2 = flopy.mt3d.Mt3dms.load(fname, model_ws=testpth, verbose=True)
+    assert np.allclose(mt2.btn.sconc[2].array[0], sconc3)
+    assert mt2.btn.sconc[4].array.max() == 5.
+    assert np.allclose(mt2.ssm.crch[2][2].array, crch32)
+    assert np.allclose(mt2.ssm.cevt[2][3].array, cevt33)
+    assert mt2.ssm.crch[1][0].array.max() == 2.
     mt2.name = modelname2
     mt2.write_input()
 
     return
 
 
+def test_mt3d_ssm_dedupe():
+    modelname = 'ssmdedupe'
+    mf = flopy.modflow.Modflow(modelname=modelname, model_ws=testpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=2, nrow=10, ncol=10, nper=4)
+    mt = flopy.mt3d.Mt3dms(modelname=modelname, modflowmodel=mf,
+                           model_ws=testpth)
+    btn = flopy.mt3d.Mt3dBtn(mt, ncomp=2, mcomp=2, sconc2=0.)
+    dtype = flopy.mt3d.Mt3dSsm.get_default_dtype(ncomp=2)
+    d0 = np.zeros(50, dtype=dtype).view(np.recarray)
+    d0['k'] = np.arange(50) % 2
+    d0['i'] = np.arange(50) // 5
+    d0['j'] = np.arange(50) % 10
+    d0['css'] = np.arange(50) * 0.5
+    d0['itype'] = 2
+    d0['cssm(01)'] = d0['css']
+    d0['cssm(02)'] = np.arange(50) * 0.25
+    d2 = d0.copy()
+    d2['css'] += 1.
+    ssm = flopy.mt3d.Mt3dSsm(mt, stress_period_data={0: d0, 1: d0, 2: d2,
+                                                     3: d2}, mxss=50)
+    ssm.write_file()
+
+    # the stress periods that reference the same data are written in full
+    with open(os.path.join(testpth, modelname + '.ssm')) as f:
+        lines = f.readlines()
+    blocks = [lines[i + 1:i + 51] for i in range(2, len(lines), 51)]
+    assert len(blocks) == 4
+    assert blocks[0] == blocks[1] and blocks[2] == blocks[3]
+    assert blocks[1] != blocks[2]
+
+    fname = os.path.join(testpth, modelname + '.ssm')
+    ssm2 = flopy.mt3d.Mt3dSsm.load(fname, mt, dedupe=True)
+    spd = ssm2.stress_period_data
+    assert spd[1] is spd[0] and spd[3] is spd[2]
+    assert spd[2] is not spd[1]
+    for kper, d in enumerate([d0, d0, d2, d2]):
+        for name in dtype.names:
+            assert np.allclose(spd[kper][name], d[name])
+    ssm3 = flopy.mt3d.Mt3dSsm.load(fname, mt)
+    assert ssm3.stress_period_data[1] is not ssm3.stress_period_data[0]
+    assert np.array_equal(ssm3.stress_period_data[1], spd[1])
+
+
+def test_mt3d_ssm_point_sources():
+    # fixed format fields that touch and free format species values
+    lines = ['         1        12         3-1.234E+05         2   7.0   8.0'
+             '   9.0\n',
+             '         2         1        10       2.5        15 1.5 2.5 3.5'
+             '\n',
+             '        10       100         1 1.000E+02        -1     3 4 5 6'
+             '\n']
+    dtype = flopy.mt3d.Mt3dSsm.get_default_dtype(ncomp=3)
+    current = np.zeros(len(lines), dtype=dtype).view(np.recarray)
+    current = flopy.mt3d.Mt3dSsm._read_point_sources(lines, current)
+    assert current[0].tolist() == (1, 12, 3, np.float32(-1.234e+05), 2,
+                                   7., 8., 9.)
+    assert current[1].tolist() == (2, 1, 10, 2.5, 15, 1.5, 2.5, 3.5)
+    assert current[2].tolist() == (10, 100, 1, 1.0E+02, -1, 3., 4., 5.)
+
+    # a fixed field that does not hold a number
+    lines = ['         1        12         3       1.0         x   7.0   8.0'
+             '   9.0\n']
+    current = np.zeros(len(lines), dtype=dtype).view(np.recarray)
+    try:
+        flopy.mt3d.Mt3dSsm._read_point_sources(lines, current)
+        assert False, '_read_point_sources did not raise an exception'
+    except ValueError:
+        pass
+
+    # two species through Mt3dSsm.load
+    modelname = 'ssmpoints'
+    mf = flopy.modflow.Modflow(modelname=modelname, model_ws=testpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=2, nrow=12, ncol=10, nper=1)
+    mt = flopy.mt3d.Mt3dms(modelname=modelname, modflowmodel=mf,
+                           model_ws=testpth)
+    btn = flopy.mt3d.Mt3dBtn(mt, ncomp=2, mcomp=2, sconc2=0.)
+    fname = os.path.join(testpth, modelname + '.ssm')
+    with open(fname, 'w') as f:
+        f.write(' F F F F F F F F F F\n')
+        f.write('         2\n')
+        f.write('         2\n')
+        f.write('         1        12         3-1.234E+05         2   7.0'
+                '   8.0\n')
+        f.write('         2         1        10       2.5        15   1.5'
+                '   2.5\n')
+    ssm = flopy.mt3d.Mt3dSsm.load(fname, mt)
+    spd = ssm.stress_period_data[0]
+    assert spd[0].tolist() == (0, 11, 2, np.float32(-1.234e+05), 2, 7., 8.)
+    assert spd[1].tolist() == (1, 0, 9, 2.5, 15, 1.5, 2.5)
+
+
 if __name__ == '__main__':
     test_mt3d_multispecies()
+    test_mt3d_ssm_dedupe()
+    test_mt3d_ssm_point_sources()
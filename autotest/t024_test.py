@@ -103,9 +103,104 @@ def test_properties_check():
     assert 'vertical hydraulic conductivity values above checker threshold of 100000.0' in ind3_errors
 
 
+def test_model_check_parallel():
+    mf = flopy.modflow.Modflow(version='mf2005', model_ws=mpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=2, nrow=10, ncol=10, top=100,
+                                   botm=[50, 0], nper=2)
+    ibound = np.ones((2, 10, 10), dtype=int)
+    ibound[:, :, 0] = 0
+    bas = flopy.modflow.ModflowBas(mf, ibound=ibound)
+    hk = np.ones((2, 10, 10))
+    hk[0, 2, 3] = -1.
+    hk[1, 5:7, 5] = 1e10
+    lpf = flopy.modflow.ModflowLpf(mf, hk=hk)
+    wel = flopy.modflow.ModflowWel(mf, stress_period_data={
+        0: [[0, 0, 0, -1.], [1, 4, 4, -1.]],
+        1: [[1, 4, 4, -1.], [1, 20, 4, -1.]]})
+    pcg = flopy.modflow.ModflowPcg(mf)
+
+    chk = mf.check(verbose=False)
+    chk2 = mf.check(verbose=False, parallel=2)
+    assert len(chk.summary_array) == len(chk2.summary_array)
+    assert chk.summary_array.tolist() == chk2.summary_array.tolist()
+    assert chk.passed == chk2.passed
+
+    # the model summary descriptions start with the package name
+    sa = chk.summary_array
+    descs = np.array([d.split('package: ')[-1] for d in sa.desc])
+    desc = 'zero or negative horizontal hydraulic conductivity values'
+    assert np.sum(descs == desc) == 1
+    assert (sa.k[descs == desc] == 0).all() and \
+           (sa.i[descs == desc] == 2).all() and \
+           (sa.j[descs == desc] == 3).all()
+    desc = 'horizontal hydraulic conductivity values above checker ' + \
+           'threshold of 100000.0'
+    assert np.sum(descs == desc) == 2
+    assert np.sum(descs == 'BC in inactive cell') == 1
+    assert np.sum(descs == 'invalid BC index') == 1
+
+    # rules are timed for each package
+    assert 'LPF package: {}'.format(desc) in chk.timings
+    assert 'WEL package: BC in inactive cell' in chk.timings
+    assert all(t >= 0 for t in chk.timings.values())
+    assert desc in chk.print_timings()
+
+
+def test_neighbor_reduce():
+    from flopy.utils import get_neighbors, neighbor_reduce
+    np.random.seed(0)
+    a = np.random.randint(0, 3, (3, 4, 5)).astype(float)
+    active = np.random.random((3, 4, 5)) > 0.3
+
+    # compare with the stacked neighbor values
+    neighbors = get_neighbors(a)
+    missing = np.isnan(neighbors) | (get_neighbors(active) != 1)
+    for how in ['all', 'any']:
+        for edge in [True, False]:
+            for act in [None, active]:
+                m = np.isnan(neighbors) if act is None else missing
+                expected = np.where(m, edge, neighbors < a)
+                expected = expected.all(axis=0) if how == 'all' \
+                    else expected.any(axis=0)
+                result = neighbor_reduce(a, lambda v, n: n < v, how=how,
+                                         edge=edge, active=act)
+                assert np.array_equal(result, expected)
+
+    # 2-D arrays have 4 neighbors
+    a2 = np.arange(6.).reshape(2, 3)
+    assert np.array_equal(neighbor_reduce(a2, lambda v, n: n > v),
+                          np.array([[True, False, False],
+                                    [False, False, False]]))
+
+    # contrast check with neighbors in check_thresholds
+    mf = flopy.modflow.Modflow(version='mf2005', model_ws=mpth)
+    dis = flopy.modflow.ModflowDis(mf, nlay=1, nrow=3, ncol=3)
+    ibound = np.ones((1, 3, 3), dtype=int)
+    ibound[0, 0, 0] = 0
+    bas = flopy.modflow.ModflowBas(mf, ibound=ibound)
+    hk = np.ones((1, 3, 3))
+    hk[0, 1, 1] = 1e5
+    hk[0, 0, 0] = 1e-6  # inactive, not used as a neighbor
+    lpf = flopy.modflow.ModflowLpf(mf, hk=hk)
+    chk = lpf.check(verbose=False)
+    assert not any('contrast' in d for d in chk.summary_array.desc)
+    thresholds = flopy.utils.check.property_threshold_values
+    try:
+        thresholds['hk_contrast'] = 1e3
+        chk = lpf.check(verbose=False)
+    finally:
+        thresholds['hk_contrast'] = None
+    sa = chk.summary_array[np.array(['contrast' in d for d in
+                                     chk.summary_array.desc])]
+    assert len(sa) == 1
+    assert (sa.k[0], sa.i[0], sa.j[0]) == (0, 1, 1)
+
+
 if __name__ == '__main__':
     print('numpy version: {}'.format(np.__version__))
     for mfnam in testmodels:
         checker_on_load(mfnam)
     test_bcs_check()
     test_properties_check()
+    test_model_check_parallel()
+    test_neighbor_reduce()
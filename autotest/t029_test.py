@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import flopy
 
 pthtest = os.path.join('..', 'examples', 'data', 'mfgrd_test')
@@ -35,6 +36,31 @@ def test_mfgrddisv():
     assert len(iverts) == 218, errmsg
 
 
+def test_mfgrddis_accessors():
+    grbnam = 'nwtp3.dis.grb'
+    fn = os.path.join(pthtest, grbnam)
+    dis = flopy.utils.MfGrdFile(fn)
+
+    ia, ja = dis.get_adjacency()
+    assert ia.shape == (6401,)
+    assert ja.shape[0] == ia[-1]
+    # corner and interior cell neighbors
+    assert sorted(ja[ia[0]:ia[1]].tolist()) == [1, 80]
+    n = 81
+    assert sorted(ja[ia[n]:ia[n + 1]].tolist()) == [1, 80, 82, 161]
+    assert dis.get_adjacency()[0] is ia
+
+    iavert, javert, vertices = dis.get_cell_vertices()
+    assert vertices.shape == (81 * 81, 2)
+    assert iavert.shape == (6401,)
+    iverts, verts = dis.get_verts()
+    n = 6399
+    assert np.array_equal(vertices[javert[iavert[n]:iavert[n + 1]]],
+                          verts[iverts[n]])
+    assert dis.get_centroids() is dis.get_centroids()
+
+
 if __name__ == '__main__':
     test_mfgrddis()
     test_mfgrddisv()
+    test_mfgrddis_accessors()
@@ -93,6 +93,49 @@ def test_get_sat_thickness_gradients():
     sat_thick = get_saturated_thickness(hds, m, nodata)
     assert np.abs(np.sum(sat_thick[:, 1, 1] - np.array([0.2, 1., 1.]))) < 1e-6
 
+def test_postprocessing_batched():
+    import os
+    nodata = -9999.
+    nl, nr, nc = 3, 4, 5
+    np.random.seed(0)
+    hds = np.random.rand(6, nl, nr, nc) * 4.
+    hds[np.random.rand(*hds.shape) < 0.3] = nodata
+    botm = np.ones((nl, nr, nc), dtype=float)
+    botm[0, :, :] = 3.
+    botm[1, :, :] = 2.
+
+    m = mf.Modflow('junk', version='mfnwt', model_ws='temp')
+    dis = mf.ModflowDis(m, nlay=nl, nrow=nr, ncol=nc, botm=botm, top=4.)
+
+    # results for the stack are the same as for each time step
+    wt = get_water_table(hds, nodata=nodata)
+    sat_thick = get_saturated_thickness(hds, m, nodata)
+    grad = get_gradients(hds, m, nodata)
+    for per in range(hds.shape[0]):
+        assert np.array_equal(wt[per], get_water_table(hds[per], nodata))
+        assert np.allclose(sat_thick[per],
+                           get_saturated_thickness(hds[per], m, nodata),
+                           equal_nan=True)
+        assert np.allclose(grad[per], get_gradients(hds[per], m, nodata),
+                           equal_nan=True)
+
+    # results written to a preallocated buffer
+    out = np.zeros((2, nl - 1, nr, nc))
+    grad2 = get_gradients(hds, m, nodata, per_idx=[1, 4], out=out)
+    assert np.allclose(out, grad[[1, 4]], equal_nan=True)
+    assert np.allclose(grad2, grad[[1, 4]], equal_nan=True)
+    out = np.zeros((1, nr, nc))
+    get_water_table(hds, nodata, per_idx=3, out=out)
+    assert np.array_equal(out[0], wt[3])
+
+    # head file input
+    fpth = os.path.join('..', 'examples', 'data', 'freyberg',
+                        'freyberg.githds')
+    hdobj = flopy.utils.HeadFile(fpth)
+    hdry = -999.
+    wt = get_water_table(hdobj, nodata=hdry)
+    assert np.array_equal(wt, get_water_table(hdobj.get_data(), hdry))
+
 if __name__ == '__main__':
     #test_get_transmissivities()
     #test_get_water_table()
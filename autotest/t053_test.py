@@ -37,6 +37,19 @@ def test_headu_file():
         t1 = np.array([d.min(), d.max()])
         assert np.allclose(t1, minmaxtrue[i])
 
+    # time series for nodes in each layer
+    nodes = [0, 7800, 7801, 13999, 14000, 19478]
+    ts = headobj.get_ts(nodes)
+    assert ts.shape == (len(headobj.get_times()), len(nodes) + 1)
+    assert np.array_equal(ts[:, 0], headobj.get_times())
+    for i, totim in enumerate(headobj.get_times()):
+        data = np.concatenate(headobj.get_data(totim=totim))
+        assert np.allclose(ts[i, 1:], data[nodes])
+    ts = headobj.get_ts(7801)
+    assert ts.shape == (len(headobj.get_times()), 2)
+    ts = headobj.get_ts([])
+    assert ts.shape == (len(headobj.get_times()), 1)
+
     return
 
 
@@ -26,5 +26,40 @@ def test_mtlist():
     mt = flopy.utils.MtListBudget(os.path.join(mt_dir, "mcomp_fail2.list"))
     df_gw, df_sw = mt.parse(forgive=True, start_datetime="1-1-1970")
 
+
+def test_mtlist_index():
+    try:
+        import pandas as pd
+    except:
+        return
+
+    mt_dir = os.path.join("..", "examples", "data", "mt3d_test")
+    mt = flopy.utils.MtListBudget(os.path.join(mt_dir, "mcomp_fail2.list"))
+    idx_map = mt.build_index()
+    assert idx_map.shape[0] == 5
+    assert idx_map.sw.sum() == 3
+    assert mt.get_components() == [1, 2]
+    assert mt.get_times() == [365.]
+
+    df_gw, df_sw = mt.parse(forgive=True)
+    df_gw2, df_sw2 = mt.parse(forgive=True, components=[2])
+    assert len(df_gw2.columns) > 0
+    for col in df_gw2.columns:
+        assert col.endswith("_2_cum") or col.endswith("_2")
+        assert (df_gw2.loc[:, col] == df_gw.loc[:, col]).all()
+    for col in df_sw2.columns:
+        assert (df_sw2.loc[:, col] == df_sw.loc[:, col]).all()
+
+    df_gw3, df_sw3 = mt.parse(forgive=True, start_totim=300.,
+                              end_totim=400.)
+    assert df_gw3.shape == df_gw.shape
+    try:
+        mt.parse(forgive=True, start_totim=400.)
+        raise AssertionError("no budget should be found after totim=400")
+    except Exception as e:
+        assert "no groundwater budget info found" in str(e)
+
+
 if __name__ == '__main__':
-    test_mtlist()
\ No newline at end of file
+    test_mtlist()
+    test_mtlist_index()
\ No newline at end of file
@@ -784,6 +784,79 @@ def test027_timeseriestest():
         assert pymake.compare_heads(None, None, files1=head_file, files2=head_new)
 
 
+def test005_advgw_tidal_lazy():
+    # init paths
+    test_ex_name = 'test005_advgw_tidal'
+    model_name = 'gwf_1'
+
+    pth = os.path.join('..', 'examples', 'data', 'mf6', test_ex_name)
+
+    # load simulation without loading the model packages
+    sim = MFSimulation.load(model_name, 'mf6', exe_name, pth, lazy=True)
+    model = sim.get_model(model_name)
+    npackages = len(model._lazy_packages)
+    assert npackages > 0
+    assert len(model.packages) == 1
+
+    # packages are loaded when they are accessed
+    sim_eager = MFSimulation.load(model_name, 'mf6', exe_name, pth)
+    model_eager = sim_eager.get_model(model_name)
+    assert np.allclose(model.npf.k.get_data(), model_eager.npf.k.get_data())
+    assert len(model._lazy_packages) == npackages - 1
+
+    # only a whole package type or name loads a package
+    assert model.get_package('ghb_obs_x') is None
+    assert model.get_package('gh') is None
+    assert len(model._lazy_packages) == npackages - 1
+
+    # requesting all of the packages loads the remaining packages
+    names = sorted([p.package_name for p in model.get_package()])
+    assert len(model._lazy_packages) == 0
+    assert names == sorted([p.package_name for p in
+                            model_eager.get_package()])
+
+
+def test005_advgw_tidal_snapshot():
+    # init paths
+    test_ex_name = 'test005_advgw_tidal'
+    model_name = 'gwf_1'
+
+    pth = os.path.join('..', 'examples', 'data', 'mf6', test_ex_name)
+    run_folder = os.path.join(cpth, test_ex_name + '_snapshot')
+    if not os.path.isdir(run_folder):
+        os.makedirs(run_folder)
+    snapshot = os.path.join(run_folder, 'sim.snapshot')
+    for ext in ('.json', '.dat'):
+        if os.path.isfile(snapshot + ext):
+            os.remove(snapshot + ext)
+
+    # the first call loads the input files and saves the snapshot
+    sim = MFSimulation.load_snapshot(model_name, 'mf6', exe_name, pth,
+                                     snapshot=snapshot)
+    assert os.path.isfile(snapshot + '.json')
+    assert os.path.isfile(snapshot + '.dat')
+
+    # the second call loads the snapshot
+    sim_snap = MFSimulation.load_snapshot(model_name, 'mf6', exe_name, pth,
+                                          snapshot=snapshot)
+    assert sim_snap is not sim
+    model = sim.get_model(model_name)
+    model_snap = sim_snap.get_model(model_name)
+    assert np.allclose(model_snap.npf.k.get_data(), model.npf.k.get_data())
+
+    # the snapshot writes the same input files
+    folders = []
+    for s, name in ((sim, 'load'), (sim_snap, 'snap')):
+        folder = os.path.join(run_folder, name)
+        s.simulation_data.mfpath.set_sim_path(folder)
+        s.write_simulation()
+        folders.append(folder)
+    for fname in os.listdir(folders[0]):
+        f1 = open(os.path.join(folders[0], fname)).read()
+        f2 = open(os.path.join(folders[1], fname)).read()
+        assert f1 == f2, 'snapshot wrote a different {}'.format(fname)
+
+
 if __name__ == '__main__':
     test027_timeseriestest()
     test006_2models_mvr()
@@ -0,0 +1,95 @@
+"""
+Benchmark the formatting of Util2d arrays for MODFLOW input files.
+
+The block formatter used by Util2d.array2string and Util2d.write_txt is
+compared with formatting the array one value at a time (one row at a time
+with np.savetxt for (FREE)) for the (FREE), (10G15.6) and (20I5) format
+descriptors. Use --nrow and --ncol to change the size of the array (default
+is 100 x 100, the size used by the autotests), for example --nrow 1000
+--ncol 1000 for a benchmark.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import numpy as np
+import flopy
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+Util2d = flopy.utils.Util2d
+ArrayFormat = flopy.utils.util_array.ArrayFormat
+
+
+def get_shape():
+    nrow, ncol = 100, 100
+    narg = len(sys.argv)
+    iarg = 0
+    while iarg < narg - 1:
+        iarg += 1
+        basearg = sys.argv[iarg].lower()
+        if basearg == '--nrow':
+            iarg += 1
+            nrow = int(sys.argv[iarg])
+        elif basearg == '--ncol':
+            iarg += 1
+            ncol = int(sys.argv[iarg])
+    return nrow, ncol
+
+
+def format_values(shape, data, fortran_format):
+    # format the array one value (or one row with np.savetxt) at a time
+    if fortran_format.upper() == '(FREE)':
+        f = StringIO()
+        np.savetxt(f, data, ArrayFormat.get_default_numpy_fmt(data.dtype),
+                   delimiter='')
+        return f.getvalue()
+    column_length, output_fmt = Util2d._get_output_format(fortran_format)
+    return Util2d._array2string_loop(shape[0], shape[1], data,
+                                     column_length, output_fmt)
+
+
+def format_array(shape, data, fortran_format):
+    # format the array with the block formatter
+    if fortran_format.upper() == '(FREE)':
+        f = StringIO()
+        Util2d.write_txt(shape, f, data, fortran_format=fortran_format)
+        return f.getvalue()
+    return Util2d.array2string(shape, data, fortran_format=fortran_format)
+
+
+def timeit(function, *args):
+    t0 = time.time()
+    s = function(*args)
+    return time.time() - t0, s
+
+
+def run():
+    shape = get_shape()
+    np.random.seed(0)
+    arrays = {'(FREE)': np.random.random(shape).astype(np.float32),
+              '(10G15.6)': np.random.random(shape).astype(np.float32),
+              '(20I5)': np.random.randint(0, 9999, shape)}
+
+    print('formatting {} x {} arrays'.format(*shape))
+    print('{:>12s} {:>12s} {:>12s} {:>8s}'.format('format', 'values (s)',
+                                                  'block (s)', 'speedup'))
+    for fortran_format in ('(FREE)', '(10G15.6)', '(20I5)'):
+        data = arrays[fortran_format]
+        t1, s1 = timeit(format_values, shape, data, fortran_format)
+        t2, s2 = timeit(format_array, shape, data, fortran_format)
+        if s1 != s2:
+            print('formatted arrays are different for ' +
+                  '{}'.format(fortran_format))
+            return 1
+        print('{:>12s} {:12.3f} {:12.3f} {:8.1f}'.format(fortran_format, t1,
+                                                         t2, t1 / t2))
+    return 0
+
+
+if __name__ == '__main__':
+    success = run()
@@ -526,10 +526,10 @@ def mflist_helper(f, mfl, **kwargs):
         # f.log("getting 4D masked arrays for {0}".format(base_name))
 
         # for name, array in m4d.items():
-        for name, array in mfl.masked_4D_arrays_itr():
+        for name, m4d in mfl.masked_4D_arrays_view.items():
             var_name = base_name + '_' + name
             if isinstance(f, dict):
-                f[var_name] = array
+                f[var_name] = np.array(m4d)
                 continue
             f.log("processing {0} attribute".format(name))
 
@@ -543,11 +543,13 @@ def mflist_helper(f, mfl, **kwargs):
             else:
                 attribs = {"long_name": var_name}
             attribs["coordinates"] = "time layer latitude longitude"
-            attribs["min"] = np.nanmin(array)
-            attribs["max"] = np.nanmax(array)
-            if np.isnan(attribs["min"]) or np.isnan(attribs["max"]):
+            # only the distinct arrays need to be checked
+            values = np.concatenate([a[~np.isnan(a)] for a in m4d.arrays])
+            if values.size == 0:
                 raise Exception(
                     "error processing {0}: all NaNs".format(var_name))
+            attribs["min"] = values.min()
+            attribs["max"] = values.max()
 
             if units is not None:
                 attribs["units"] = units
@@ -561,9 +563,11 @@ def mflist_helper(f, mfl, **kwargs):
                 f.logger.warn(estr)
                 raise Exception(estr)
 
-            array[np.isnan(array)] = f.fillvalue
+            arrays = [np.where(np.isnan(a), f.fillvalue, a)
+                      for a in m4d.arrays]
             try:
-                var[:] = array
+                for kper, idx in enumerate(m4d.kper_index):
+                    var[kper] = arrays[idx]
             except Exception as e:
                 estr = "error setting array to variable {0}:\n{1}".format(
                     var_name, str(e))
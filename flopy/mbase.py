@@ -11,6 +11,12 @@ import os
 import subprocess as sp
 import shutil
 import threading
+import multiprocessing
+import multiprocessing.pool
+import traceback
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
 
 if sys.version_info > (3, 0):
     import queue as Queue
@@ -27,6 +33,80 @@ iconst = 1  # Multiplier for individual array elements in integer and real array
 iprn = -1  # Printout flag. If >= 0 then array values read are printed in listing file.
 
 
+# packages written by the processes of BaseModel._write_packages_parallel
+_write_pool_packages = None
+
+# model changes made by the current thread that are recorded instead of
+# applied, see BaseModel._detached_changes
+_detached = threading.local()
+
+
+def _detachable(method):
+    # the calls of a package loaded in a worker thread are recorded and
+    # applied to the model later by the main thread
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_detached, 'model', None) is self:
+            _detached.changes.append((method, args, kwargs))
+            return
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _write_package(p):
+    # prevent individual package checks from running after
+    # model-level package check above
+    # otherwise checks are run twice
+    # or the model level check procedure would have to be split up
+    # or each package would need a check arguemnt,
+    # or default for package level check would have to be False
+    try:
+        p.write_file(check=False)
+    except TypeError:
+        p.write_file()
+
+
+def _init_write_pool(packages):
+    global _write_pool_packages
+    _write_pool_packages = packages
+
+
+def _write_package_index(idx):
+    # write a package in a pool process. The error message, the changes of
+    # the model made while the package was written (external files, hashes
+    # of incremental writes) and whether the package used external unit
+    # numbers are returned to the parent process
+    p = _write_pool_packages[idx]
+    model = p.parent
+    next_ext_unit = model._next_ext_unit
+    changes = []
+    try:
+        with model._detached_changes(changes):
+            _write_package(p)
+        msg = None
+    except Exception:
+        msg = traceback.format_exc()
+    changes = [(method.__name__, args, kwargs)
+               for method, args, kwargs in changes]
+    return msg, changes, model._next_ext_unit != next_ext_unit
+
+
+def _get_write_context():
+    # processes are forked on linux. Forking is not safe on macOS and not
+    # available on Windows, the processes are spawned there.
+    if sys.platform.startswith('linux'):
+        method = 'fork'
+    else:
+        method = 'spawn'
+    try:
+        return multiprocessing.get_context(method)
+    except AttributeError:
+        # python 2 forks the pool processes on posix platforms
+        if method == 'fork':
+            return multiprocessing
+    return None
+
+
 def is_exe(fpath):
     return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
 
@@ -95,6 +175,8 @@ class BaseModel(object):
         to the current working directory.
 
     """
+    # lock of the external unit numbers of models used in several threads
+    _unit_lock = threading.Lock()
 
     def __init__(self, modelname='modflowtest', namefile_ext='nam',
                  exe_name='mf2k.exe', model_ws=None,
@@ -102,6 +184,16 @@ class BaseModel(object):
         """
         BaseModel init
         """
+        # packages registered by a lazy load that are loaded on access
+        self._lazy_packages = OrderedDict()
+        self.lazy_load = False
+        # map external binary arrays into memory instead of reading them
+        self.mmap_load = False
+        # content hashes of the files written by write_input(incremental=True)
+        self._write_hashes = {}
+        self._incremental_write = False
+        # pool of read-only arrays shared with other models (ArrayPool)
+        self.array_pool = None
         self.__name = modelname
         self.namefile_ext = namefile_ext
         self.namefile = self.__name + '.' + self.namefile_ext
@@ -195,10 +287,73 @@ class BaseModel(object):
         Function to encapsulate next_ext_unit attribute
 
         """
-        next_unit = self._next_ext_unit + 1
-        self._next_ext_unit += 1
+        with BaseModel._unit_lock:
+            next_unit = self._next_ext_unit + 1
+            self._next_ext_unit += 1
         return next_unit
 
+    @contextmanager
+    def _detached_changes(self, changes):
+        """
+        Record the changes of the model made by the current thread (added
+        or removed packages, output and external files and pop keys) in
+        changes instead of applying them. The changes are applied with
+        _apply_changes().
+
+        """
+        _detached.model, _detached.changes = self, changes
+        try:
+            yield changes
+        finally:
+            _detached.model = _detached.changes = None
+
+    def _apply_changes(self, changes):
+        """
+        Apply the changes recorded by _detached_changes().
+
+        """
+        for method, args, kwargs in changes:
+            method(self, *args, **kwargs)
+
+    @property
+    def packagelist(self):
+        """
+        List of the packages in the model. Packages that were registered
+        by a lazy load are loaded before the list is returned.
+
+        """
+        self._load_lazy_packages()
+        return self._packagelist
+
+    @packagelist.setter
+    def packagelist(self, value):
+        self._packagelist = value
+
+    def _load_lazy_packages(self, name=None):
+        """
+        Load packages that were registered by a lazy load.
+
+        Parameters
+        ----------
+        name : str
+            Name of the package to load, 'RIV', 'LPF', etc.
+            (case-insensitive). If None, all of the registered packages are
+            loaded. (default is None)
+
+        """
+        if name is None:
+            names = list(self._lazy_packages.keys())
+        elif name.upper() in self._lazy_packages:
+            names = [name.upper()]
+        else:
+            return
+        for name in names:
+            # remove the entry first so that the package can access the
+            # model while it is being loaded
+            load = self._lazy_packages.pop(name, None)
+            if load is not None:
+                load()
+
     def export(self, f, **kwargs):
         # for pak in self.packagelist:
         #    f = pak.export(f)
@@ -206,6 +361,7 @@ class BaseModel(object):
         from .export import utils
         return utils.model_helper(f, self, **kwargs)
 
+    @_detachable
     def add_package(self, p):
         """
         Add a package.
@@ -226,19 +382,20 @@ class BaseModel(object):
                           "of package {} already in use".format(pn)
                     print(msg)
             self.package_units.append(u)
-        for i, pp in enumerate(self.packagelist):
+        for i, pp in enumerate(self._packagelist):
             if pp.allowDuplicates:
                 continue
             elif isinstance(p, type(pp)):
                 print('****Warning -- two packages of the same type: ',
                       type(p), type(pp))
                 print('replacing existing Package...')
-                self.packagelist[i] = p
+                self._packagelist[i] = p
                 return
         if self.verbose:
             print('adding Package: ', p.name[0])
-        self.packagelist.append(p)
+        self._packagelist.append(p)
 
+    @_detachable
     def remove_package(self, pname):
         """
         Remove a package from this model
@@ -249,13 +406,15 @@ class BaseModel(object):
             Name of the package, such as 'RIV', 'BAS6', etc.
 
         """
-        for i, pp in enumerate(self.packagelist):
+        if self._lazy_packages.pop(pname.upper(), None) is not None:
+            return
+        for i, pp in enumerate(self._packagelist):
             if pname.upper() in pp.name:
                 if self.verbose:
                     print('removing Package: ', pp.name)
 
                 # Remove the package object from the model's packagelist
-                p = self.packagelist.pop(i)
+                p = self._packagelist.pop(i)
 
                 # Remove the package unit number from the list of package
                 # units stored with the model
@@ -304,6 +463,11 @@ class BaseModel(object):
                 return self.dis.tr.start_datetime
             else:
                 return None
+        if item in ('_packagelist', '_lazy_packages') or \
+                (item.startswith('__') and item.endswith('__')):
+            # not set yet (for example, while the model is unpickled), or
+            # special methods looked up by pickle and copy
+            raise AttributeError(item)
 
         return self.get_package(item)
 
@@ -337,6 +501,7 @@ class BaseModel(object):
               '{} the output list.'.format(txt2)
         print(msg)
 
+    @_detachable
     def add_output_file(self, unit, fname=None, extension='cbc',
                         binflag=True, package=None):
         """
@@ -403,6 +568,7 @@ class BaseModel(object):
             self.add_output(fname, unit, binflag=binflag, package=package)
         return
 
+    @_detachable
     def add_output(self, fname, unit, binflag=False, package=None):
         """
         Assign an external array so that it will be listed as a DATA or
@@ -443,6 +609,7 @@ class BaseModel(object):
 
         return
 
+    @_detachable
     def remove_output(self, fname=None, unit=None):
         """
         Remove an output file from the model by specifying either the
@@ -588,6 +755,7 @@ class BaseModel(object):
                     v = self.output_units[idx]
         return v
 
+    @_detachable
     def add_external(self, fname, unit, binflag=False, output=False):
         """
         Assign an external array so that it will be listed as a DATA or
@@ -627,6 +795,7 @@ class BaseModel(object):
         self.external_output.append(output)
         return
 
+    @_detachable
     def remove_external(self, fname=None, unit=None):
         """
         Remove an external file from the model by specifying either the
@@ -737,7 +906,9 @@ class BaseModel(object):
         if not name:
             raise ValueError('invalid package name')
         name = name.upper()
-        for p in self.packagelist:
+        if name in self._lazy_packages:
+            return True
+        for p in self._packagelist:
             for pn in p.name:
                 if pn.upper() == name:
                     return True
@@ -761,7 +932,8 @@ class BaseModel(object):
         if not name:
             raise ValueError('invalid package name')
         name = name.upper()
-        for pp in (self.packagelist):
+        self._load_lazy_packages(name)
+        for pp in (self._packagelist):
             if pp.name[0].upper() == name:
                 return pp
         return None
@@ -781,8 +953,10 @@ class BaseModel(object):
 
         """
         val = []
-        for pp in (self.packagelist):
+        for pp in (self._packagelist):
             val.append(pp.name[0].upper())
+        # packages registered by a lazy load
+        val += list(self._lazy_packages.keys())
         return val
 
     def set_version(self, version):
@@ -982,7 +1156,8 @@ class BaseModel(object):
 
         return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def write_input(self, SelPackList=False, check=False, parallel=False,
+                    incremental=False):
         """
         Write the input.
 
@@ -990,6 +1165,26 @@ class BaseModel(object):
         ----------
         SelPackList : False or list of packages
 
+        check : boolean
+            Check model input for common errors before writing.
+            (default False)
+
+        parallel : bool or int
+            Write the package files concurrently in a pool of processes.
+            If an int, the number of processes; if True, the number of
+            CPUs. The processes are forked on Linux and spawned on other
+            platforms, where the main module of a script has to be guarded
+            by if __name__ == '__main__'. The files and the external files
+            of the model are the same as with the serial writer.
+            (default False)
+
+        incremental : boolean
+            Only write the packages (and the external array files) whose
+            data has changed since they were last written with
+            incremental=True. A package is also written if its file was
+            removed or modified since it was written. The name file is
+            always written. (default False)
+
         """
         if check:
             # run check prior to writing input
@@ -1008,37 +1203,153 @@ class BaseModel(object):
             print('\nWriting packages:')
 
         if SelPackList == False:
-            for p in self.packagelist:
-                if self.verbose:
-                    print('   Package: ', p.name[0])
-                # prevent individual package checks from running after
-                # model-level package check above
-                # otherwise checks are run twice
-                # or the model level check procedure would have to be split up
-                # or each package would need a check arguemnt,
-                # or default for package level check would have to be False
-                try:
-                    p.write_file(check=False)
-                except TypeError:
-                    p.write_file()
+            packages = list(self.packagelist)
         else:
+            packages = []
             for pon in SelPackList:
                 for i, p in enumerate(self.packagelist):
                     if pon in p.name:
-                        if self.verbose:
-                            print('   Package: ', p.name[0])
-                        try:
-                            p.write_file(check=False)
-                        except TypeError:
-                            p.write_file()
-                            break
+                        packages.append(p)
+
+        if incremental:
+            unchanged = [p for p in packages if self._is_written(p)]
+            if self.verbose:
+                for p in unchanged:
+                    print('   Package: ', p.name[0], '(unchanged)')
+            packages = [p for p in packages if p not in unchanged]
+
+        self._incremental_write = incremental
+        try:
+            written = False
+            if parallel and len(packages) > 1:
+                written = self._write_packages_parallel(packages, parallel)
+            if not written:
+                for p in packages:
+                    if self.verbose:
+                        print('   Package: ', p.name[0])
+                    _write_package(p)
+        finally:
+            self._incremental_write = False
         if self.verbose:
             print(' ')
         # write name file
         self.write_name_file()
+        if incremental:
+            # the hashes are computed after the name file is written, which
+            # can update the spatial reference attributes of the packages
+            for p in packages:
+                if hasattr(p, 'get_content_hash'):
+                    self.set_written(p.fn_path, p.get_content_hash())
         # os.chdir(org_dir)
         return
 
+    @_detachable
+    def set_written(self, fpth, content_hash):
+        """
+        Record the content hash of a file written by
+        write_input(incremental=True).
+
+        Parameters
+        ----------
+        fpth : str
+            path of the file
+        content_hash : str
+            hash of the data written to the file
+
+        """
+        fpth = os.path.abspath(fpth)
+        st = os.stat(fpth)
+        self._write_hashes[fpth] = (content_hash, st.st_size, st.st_mtime)
+
+    def is_written(self, fpth, content_hash):
+        """
+        Check if a file was written by write_input(incremental=True) with
+        data that has the content hash content_hash, and has not been
+        modified since.
+
+        Parameters
+        ----------
+        fpth : str
+            path of the file
+        content_hash : str
+            hash of the data
+
+        Returns
+        -------
+        written : bool
+
+        """
+        fpth = os.path.abspath(fpth)
+        if fpth not in self._write_hashes or not os.path.isfile(fpth):
+            return False
+        st = os.stat(fpth)
+        return self._write_hashes[fpth] == (content_hash, st.st_size,
+                                            st.st_mtime)
+
+    def _is_written(self, p):
+        # check if the file of package p is up to date
+        if not hasattr(p, 'get_content_hash'):
+            return False
+        fpth = os.path.abspath(p.fn_path)
+        if fpth not in self._write_hashes:
+            return False
+        return self.is_written(fpth, p.get_content_hash())
+
+    def _write_packages_parallel(self, packages, nproc=True):
+        """
+        Write the package files in a pool of processes. The changes of the
+        model made by the processes (external files, hashes of incremental
+        writes) are applied to the model in package order.
+
+        Returns
+        -------
+        success : bool
+            False if the packages could not be written concurrently and
+            have to be written one after another.
+
+        """
+        # arrays of fixed format models are written to external files with
+        # unit numbers that depend on the order the packages are written
+        if self.external_path is not None and not self.array_free_format:
+            return False
+        context = _get_write_context()
+        if context is None:
+            return False
+        if nproc is True:
+            nproc = multiprocessing.cpu_count()
+        nproc = min(int(nproc), len(packages))
+        if nproc < 2:
+            return False
+        if self.verbose:
+            for p in packages:
+                print('   Package: ', p.name[0])
+
+        pool = context.Pool(nproc, initializer=_init_write_pool,
+                            initargs=(packages,))
+        try:
+            results = pool.map(_write_package_index, range(len(packages)),
+                               chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+        for p, (msg, changes, units) in zip(packages, results):
+            if msg is not None:
+                raise Exception('error writing {} package:\n{}'.format(
+                    p.name[0], msg))
+            if units:
+                # external unit numbers are assigned in the order the arrays
+                # are written, the package is written again to get the unit
+                # numbers of the serial writer
+                if self.verbose:
+                    print('   Package: ', p.name[0],
+                          '(external units, written again)')
+                _write_package(p)
+            else:
+                for name, args, kwargs in changes:
+                    getattr(self, name)(*args, **kwargs)
+        return True
+
     def write_name_file(self):
         """
         Every Package needs its own writenamefile function
@@ -1068,6 +1379,7 @@ class BaseModel(object):
         """
         return copy.deepcopy(self.__name)
 
+    @_detachable
     def add_pop_key_list(self, key):
         """
         Add a external file unit number to a list that will be used to remove
@@ -1088,7 +1400,7 @@ class BaseModel(object):
         if key not in self.pop_key_list:
             self.pop_key_list.append(key)
 
-    def check(self, f=None, verbose=True, level=1):
+    def check(self, f=None, verbose=True, level=1, parallel=False):
         """
         Check model data for common errors.
 
@@ -1105,27 +1417,50 @@ class BaseModel(object):
         level : int
             Check method analysis level. If level=0, summary checks are
             performed. If level=1, full checks are performed.
+        parallel : bool or int
+            Check the packages concurrently in a pool of threads. If an
+            int, the number of threads; if True, the number of CPUs. The
+            package checks are independent, the results are added to the
+            model summary in package order. (default False)
 
         Returns
         -------
-        None
+        chk : flopy.utils.check
+            Model level checker. chk.timings has the time spent on each
+            rule of each package.
 
         Examples
         --------
 
         >>> import flopy
         >>> m = flopy.modflow.Modflow.load('model.nam')
-        >>> m.check()
+        >>> chk = m.check(parallel=True)
+        >>> print(chk.print_timings())
         """
 
         # check instance for model-level check
         chk = utils.check(self, f=f, verbose=verbose, level=level)
-        results = {}
+        results = OrderedDict()
 
-        for p in self.packagelist:
-            if chk.package_check_levels.get(p.name[0].lower(), 0) <= level:
-                results[p.name[0]] = p.check(f=None, verbose=False,
-                                             level=level - 1)
+        packages = [p for p in self.packagelist
+                    if chk.package_check_levels.get(p.name[0].lower(),
+                                                    0) <= level]
+
+        def check_package(p):
+            return p.check(f=None, verbose=False, level=level - 1)
+
+        if parallel and len(packages) > 1:
+            nproc = None if parallel is True else int(parallel)
+            pool = multiprocessing.pool.ThreadPool(nproc)
+            try:
+                checks = pool.map(check_package, packages)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            checks = [check_package(p) for p in packages]
+        for p, r in zip(packages, checks):
+            results[p.name[0]] = r
 
         # model level checks
         # solver check
@@ -1164,11 +1499,12 @@ class BaseModel(object):
         # add package check results to model level check summary
         for k, r in results.items():
             if r is not None and r.summary_array is not None:  # currently SFR doesn't have one
-                chk.summary_array = np.append(chk.summary_array,
-                                              r.summary_array).view(
-                    np.recarray)
+                chk._append_to_summary(r.summary_array)
                 chk.passed += ['{} package: {}'.format(r.package.name[0], psd)
                                for psd in r.passed]
+            if r is not None and hasattr(r, 'timings'):
+                for rule, t in r.timings.items():
+                    chk.timings['{} package: {}'.format(k, rule.strip())] = t
         chk.summarize()
         return chk
 
@@ -3,6 +3,7 @@ mfmodel module.  Contains the MFModel class
 
 """
 import os, sys, inspect
+import collections
 import numpy as np
 from .mfbase import PackageContainer, ExtFileAction, PackageContainerType, \
                     MFDataException, ReadAsArraysException, FlopyException, \
@@ -82,6 +83,8 @@ class MFModel(PackageContainer):
                  exe_name='mf6.exe', add_to_simulation=True,
                  structure=None, model_rel_path='.', **kwargs):
         super(MFModel, self).__init__(simulation.simulation_data, modelname)
+        # packages registered by a lazy load that are loaded on access
+        self._lazy_packages = collections.OrderedDict()
         self.simulation = simulation
         self.simulation_data = simulation.simulation_data
         self.name = modelname
@@ -168,7 +171,8 @@ class MFModel(PackageContainer):
     @classmethod
     def load_base(cls, simulation, structure, modelname='NewModel',
                   model_nam_file='modflowtest.nam', type='gwf', version='mf6',
-                  exe_name='mf6.exe', strict=True, model_rel_path='.'):
+                  exe_name='mf6.exe', strict=True, model_rel_path='.',
+                  lazy=False):
         """
         Load an existing model.
 
@@ -194,6 +198,10 @@ class MFModel(PackageContainer):
             strict mode when loading files
         model_rel_path : string
             relative path of model folder to simulation folder
+        lazy : boolean
+            only load the discretization package. the other packages are
+            registered from the name file and loaded when they are first
+            accessed
         Returns
         -------
         model : MFModel
@@ -229,6 +237,7 @@ class MFModel(PackageContainer):
         sim_struct = mfstructure.MFStructure().sim_struct
         instance._ftype_num_dict = {}
         for ftype, fname, pname in packages_ordered:
+            priority = ftype in priority_packages
             ftype = ftype[0:-1].lower()
             if ftype in structure.package_struct_objs or ftype in \
               sim_struct.utl_struct_objs:
@@ -237,25 +246,92 @@ class MFModel(PackageContainer):
                     filemgr = simulation.simulation_data.mfpath
                     fname = filemgr.strip_model_relative_path(modelname,
                                                               fname)
+                if lazy and not priority:
+                    # register package, it is loaded when first accessed
+                    instance._lazy_packages[(ftype, fname, pname)] = strict
+                    continue
                 print('loading {}...'.format(fname))
                 # load package
                 instance.load_package(ftype, fname, pname, strict, None)
 
         # load referenced packages
-        if modelname in instance.simulation_data.referenced_files:
+        instance._load_referenced_packages(strict)
+
+        # TODO: fix jagged lists where appropriate
+
+        return instance
+
+    def _load_referenced_packages(self, strict):
+        """
+        loads packages referenced by packages that have been loaded
+
+        Parameters
+        ----------
+        strict : boolean
+            strict mode when loading files
+        """
+        if self.name in self.simulation_data.referenced_files:
+            sim_struct = mfstructure.MFStructure().sim_struct
             for index, ref_file in \
-              instance.simulation_data.referenced_files[modelname].items():
-                if (ref_file.file_type in structure.package_struct_objs or
+              self.simulation_data.referenced_files[self.name].items():
+                if (ref_file.file_type in self.structure.package_struct_objs or
                   ref_file.file_type in sim_struct.utl_struct_objs) and \
                   not ref_file.loaded:
-                    instance.load_package(ref_file.file_type,
-                                          ref_file.file_name, None, strict,
-                                          ref_file.reference_path)
+                    self.load_package(ref_file.file_type,
+                                      ref_file.file_name, None, strict,
+                                      ref_file.reference_path)
                     ref_file.loaded = True
 
-        # TODO: fix jagged lists where appropriate
+    def _load_lazy_packages(self, name=None):
+        """
+        loads packages that were registered by a lazy load
 
-        return instance
+        Parameters
+        ----------
+        name : string
+            package type or package name of the packages to load
+            (case-insensitive, the whole type or name must match). all
+            registered packages are loaded if name is None
+        """
+        lazy_packages = self.__dict__.get('_lazy_packages')
+        if not lazy_packages:
+            return
+        if name is not None:
+            name = name.lower()
+            if name.startswith('_'):
+                return
+        strict = True
+        loaded = False
+        for key in list(lazy_packages.keys()):
+            ftype, fname, pname = key
+            if name is None or name == ftype or \
+                    (pname is not None and pname.lower() == name):
+                # remove the entry first so that the package can access
+                # the model while it is being loaded
+                strict = lazy_packages.pop(key)
+                print('loading {}...'.format(fname))
+                self.load_package(ftype, fname, pname, strict, None)
+                loaded = True
+        if loaded:
+            self._load_referenced_packages(strict)
+
+    def get_package(self, name=None):
+        """
+        Get a package. Packages registered by a lazy load are loaded
+        when they are requested.
+
+        Parameters
+        ----------
+        name : str
+            Name of the package, 'RIV', 'LPF', etc.
+
+        Returns
+        -------
+        pp : Package object
+
+        """
+        self._load_lazy_packages(name)
+        return super(MFModel, self).get_package(name)
 
     def write(self, ext_file_action=ExtFileAction.copy_relative_paths):
         """
@@ -275,6 +351,9 @@ class MFModel(PackageContainer):
         --------
         """
 
+        # load any packages that have not been loaded
+        self._load_lazy_packages()
+
         # write name file
         self.name_file.write(ext_file_action=ext_file_action)
 
@@ -301,6 +380,9 @@ class MFModel(PackageContainer):
         if not self.name_file.is_valid():
             return False
 
+        # load any packages that have not been loaded
+        self._load_lazy_packages()
+
         # valid packages
         for pp in self.packages:
             if not pp.is_valid():
@@ -331,6 +413,9 @@ class MFModel(PackageContainer):
         Examples
         --------
         """
+        # packages have to be loaded from the current location
+        self._load_lazy_packages()
+
         # update path in the file manager
         file_mgr = self.simulation_data.mfpath
         file_mgr.set_last_accessed_model_path()
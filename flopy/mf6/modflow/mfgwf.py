@@ -70,7 +70,7 @@ class ModflowGwf(mfmodel.MFModel):
     -------
     load : (simulation : MFSimulationData, model_name : string,
         namfile : string, version : string, exe_name : string,
-        model_ws : string, strict : boolean) : MFSimulation
+        model_ws : string, strict : boolean, lazy : boolean) : MFSimulation
         a class method that loads a model from files
     """
     model_type = 'gwf'
@@ -96,7 +96,9 @@ class ModflowGwf(mfmodel.MFModel):
     @classmethod
     def load(cls, simulation, structure, modelname='NewModel',
              model_nam_file='modflowtest.nam', version='mf6',
-             exe_name='mf6.exe', strict=True, model_rel_path='.'):
+             exe_name='mf6.exe', strict=True, model_rel_path='.',
+             lazy=False):
         return mfmodel.MFModel.load_base(simulation, structure, modelname,
                                          model_nam_file, 'gwf', version,
-                                         exe_name, strict, model_rel_path)
+                                         exe_name, strict, model_rel_path,
+                                         lazy)
@@ -363,7 +363,7 @@ class MFSimulation(PackageContainer):
 
     @classmethod
     def load(cls, sim_name='modflowsim', version='mf6', exe_name='mf6.exe',
-             sim_ws='.', strict=True):
+             sim_ws='.', strict=True, lazy=False):
         """
         Load an existing model.
 
@@ -383,6 +383,9 @@ class MFSimulation(PackageContainer):
             path to simulation working folder
         strict : boolean
             strict enforcement of file formatting
+        lazy : boolean
+            only load the discretization package of each model. the other
+            model packages are loaded when they are first accessed
         Returns
         -------
         sim : MFSimulation object
@@ -390,6 +393,7 @@ class MFSimulation(PackageContainer):
         Examples
         --------
         >>> s = flopy6.mfsimulation.load('my simulation')
+        >>> s = flopy6.mfsimulation.load('my simulation', lazy=True)
         """
 
         # initialize
@@ -430,7 +434,7 @@ class MFSimulation(PackageContainer):
             instance._models[item[2]] = model_obj.load(
                 instance,
                 instance.structure.model_struct_objs[item[0].lower()], item[2],
-                name_file, version, exe_name, strict, path)
+                name_file, version, exe_name, strict, path, lazy)
 
         # load exchange packages and dependent packages
         try:
@@ -517,6 +521,100 @@ class MFSimulation(PackageContainer):
         instance.simulation_data.mfpath.set_last_accessed_path()
         return instance
 
+    def _snapshot_files(self):
+        """
+        Input files of the simulation, the files of the simulation and model
+        packages and the external files.
+
+        """
+        def package_files(container):
+            for package in container.packages:
+                yield package.get_file_path()
+                for fpth in package_files(package):
+                    yield fpth
+
+        files = list(package_files(self))
+        for model in self._models.values():
+            model._load_lazy_packages()
+            files.append(model.name_file.get_file_path())
+            files.extend(package_files(model))
+        files.extend(self.simulation_data.mfpath.existing_file_dict.keys())
+        unique = []
+        for fpth in files:
+            if fpth not in unique:
+                unique.append(fpth)
+        return unique
+
+    def save_snapshot(self, f=None):
+        """
+        Save a snapshot of the simulation that can be loaded faster than the
+        MODFLOW 6 input files with MFSimulation.load_snapshot.
+
+        Parameters
+        ----------
+        f : string
+            path of the snapshot without extension. The manifest is saved in
+            f + '.json' and the arrays in f + '.dat'. If None, the snapshot
+            is saved as sim_ws/name.snapshot
+
+        Examples
+        --------
+        >>> s = flopy6.mfsimulation.load('my simulation')
+        >>> s.save_snapshot()
+        """
+        from flopy.utils.snapshot import save_snapshot
+        if f is None:
+            f = os.path.join(self.simulation_data.mfpath.get_sim_path(),
+                             '{}.snapshot'.format(self.name))
+        files = self._snapshot_files()
+        save_snapshot(self, f, files=files)
+
+    @classmethod
+    def load_snapshot(cls, sim_name='modflowsim', version='mf6',
+                      exe_name='mf6.exe', sim_ws='.', strict=True,
+                      snapshot=None, mmap=True):
+        """
+        Load a simulation from a snapshot saved with save_snapshot.  If there
+        is no snapshot, or if the input files have changed since the snapshot
+        was saved, the simulation is loaded with MFSimulation.load and a new
+        snapshot is saved.
+
+        Parameters
+        ----------
+        sim_name : string
+            name of the simulation.
+        version : string
+            MODFLOW version
+        exe_name : string
+            relative path to MODFLOW executable from the simulation working
+            folder
+        sim_ws : string
+            path to simulation working folder
+        strict : boolean
+            strict enforcement of file formatting
+        snapshot : string
+            path of the snapshot without extension.  If None,
+            sim_ws/sim_name.snapshot is used
+        mmap : boolean
+            memory map the arrays of the snapshot (copy-on-write)
+        Returns
+        -------
+        sim : MFSimulation object
+
+        Examples
+        --------
+        >>> s = flopy6.mfsimulation.load_snapshot('my simulation')
+        """
+        from flopy.utils.snapshot import load_snapshot
+        if snapshot is None:
+            snapshot = os.path.join(sim_ws, '{}.snapshot'.format(sim_name))
+        instance = load_snapshot(snapshot, mmap=mmap)
+        if isinstance(instance, cls):
+            return instance
+        instance = cls.load(sim_name, version, exe_name, sim_ws, strict)
+        instance.save_snapshot(snapshot)
+        return instance
+
     def load_package(self, ftype, fname, pname, strict, ref_path,
                      dict_package_name=None, parent_package=None):
         """
@@ -791,6 +889,9 @@ class MFSimulation(PackageContainer):
         self.simulation_data.mfpath.set_last_accessed_path()
 
     def set_sim_path(self, path):
+        # packages have to be loaded from the current location
+        for model in self._models.values():
+            model._load_lazy_packages()
         self.simulation_data.mfpath.set_sim_path(path)
 
     def run_simulation(self, silent=False, pause=False, report=False,
@@ -211,7 +211,8 @@ def build_model_load(model_type):
                    '    load : (simulation : MFSimulationData, model_name : ' \
                    'string,\n        namfile : string, ' \
                    'version : string, exe_name : string,\n        model_ws : '\
-                   'string, strict : boolean) : MFSimulation\n' \
+                   'string, strict : boolean, lazy : boolean) : ' \
+                   'MFSimulation\n' \
                    '        a class method that loads a model from files' \
                    '\n    """'
 
@@ -219,12 +220,13 @@ def build_model_load(model_type):
                  "modelname='NewModel',\n             " \
                  "model_nam_file='modflowtest.nam', version='mf6',\n" \
                  "             exe_name='mf6.exe', strict=True, " \
-                 "model_rel_path='.'):\n        " \
+                 "model_rel_path='.',\n             lazy=False):\n        " \
                  "return mfmodel.MFModel.load_base(simulation, structure, " \
                  "modelname,\n                                         " \
                  "model_nam_file, '{}', version,\n" \
                  "                                         exe_name, strict, " \
-                 "model_rel_path)\n".format(model_type)
+                 "model_rel_path,\n" \
+                 "                                         lazy)\n".format(model_type)
     return model_load, model_load_c
 
 
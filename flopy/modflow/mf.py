@@ -6,7 +6,11 @@ mf module.  Contains the ModflowGlobal, ModflowList, and Modflow classes.
 
 import os
 import sys
+import time
 import inspect
+import functools
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 import flopy
 from ..mbase import BaseModel
 from ..pakbase import Package
@@ -131,6 +135,7 @@ class Modflow(BaseModel):
         self.verbose = verbose
 
         self.load_fail = False
+        self.load_times = OrderedDict()
         # the starting external data unit number
         self._next_ext_unit = 1000
 
@@ -482,7 +487,8 @@ class Modflow(BaseModel):
 
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             parallel=False, lazy=False, array_pool=None, mmap=False):
         """
         Load an existing model.
 
@@ -499,15 +505,63 @@ class Modflow(BaseModel):
 
         check : boolean
             Check model input for common errors. (default True)
+
+        parallel : bool or int
+            Load the packages that only depend on DIS and BAS6
+            concurrently in a pool of threads after DIS and BAS6 have been
+            loaded.  If an int, the number of threads; if True, the number
+            of CPUs. The packages do not change the model while they are
+            loaded, the packages and their output and external files are
+            added to the model by the main thread in name file order.
+            (default False)
+
+        lazy : bool
+            Only load DIS and BAS6. The other packages are registered from
+            the name file and are loaded the first time they are accessed
+            (for example, ml.lpf or ml.get_package('LPF')), or when the
+            package list is needed (write_input, check, export, ...).
+            Arrays read with OPEN/CLOSE are read the first time their
+            values are requested. check is not run if lazy is True.
+            (default False)
+
+        array_pool : flopy.utils.ArrayPool
+            Pool of read-only arrays shared by the models loaded with the
+            same pool (for example, the realisations of an ensemble).
+            Identical arrays are stored once, assigning new values to an
+            array only changes the array of this model. (default is None)
+
+        mmap : bool
+            Map the arrays and lists of OPEN/CLOSE (BINARY) files and the
+            arrays of binary external files into memory (np.memmap) instead
+            of reading them. The values are read from the files when they
+            are used, and OPEN/CLOSE (BINARY) files are copied, not
+            rewritten, when the model is written to another workspace. The
+            mapped arrays are read-only. (default False)
+
         Returns
         -------
         ml : Modflow object
 
+        Notes
+        -----
+        The load time of each package (in seconds) is stored in the
+        load_times attribute of the model by file type ('file type:file
+        name' for the later entries of a file type that is used more than
+        once), and is reported if verbose is True.
+
         Examples
         --------
 
         >>> import flopy
         >>> ml = flopy.modflow.Modflow.load(f)
+        >>> ml = flopy.modflow.Modflow.load(f, parallel=4)
+        >>> ml.load_times
+        >>> ml = flopy.modflow.Modflow.load(f, lazy=True)
+        >>> hk = ml.lpf.hk.array
+        >>> pool = flopy.utils.ArrayPool()
+        >>> models = [flopy.modflow.Modflow.load(f, array_pool=pool)
+        ...           for i in range(10)]
+        >>> ml = flopy.modflow.Modflow.load(f, mmap=True)
 
         """
         # test if name file is passed with extension (i.e., is a valid file)
@@ -523,6 +577,9 @@ class Modflow(BaseModel):
                              format(modelname, 50 * '-'))
         ml = Modflow(modelname, version=version, exe_name=exe_name,
                      verbose=verbose, model_ws=model_ws)
+        ml.lazy_load = lazy
+        ml.array_pool = array_pool
+        ml.mmap_load = mmap
 
         files_succesfully_loaded = []
         files_not_loaded = []
@@ -592,13 +649,14 @@ class Modflow(BaseModel):
                 bas_key = key
                 break
         if bas_key is not None:
-            start = bas.filehandle.tell()
-            line = bas.filehandle.readline()
-            while line.startswith("#"):
-                line = bas.filehandle.readline()
-            if "FREE" in line.upper():
-                ml.free_format_input = True
-            bas.filehandle.seek(start)
+            with bas.handle() as fbas:
+                start = fbas.tell()
+                line = fbas.readline()
+                while line.startswith("#"):
+                    line = fbas.readline()
+                if "FREE" in line.upper():
+                    ml.free_format_input = True
+                fbas.seek(start)
         if verbose:
             print("ModflowBas6 free format:{0}\n".format(
                 ml.free_format_input))
@@ -617,24 +675,19 @@ class Modflow(BaseModel):
                 break
         if forgive:
             try:
-                dis = disnamdata.package.load(disnamdata.filename, ml,
-                                       ext_unit_dict=ext_unit_dict, check=False)
+                dis, dt = Modflow._load_package(disnamdata, ml,
+                                                ext_unit_dict)
                 files_succesfully_loaded.append(disnamdata.filename)
-                if ml.verbose:
-                    sys.stdout.write('   {:4s} package load...success\n'
-                                     .format(dis.name[0]))
+                ml._report_load(disnamdata, dt)
                 ext_unit_dict.pop(dis_key)
             except Exception as e:
                 s = 'Could not read discretization package: {}. Stopping...' \
                     .format(os.path.basename(disnamdata.filename))
                 raise Exception(s + " " + str(e))
         else:
-            dis = disnamdata.package.load(disnamdata.filename, ml,
-                                       ext_unit_dict=ext_unit_dict, check=False)
+            dis, dt = Modflow._load_package(disnamdata, ml, ext_unit_dict)
             files_succesfully_loaded.append(disnamdata.filename)
-            if ml.verbose:
-                sys.stdout.write('   {:4s} package load...success\n'
-                                 .format(dis.name[0]))
+            ml._report_load(disnamdata, dt)
             ext_unit_dict.pop(dis_key)
         start_datetime = ref_attributes.pop("start_datetime", "01-01-1970")
         itmuni = ref_attributes.pop("itmuni", 4)
@@ -661,23 +714,18 @@ class Modflow(BaseModel):
         if bas_key is not None:
             if forgive:
                 try:
-                    pck = bas.package.load(bas.filename, ml,
-                                           ext_unit_dict=ext_unit_dict,
-                                           check=False)
+                    pck, dt = Modflow._load_package(bas, ml, ext_unit_dict)
                     files_succesfully_loaded.append(bas.filename)
-                    if ml.verbose:
-                        sys.stdout.write('   {:4s} package load...success\n'
-                                         .format(pck.name[0]))
+                    ml._report_load(bas, dt)
                     ext_unit_dict.pop(bas_key)
                 except Exception as e:
                     s = 'Could not read basic package: {}. Stopping...' \
                         .format(os.path.basename(bas.filename))
                     raise Exception(s + " " + str(e))
             else:
-                pck = bas.package.load(bas.filename, ml,
-                                       ext_unit_dict=ext_unit_dict,
-                                       check=False)
+                pck, dt = Modflow._load_package(bas, ml, ext_unit_dict)
                 files_succesfully_loaded.append(bas.filename)
+                ml._report_load(bas, dt)
 
 
         if load_only is None:
@@ -709,45 +757,72 @@ class Modflow(BaseModel):
         ml.mfpar.set_zone(ml, ext_unit_dict)
         ml.mfpar.set_mult(ml, ext_unit_dict)
 
-        # try loading packages in ext_unit_dict
+        # packages to load, in name file order
+        load_items = [item for key, item in ext_unit_dict.items()
+                      if item.package is not None and
+                      item.filetype in load_only and item.filetype != "DIS"]
+
+        def load_item(item, detached=False):
+            # the model changes of a package loaded in a worker thread are
+            # returned and applied by the main thread
+            changes = []
+            try:
+                if detached:
+                    with ml._detached_changes(changes):
+                        pck, dt = Modflow._load_package(item, ml,
+                                                        ext_unit_dict,
+                                                        forgive)
+                else:
+                    pck, dt = Modflow._load_package(item, ml, ext_unit_dict,
+                                                    forgive)
+                return pck, dt, changes, None
+            except BaseException as o:
+                if not forgive:
+                    raise
+                return None, None, changes, o
+
+        if lazy:
+            # register the packages, they are loaded when first accessed
+            for item in load_items:
+                ml._lazy_packages[item.filetype.upper()] = functools.partial(
+                    ml._load_lazy, item, ext_unit_dict, forgive)
+            results = []
+        elif parallel and len(load_items) > 1:
+            nproc = None if parallel is True else int(parallel)
+            pool = ThreadPool(nproc)
+            try:
+                results = pool.map(functools.partial(load_item,
+                                                     detached=True),
+                                   load_items)
+            finally:
+                pool.close()
+                pool.join()
+            # attach the packages in name file order
+            for pck, dt, changes, o in results:
+                ml._apply_changes(changes)
+        else:
+            results = [load_item(item) for item in load_items]
+        results = dict((id(item), r) for item, r in zip(load_items, results))
+
+        # report the packages in ext_unit_dict
         for key, item in ext_unit_dict.items():
             if item.package is not None:
-                if item.filetype in load_only and item.filetype != "DIS":
-                    if not forgive:
-                        package_load_args = list(inspect.getargspec(item.package.load))[0]
-                        if "check" in package_load_args:
-                            pck = item.package.load(item.filename, ml,
-                                                    ext_unit_dict=ext_unit_dict,
-                                                    check=False)
-                        else:
-                            pck = item.package.load(item.filename, ml,
-                                                    ext_unit_dict=ext_unit_dict)
+                if id(item) in results:
+                    pck, dt, changes, o = results[id(item)]
+                    if o is None:
                         files_succesfully_loaded.append(item.filename)
+                        ml._report_load(item, dt)
+                    else:
+                        ml.load_fail = True
                         if ml.verbose:
                             sys.stdout.write(
-                                '   {:4s} package load...success\n'
-                                .format(pck.name[0]))
-                    else:
-                        try:
-                            try:
-                                pck = item.package.load(item.filename, ml,
-                                                        ext_unit_dict=ext_unit_dict,
-                                                        check=False)
-                            except TypeError:
-                                pck = item.package.load(item.filename, ml,
-                                                        ext_unit_dict=ext_unit_dict)
-                            files_succesfully_loaded.append(item.filename)
-                            if ml.verbose:
-                                sys.stdout.write(
-                                    '   {:4s} package load...success\n'
-                                    .format(pck.name[0]))
-                        except BaseException as o:
-                            ml.load_fail = True
-                            if ml.verbose:
-                                sys.stdout.write(
-                                    '   {:4s} package load...failed\n   {!s}\n'
-                                    .format(item.filetype, o))
-                            files_not_loaded.append(item.filename)
+                                '   {:4s} package load...failed\n   {!s}\n'
+                                .format(item.filetype, o))
+                        files_not_loaded.append(item.filename)
+                elif item.filetype.upper() in ml._lazy_packages:
+                    if ml.verbose:
+                        sys.stdout.write('   {:4s} package load...deferred\n'
+                                         .format(item.filetype))
                 else:
                     if ml.verbose:
                         sys.stdout.write('   {:4s} package load...skipped\n'
@@ -783,6 +858,10 @@ class Modflow(BaseModel):
                     sys.stdout.write('Warning: external file unit " +\
                         "{} does not exist in ext_unit_dict.\n'.format(key))
 
+        # close the name file entries, the files of packages that are
+        # loaded later (lazy) are opened again when they are used
+        ext_unit_dict.close()
+
         # write message indicating packages that were successfully loaded
         if ml.verbose:
             print(1 * '\n')
@@ -799,8 +878,174 @@ class Modflow(BaseModel):
                     print('      ' + os.path.basename(fname))
                 print('\n')
 
-        if check:
+        if check and not lazy:
             ml.check(f='{}.chk'.format(ml.name), verbose=ml.verbose, level=0)
 
         # return model object
         return ml
+
+    def _snapshot_files(self):
+        """
+        Input files of the model, the name file and the files of the
+        packages and external input files.
+
+        """
+        files = [self.namefile]
+        for p in self._packagelist:
+            files.append(p.file_name[0])
+        for fname in self.external_fnames:
+            if fname not in self.output_fnames:
+                files.append(fname)
+        return [os.path.join(self.model_ws, fname) for fname in files]
+
+    def save_snapshot(self, f=None):
+        """
+        Save a snapshot of the model that can be loaded faster than the
+        MODFLOW input files with Modflow.load_snapshot.
+
+        Parameters
+        ----------
+        f : str
+            path of the snapshot without extension. The manifest is saved in
+            f + '.json' and the arrays in f + '.dat'. If None, the snapshot
+            is saved as model_ws/name.snapshot. (default is None)
+
+        Notes
+        -----
+        The snapshot is keyed on the size and modification time of the input
+        files of the model, Modflow.load_snapshot reloads the input files if
+        any of them has changed.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> ml = flopy.modflow.Modflow.load('model.nam')
+        >>> ml.save_snapshot()
+
+        """
+        from ..utils.snapshot import save_snapshot
+        if f is None:
+            f = os.path.join(self.model_ws, self.name + '.snapshot')
+        # load any deferred packages
+        self._load_lazy_packages()
+        save_snapshot(self, f, files=self._snapshot_files())
+
+    @staticmethod
+    def load_snapshot(f, model_ws='.', snapshot=None, mmap=True, **kwargs):
+        """
+        Load a model from a snapshot saved with save_snapshot. If there is no
+        snapshot, or if the input files have changed since the snapshot was
+        saved, the model is loaded with Modflow.load and a new snapshot is
+        saved.
+
+        Parameters
+        ----------
+        f : MODFLOW name file
+            File to load.
+        model_ws : model workspace path
+        snapshot : str
+            path of the snapshot without extension. If None,
+            model_ws/name.snapshot is used. (default is None)
+        mmap : bool
+            Memory map the arrays of the snapshot (copy-on-write).
+            (default is True)
+        **kwargs : keyword arguments passed to Modflow.load
+
+        Returns
+        -------
+        ml : Modflow object
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> ml = flopy.modflow.Modflow.load_snapshot('model.nam')
+
+        """
+        from ..utils.snapshot import load_snapshot
+        if os.path.isfile(os.path.join(model_ws, f)):
+            modelname = f.rpartition('.')[0]
+        else:
+            modelname = f
+        if snapshot is None:
+            snapshot = os.path.join(model_ws, modelname + '.snapshot')
+        ml = load_snapshot(snapshot, mmap=mmap)
+        if isinstance(ml, Modflow):
+            if ml.model_ws != model_ws:
+                ml.change_model_ws(model_ws)
+            return ml
+        kwargs['lazy'] = False
+        ml = Modflow.load(f, model_ws=model_ws, **kwargs)
+        ml.save_snapshot(snapshot)
+        return ml
+
+    def _load_lazy(self, item, ext_unit_dict, forgive=True):
+        """
+        Load a package that was registered by a lazy load.
+
+        """
+        try:
+            pck, dt = Modflow._load_package(item, self, ext_unit_dict,
+                                            forgive)
+        except BaseException as o:
+            if not forgive:
+                raise
+            self.load_fail = True
+            if self.verbose:
+                sys.stdout.write('   {:4s} package load...failed\n   {!s}\n'
+                                 .format(item.filetype, o))
+            return
+        self._report_load(item, dt)
+
+        # pop binary output keys and any external file units that are now
+        # internal
+        for key in self.pop_key_list:
+            if key in ext_unit_dict:
+                self.remove_external(unit=key)
+                ext_unit_dict.pop(key)
+
+    @staticmethod
+    def _load_package(item, ml, ext_unit_dict, forgive=False):
+        """
+        Load the package for a name file entry. If forgive is True, a
+        loader that fails with a TypeError is called again without the
+        check argument.
+
+        Returns
+        -------
+        pck : Package object
+        dt : float
+            load time in seconds
+
+        """
+        t0 = time.time()
+        if forgive:
+            try:
+                pck = item.package.load(item.filename, ml,
+                                        ext_unit_dict=ext_unit_dict,
+                                        check=False)
+            except TypeError:
+                pck = item.package.load(item.filename, ml,
+                                        ext_unit_dict=ext_unit_dict)
+            return pck, time.time() - t0
+        package_load_args = list(inspect.getargspec(item.package.load))[0]
+        if "check" in package_load_args:
+            pck = item.package.load(item.filename, ml,
+                                    ext_unit_dict=ext_unit_dict,
+                                    check=False)
+        else:
+            pck = item.package.load(item.filename, ml,
+                                    ext_unit_dict=ext_unit_dict)
+        return pck, time.time() - t0
+
+    def _report_load(self, item, dt):
+        # the load times are keyed by file type, entries with a file type
+        # that is already used are keyed by file type and file name
+        key = item.filetype
+        if key in self.load_times:
+            key = '{}:{}'.format(key, os.path.basename(item.filename))
+        self.load_times[key] = dt
+        if self.verbose:
+            sys.stdout.write('   {:4s} package load...success ({:.3f} s)\n'
+                             .format(item.filetype, dt))
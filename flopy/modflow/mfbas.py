@@ -11,7 +11,7 @@ MODFLOW Guide
 import sys
 import numpy as np
 from ..pakbase import Package
-from ..utils import Util3d, check, get_neighbors
+from ..utils import Util3d, check, neighbor_reduce
 
 class ModflowBas(Package):
     """
@@ -181,12 +181,14 @@ class ModflowBas(Package):
         """
         chk = check(self, f=f, verbose=verbose, level=level)
 
-        neighbors = get_neighbors(self.ibound.array)
-        neighbors[np.isnan(neighbors)] = 0 # set neighbors at edges to 0 (inactive)
-        chk.values(self.ibound.array,
-                  (self.ibound.array > 0) & np.all(neighbors < 1, axis=0),
+        ibound = self.ibound.array
+
+        # neighbors at edges are inactive
+        chk.values(ibound,
+                   lambda: (ibound > 0) &
+                           neighbor_reduce(ibound, lambda v, n: n < 1),
                    'isolated cells in ibound array', 'Warning')
-        chk.values(self.ibound.array, np.isnan(self.ibound.array),
+        chk.values(ibound, lambda: np.isnan(ibound),
                    error_name='Not a number', error_type='Error')
         chk.summarize()
         return chk
@@ -724,18 +724,21 @@ class ModflowDis(Package):
         # make ibound of same shape as thicknesses/botm for quasi-3D models
         active = chk.get_active(include_cbd=True)
 
-        chk.values(self.thickness.array,
-                   active & (self.thickness.array <= 0),
+        # the rules are functions returning the cells that violate them
+        thickness = self.thickness.array
+        chk.values(thickness,
+                   lambda: active & (thickness <= 0),
                    'zero or negative thickness', 'Error')
-        thin_cells = (self.thickness.array < 1) & (self.thickness.array > 0)
-        chk.values(self.thickness.array, active & thin_cells,
+        chk.values(thickness,
+                   lambda: active & (thickness < 1) & (thickness > 0),
                    'thin cells (less than checker threshold of {:.1f})'
                    .format(chk.thin_cell_threshold), 'Error')
-        chk.values(self.top.array,
-                   active[0, :, :] & np.isnan(self.top.array),
+        top, botm = self.top.array, self.botm.array
+        chk.values(top,
+                   lambda: active[0, :, :] & np.isnan(top),
                    'nan values in top array', 'Error')
-        chk.values(self.botm.array,
-                   active & np.isnan(self.botm.array),
+        chk.values(botm,
+                   lambda: active & np.isnan(botm),
                    'nan values in bottom array', 'Error')
         chk.summarize()
         return chk
@@ -61,6 +61,11 @@ class ModflowEvt(Package):
         number greater than zero. To define the names for all package files
         (input and output) the length of the list of strings should be 2.
         Default is None.
+    compact : bool
+        If True, a stress period with the same array as the previous stress
+        period is not stored and reuses the previous array, and arrays with
+        the same value in every cell are stored as constants (see
+        Transient2d). (default is False)
 
     Attributes
     ----------
@@ -87,7 +92,7 @@ class ModflowEvt(Package):
     def __init__(self, model, nevtop=3, ipakcb=None, surf=0., evtr=1e-3, exdp=1.,
                  ievt=1,
                  extension='evt', unitnumber=None, filenames=None,
-                 external=True):
+                 external=True, compact=False):
 
         # set default unit number of one is not specified
         if unitnumber is None:
@@ -136,13 +141,13 @@ class ModflowEvt(Package):
             load = model.load
 
         self.surf = Transient2d(model, (nrow, ncol), np.float32,
-                                surf, name='surf')
+                                surf, name='surf', compact=compact)
         self.evtr = Transient2d(model, (nrow, ncol), np.float32,
-                                evtr, name='etvr')
+                                evtr, name='etvr', compact=compact)
         self.exdp = Transient2d(model, (nrow, ncol), np.float32,
-                                exdp, name='exdp')
+                                exdp, name='exdp', compact=compact)
         self.ievt = Transient2d(model, (nrow, ncol), np.int,
-                                ievt, name='ievt')
+                                ievt, name='ievt', compact=compact)
         self.np = 0
         self.parent.add_package(self)
 
@@ -188,7 +193,7 @@ class ModflowEvt(Package):
         f_evt.close()
 
     @staticmethod
-    def load(f, model, nper=None, ext_unit_dict=None):
+    def load(f, model, nper=None, ext_unit_dict=None, compact=False):
         """
         Load an existing package.
 
@@ -208,6 +213,10 @@ class ModflowEvt(Package):
             handle.  In this case ext_unit_dict is required, which can be
             constructed using the function
             :class:`flopy.utils.mfreadnam.parsenamefile`.
+        compact : bool
+            If True, the transient arrays are stored compactly: stress
+            periods that reuse the previous array are not stored again (see
+            Transient2d). (default is False)
 
         Returns
         -------
@@ -359,6 +368,7 @@ class ModflowEvt(Package):
         # set args for unitnumber and filenames
         args["unitnumber"] = unitnumber
         args["filenames"] = filenames
+        args["compact"] = compact
 
         evt = ModflowEvt(model, **args)
 
@@ -54,6 +54,11 @@ class ModflowRch(Package):
         number greater than zero. To define the names for all package files
         (input and output) the length of the list of strings should be 2.
         Default is None.
+    compact : bool
+        If True, a stress period with the same array as the previous stress
+        period is not stored and reuses the previous array, and arrays with
+        the same value in every cell are stored as constants (see
+        Transient2d). (default is False)
 
     Attributes
     ----------
@@ -90,7 +95,8 @@ class ModflowRch(Package):
     """
 
     def __init__(self, model, nrchop=3, ipakcb=None, rech=1e-3, irch=0,
-                 extension='rch', unitnumber=None, filenames=None):
+                 extension='rch', unitnumber=None, filenames=None,
+                 compact=False):
         """
         Package constructor.
 
@@ -138,10 +144,11 @@ class ModflowRch(Package):
         self.nrchop = nrchop
         self.ipakcb = ipakcb
         self.rech = Transient2d(model, (nrow, ncol), np.float32,
-                                rech, name='rech_')
+                                rech, name='rech_', compact=compact)
         if self.nrchop == 2:
+            # irch+1, as irch is zero based
             self.irch = Transient2d(model, (nrow, ncol), np.int,
-                                    irch + 1, name='irch_')  # irch+1, as irch is zero based
+                                    irch + 1, name='irch_', compact=compact)
         else:
             self.irch = None
         self.np = 0
@@ -181,7 +188,7 @@ class ModflowRch(Package):
         if self.parent.bas6 is not None:
             active = self.parent.bas6.ibound.array.sum(axis=0) != 0
         else:
-            active = np.ones(self.rech.array[0][0].shape, dtype=bool)
+            active = np.ones(self.rech.array_view[0, 0].shape, dtype=bool)
 
         # check for unusually high or low values of mean R/T
         hk_package = {'UPW', 'LPF'}.intersection(set(self.parent.get_package_list()))
@@ -285,7 +292,8 @@ class ModflowRch(Package):
         f_rch.close()
 
     @staticmethod
-    def load(f, model, nper=None, ext_unit_dict=None, check=True):
+    def load(f, model, nper=None, ext_unit_dict=None, check=True,
+             compact=False):
         """
         Load an existing package.
 
@@ -307,6 +315,10 @@ class ModflowRch(Package):
             :class:`flopy.utils.mfreadnam.parsenamefile`.
         check : boolean
             Check package data for common errors. (default True)
+        compact : bool
+            If True, the transient arrays are stored compactly: stress
+            periods that reuse the previous array are not stored again (see
+            Transient2d). (default is False)
 
         Returns
         -------
@@ -415,7 +427,8 @@ class ModflowRch(Package):
         # create recharge package instance
         rch = ModflowRch(model, nrchop=nrchop, ipakcb=ipakcb,
                          rech=rech, irch=irch,
-                         unitnumber=unitnumber, filenames=filenames)
+                         unitnumber=unitnumber, filenames=filenames,
+                         compact=compact)
         if check:
             rch.check(f='{}.chk'.format(rch.name[0]),
                       verbose=rch.parent.verbose, level=0)
@@ -13,6 +13,11 @@ from ..utils.flopy_io import line_parse
 from ..utils import SpatialReference
 from ..utils.recarray_utils import create_empty_recarray
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
 try:
     import pandas as pd
 except:
@@ -289,6 +294,7 @@ class ModflowSfr2(Package):
                          unit_number=units, extra=extra, filenames=fname)
 
         self.url = 'sfr2.htm'
+        self._routing_graphs = {}  # routing graph by stress period
 
         # Dataset 0 -----------------------------------------------------------------------
         self.heading = '# {} package for '.format(self.name[0]) + \
@@ -415,9 +421,6 @@ class ModflowSfr2(Package):
         # -input format checks:
         assert isfropt in [0, 1, 2, 3, 4, 5]
 
-        # derived attributes
-        self._paths = None
-
         self.parent.add_package(self)
 
     def __setattr__(self, key, value):
@@ -488,18 +491,8 @@ class ModflowSfr2(Package):
 
     @property
     def paths(self):
-        if self._paths is None:
-            self._set_paths()
-            return self._paths
-        # check to see if routing in segment data was changed
-        nseg = np.array(sorted(self._paths.keys()), dtype=int)
-        nseg = nseg[nseg > 0].copy()
-        outseg = np.array([self._paths[k][1] for k in nseg])
-        sd = self.segment_data[0]
-        if not np.array_equal(nseg, sd.nseg) or not np.array_equal(outseg,
-                                                                   sd.outseg):
-            self._set_paths()
-        return self._paths
+        # read-only, the paths are cached by the routing graph
+        return PathsView(self.get_routing_graph().get_paths())
 
     @property
     def df(self):
@@ -508,9 +501,33 @@ class ModflowSfr2(Package):
         else:
             return None
 
-    def _set_paths(self):
-        graph = self.graph
-        self._paths = {seg: find_path(graph, seg) for seg in graph.keys()}
+    def get_routing_graph(self, per=0):
+        """
+        Get the routing graph of the segments for a stress period. The
+        graph is computed once per stress period and computed again if the
+        nseg or outseg values of the stress period are changed.
+
+        Parameters
+        ----------
+        per : int
+            Stress period (default 0). Stress periods without segment data
+            use the segment data of the previous stress period.
+
+        Returns
+        -------
+        graph : RoutingGraph
+
+        """
+        pers = [p for p in self.segment_data.keys() if p <= per]
+        per = max(pers) if len(pers) > 0 else 0
+        sd = self.segment_data[per]
+        cached = self._routing_graphs.get(per)
+        if cached is not None and np.array_equal(cached.nseg, sd.nseg) and \
+                np.array_equal(cached.outseg, sd.outseg):
+            return cached
+        graph = RoutingGraph(sd.nseg, sd.outseg)
+        self._routing_graphs[per] = graph
+        return graph
 
     def _get_flag(self, flagname):
         """populate values for each stress period"""
@@ -984,24 +1001,23 @@ class ModflowSfr2(Package):
             # such as plotting elevation profiles
             self.outsegs[per] = all_outsegs
             '''
-            # use graph instead of above loop
-            nrow = len(self.segment_data[per].nseg)
-            ncol = np.max(
-                [len(v) if v is not None else 0 for v in self.paths.values()])
-            all_outsegs = np.zeros((nrow, ncol), dtype=int)
-            for i, (k, v) in enumerate(self.paths.items()):
-                if k > 0:
-                    all_outsegs[i, :len(v)] = v
-            all_outsegs.sort(axis=0)
+            # use the routing graph of the stress period instead of above loop
+            # (one row per segment with the path of the segment; segments
+            # with circular routing only have the segment number)
+            graph = self.get_routing_graph(per)
+            paths = graph.get_paths()
+            rows = [paths[s] if paths[s] is not None else [s]
+                    for s in graph.nseg.tolist()]
+            ncol = max([len(r) for r in rows]) if len(rows) > 0 else 0
+            all_outsegs = np.zeros((len(rows), ncol), dtype=int)
+            for i, r in enumerate(rows):
+                all_outsegs[i, :len(r)] = r
             self.outsegs[per] = all_outsegs
             # create a dictionary listing outlets associated with each segment
-            # outlet is the last value in each row of outseg array that is != 0 or 999999
-            # self.outlets[per] = {i + 1: r[(r != 0) & (r != 999999)][-1]
-            # if len(r[(r != 0) & (r != 999999)]) > 0
-            # else i + 1
-            #                     for i, r in enumerate(all_outsegs.T)}
-            self.outlets[per] = {k: self.paths[k][-1] if k in self.paths
-            else k for k in self.segment_data[per].nseg}
+            # outlet is the last segment of each path, or the lake (or
+            # outseg that is not a segment) at the end of the path
+            self.outlets[per] = dict(zip(graph.nseg.tolist(),
+                                         graph.outlets.tolist()))
         return txt
 
     def reset_reaches(self):
@@ -1028,22 +1044,21 @@ class ModflowSfr2(Package):
         self.reset_reaches()  # ensure that each segment starts with reach 1
         self.repair_outsegs()  # ensure that all outsegs are segments, outlets, or negative (lakes)
         rd = self.reach_data
-        outseg = self.graph
-        reach1IDs = dict(zip(rd[rd.ireach == 1].iseg,
-                             rd[rd.ireach == 1].reachID))
-        outreach = []
-        for i in range(len(rd)):
-            # if at the end of reach data or current segment
-            if i + 1 == len(rd) or rd.ireach[i + 1] == 1:
-                nextseg = outseg[rd.iseg[i]]  # get next segment
-                if nextseg > 0:  # current reach is not an outlet
-                    nextrchid = reach1IDs[
-                        nextseg]  # get reach 1 of next segment
-                else:
-                    nextrchid = 0
-            else:  # otherwise, it's the next reachID
-                nextrchid = rd.reachID[i + 1]
-            outreach.append(nextrchid)
+        graph = self.get_routing_graph()
+        # the outreach is the next reach in the segment
+        outreach = np.zeros(len(rd), dtype=rd.dtype['outreach'])
+        outreach[:-1] = rd.reachID[1:]
+        # or the first reach of the next segment for the last reaches
+        # (reach data are sorted by segment)
+        last = np.ones(len(rd), dtype=bool)
+        last[:-1] = rd.ireach[1:] == 1
+        iseg = graph.get_index(rd.iseg[last])
+        nextseg = np.where(iseg >= 0, graph.outseg[iseg], 0)
+        reach1 = rd[rd.ireach == 1]
+        pos = np.searchsorted(reach1.iseg, nextseg)
+        pos[pos == len(reach1)] = 0
+        isnext = (nextseg > 0) & (reach1.iseg[pos] == nextseg)
+        outreach[last] = np.where(isnext, reach1.reachID[pos], 0)
         self.reach_data['outreach'] = outreach
 
     def get_slopes(self, default_slope=0.001, minimum_slope=0.0001,
@@ -1072,13 +1087,19 @@ class ModflowSfr2(Package):
         if np.diff(self.reach_data.outreach).max() == 0:
             self.set_outreaches()
         rd = self.reach_data
-        elev = dict(zip(rd.reachID, rd.strtop))
-        dist = dict(zip(rd.reachID, rd.rchlen))
-        dnelev = {rid: elev[rd.outreach[i]] if rd.outreach[i] != 0
-        else -9999 for i, rid in enumerate(rd.reachID)}
-        slopes = np.array(
-            [(elev[i] - dnelev[i]) / dist[i] if dnelev[i] != -9999
-             else default_slope for i in rd.reachID])
+        # streambed top of the outreach of each reach
+        sorter = np.argsort(rd.reachID)
+        pos = np.searchsorted(rd.reachID, rd.outreach, sorter=sorter)
+        pos[pos == len(rd)] = 0
+        dn = sorter[pos]
+        hasdn = rd.outreach != 0
+        missing = hasdn & (rd.reachID[dn] != rd.outreach)
+        if np.any(missing):
+            raise Exception('{} is not a reach number'.format(
+                rd.outreach[missing][0]))
+        slopes = np.ones(len(rd)) * default_slope
+        slopes[hasdn] = (rd.strtop[hasdn] - rd.strtop[dn[hasdn]]) / \
+                        rd.rchlen[hasdn]
         slopes[slopes < minimum_slope] = minimum_slope
         slopes[slopes > maximum_slope] = maximum_slope
         self.reach_data['slope'] = slopes
@@ -1091,10 +1112,12 @@ class ModflowSfr2(Package):
         -------
         all_upsegs : dict
             Nested dictionary of form {stress period: {segment: [list of upsegs]}}
+            The lists of upsegs are sorted.
 
         Notes
         -----
-        This method will not work if there are instances of circular routing.
+        With circular routing, the segments upstream of the circle are
+        only listed for the segments of the circle where they enter it.
 
         """
         all_upsegs = {}
@@ -1102,35 +1125,7 @@ class ModflowSfr2(Package):
             if per > 0 > self.dataset_5[per][
                 0]:  # skip stress periods where seg data not defined
                 continue
-            segment_data = self.segment_data[per]
-
-            # make a list of adjacent upsegments keyed to outseg list in Mat2
-            upsegs = {o: segment_data.nseg[segment_data.outseg == o].tolist()
-                      for o in np.unique(segment_data.outseg)}
-
-            outsegs = [k for k in list(upsegs.keys()) if
-                       k > 0]  # exclude 0, which is the outlet designator
-
-            # for each outseg key, for each upseg, check for more upsegs, append until headwaters has been reached
-            for outseg in outsegs:
-
-                up = True
-                upsegslist = upsegs[outseg]
-                while up:
-                    added_upsegs = []
-                    for us in upsegslist:
-                        if us in outsegs:
-                            added_upsegs += upsegs[us]
-                    if len(added_upsegs) == 0:
-                        up = False
-                        break
-                    else:
-                        upsegslist = added_upsegs
-                        upsegs[outseg] += added_upsegs
-
-            # the above algorithm is recursive, so lower order streams get duplicated many times
-            # use a set to get unique upsegs
-            all_upsegs[per] = {u: list(set(upsegs[u])) for u in outsegs}
+            all_upsegs[per] = self.get_routing_graph(per).get_upsegs()
         return all_upsegs
 
     def get_variable_by_stress_period(self, varname):
@@ -1266,7 +1261,7 @@ class ModflowSfr2(Package):
         to_miles = {'feet': 1 / 5280., 'meters': 1 / (.3048 * 5280.)}
 
         # slice the path
-        path = np.array(self.paths[start_seg])
+        path = np.array(self.get_routing_graph().path(start_seg))
         endidx = np.where(path == end_seg)[0]
         endidx = endidx if len(endidx) > 0 else None
         path = path[:np.squeeze(endidx)]
@@ -1322,11 +1317,7 @@ class ModflowSfr2(Package):
         headwaters : np.ndarray (1-D)
             One dimmensional array listing all headwater segments.
         """
-        upsegs = [self.segment_data[per].nseg[
-                      self.segment_data[per].outseg == s].tolist()
-                  for s in self.segment_data[0].nseg]
-        return self.segment_data[per].nseg[
-            np.array([i for i, u in enumerate(upsegs) if len(u) == 0])]
+        return self.get_routing_graph(per).headwaters
 
     def _interpolate_to_reaches(self, segvar1, segvar2, per=0):
         """Interpolate values in datasets 6b and 6c to each reach in stream segment
@@ -1753,6 +1744,306 @@ class ModflowSfr2(Package):
         return 17
 
 
+class RoutingGraph(object):
+    """
+    Routing graph of the SFR segments for a stress period.
+
+    The segments are stored in the order of segment_data. The downstream
+    connections are an array with the index of the outseg of each segment
+    and the upstream connections are in compressed sparse row (CSR)
+    format. The outlet, the number of segments to the outlet and the
+    circular routing are found for all the segments at once by pointer
+    jumping (log2(nss) vectorized steps), so queries do not search the
+    graph segment by segment.
+
+    Parameters
+    ----------
+    nseg : 1-D array
+        Segment numbers.
+    outseg : 1-D array
+        Number of the segment downstream of each segment. 0 for segments
+        leaving the model and negative values for lakes.
+
+    Attributes
+    ----------
+    down : 1-D array
+        Index of the downstream segment of each segment, -1 if the outseg
+        is not a segment (outlets, lakes).
+    up_indptr, up_indices : 1-D arrays
+        Upstream segments in CSR format, the indices of the segments
+        upstream of segment i are up_indices[up_indptr[i]:up_indptr[i+1]].
+    terminal : 1-D array
+        Index of the last segment before the outlet.
+    ndown : 1-D array
+        Number of segments downstream of each segment (0 for the terminal
+        segments).
+    circular : 1-D boolean array
+        True for the segments that never reach an outlet (segments in or
+        upstream of circular routing).
+    order : 1-D array
+        Indices of the segments that reach an outlet in topological order,
+        each segment is before its downstream segment.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> m = flopy.modflow.Modflow.load('model.nam')
+    >>> g = m.sfr.get_routing_graph()
+    >>> g.upstream(10)  # all the segments upstream of segment 10
+    >>> g.path(1)  # segments from segment 1 to the outlet
+
+    """
+
+    def __init__(self, nseg, outseg):
+        self.nseg = np.array(nseg, dtype=int)
+        self.outseg = np.array(outseg, dtype=int)
+        n = len(self.nseg)
+
+        # index of the downstream segment
+        self._sorter = np.argsort(self.nseg, kind='mergesort')
+        self.down = self.get_index(self.outseg)
+        self.down[self.outseg == 0] = -1
+
+        # upstream segments (CSR)
+        isup = np.where(self.down >= 0)[0]
+        dn = self.down[isup]
+        self.up_indices = isup[np.argsort(dn, kind='mergesort')]
+        self.up_indptr = np.zeros(n + 1, dtype=int)
+        self.up_indptr[1:] = np.cumsum(np.bincount(dn, minlength=n))
+
+        # pointer jumping: after k steps, terminal is 2**k segments
+        # downstream (or the terminal segment) of each segment
+        terminal = np.where(self.down >= 0, self.down, np.arange(n))
+        ndown = (self.down >= 0).astype(int)
+        nsteps = int(np.ceil(np.log2(max(n, 2)))) + 1
+        for step in range(nsteps):
+            nxt = terminal[terminal]
+            if np.array_equal(nxt, terminal):
+                break
+            ndown += ndown[terminal]
+            terminal = nxt
+        # segments that did not reach a segment without downstream segment
+        self.circular = self.down[terminal] >= 0
+        self.terminal = np.where(self.circular, -1, terminal)
+        self.ndown = np.where(self.circular, -1, ndown)
+        ok = np.where(~self.circular)[0]
+        self.order = ok[np.argsort(-self.ndown[ok], kind='mergesort')]
+        self._paths = None
+
+    def __len__(self):
+        return len(self.nseg)
+
+    def get_index(self, segments):
+        """
+        Get the index of segment numbers, -1 for numbers that are not
+        segments.
+
+        """
+        segments = np.asarray(segments, dtype=int)
+        sorted_nseg = self.nseg[self._sorter]
+        if len(sorted_nseg) == 0:
+            return np.full(segments.shape, -1, dtype=int)
+        pos = np.searchsorted(sorted_nseg, segments)
+        pos[pos == len(sorted_nseg)] = 0
+        found = sorted_nseg[pos] == segments
+        return np.where(found, self._sorter[pos], -1)
+
+    def _index(self, segment):
+        i = self.get_index([segment])[0]
+        if i < 0:
+            raise Exception('{} is not a segment number'.format(segment))
+        return i
+
+    @property
+    def headwaters(self):
+        """Segments without upstream segments."""
+        return self.nseg[np.diff(self.up_indptr) == 0]
+
+    @property
+    def outlets(self):
+        """
+        Outlet of each segment: the outseg of the terminal segment if it is
+        a lake (or another number that is not a segment), otherwise the
+        terminal segment. The outlet of the segments with circular routing
+        is 0.
+
+        """
+        outlets = np.zeros(len(self), dtype=int)
+        ok = ~self.circular
+        t = self.terminal[ok]
+        outlets[ok] = np.where(self.outseg[t] != 0, self.outseg[t],
+                               self.nseg[t])
+        return outlets
+
+    def accumulate(self, values):
+        """
+        Sum of values over each segment and all its upstream segments (for
+        example the total inflow or the number of upstream segments).
+        Segments with circular routing only get their own value.
+
+        """
+        acc = np.array(values, dtype=float)
+        ndown = self.ndown[self.order]
+        # add each level (number of segments to the outlet) to the next
+        # level downstream, starting upstream
+        bounds = np.where(np.diff(ndown) != 0)[0] + 1
+        for level in np.split(self.order, bounds):
+            dn = self.down[level]
+            isdn = dn >= 0
+            np.add.at(acc, dn[isdn], acc[level[isdn]])
+        return acc
+
+    def get_upstream_index(self, index):
+        """Indices of the segments directly upstream of the segments with
+        an index in index (gathered from the CSR arrays)."""
+        index = np.asarray(index, dtype=int)
+        starts = self.up_indptr[index]
+        counts = self.up_indptr[index + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        i = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+        return self.up_indices[i]
+
+    def upstream(self, segment):
+        """Numbers of all the segments upstream of a segment."""
+        i = self._index(segment)
+        seen = np.zeros(len(self), dtype=bool)
+        seen[i] = True
+        front = np.array([i])
+        up = [front[:0]]
+        while len(front) > 0:
+            front = self.get_upstream_index(front)
+            front = front[~seen[front]]
+            seen[front] = True
+            up.append(front)
+        return np.sort(self.nseg[np.concatenate(up)])
+
+    def get_upsegs(self):
+        """
+        All the upstream segments of each outseg number greater than 0,
+        in the format of ModflowSfr2.get_upsegs().
+
+        """
+        n = len(self)
+        # segments in circular routing (not only upstream of it)
+        incycle = np.zeros(n, dtype=bool)
+        if np.any(self.circular):
+            p = np.where(self.down >= 0, self.down, np.arange(n))
+            for step in range(int(np.ceil(np.log2(max(n, 2)))) + 1):
+                p = p[p]
+            incycle[p[self.circular]] = True
+
+        # walk downstream from all segments at once, recording the
+        # (outseg, segment) pairs as one integer key: the rank of the
+        # outseg number * n + the rank of the segment number
+        outsegs, outseg_rank = np.unique(self.outseg, return_inverse=True)
+        rank = np.empty(n, dtype=np.int64)
+        rank[self._sorter] = np.arange(n)
+        src = rank
+        cur = np.arange(n)
+        keys = [rank[:0]]
+        while len(cur) > 0:
+            keep = self.outseg[cur] > 0
+            keys.append(outseg_rank[cur[keep]] * n + src[keep])
+            # stop where the circular routing is entered
+            go = self.down[cur] >= 0
+            go[go] = ~incycle[self.down[cur[go]]]
+            src, cur = src[go], self.down[cur[go]]
+        # sorted by outseg and segment number, without duplicates
+        keys = np.unique(np.concatenate(keys))
+        if len(keys) == 0:
+            return {}
+        targets = outsegs[keys // n]
+        sources = self.nseg[self._sorter[keys % n]]
+        bounds = np.where(np.diff(targets) != 0)[0] + 1
+        return {int(g[0]): u.tolist() for g, u in
+                zip(np.split(targets, bounds), np.split(sources, bounds))}
+
+    def path(self, start, end=0):
+        """
+        Segments from start to end (default 0, the outlet), in the format
+        of ModflowSfr2.paths: [start, ..., outlet, 0]. Lakes and other
+        outsegs that are not segments are included before 0. Returns None
+        if the path does not reach end.
+
+        """
+        i = self.get_index([start])[0]
+        if i < 0:
+            return [start, end] if start != end else [start]
+        if self.circular[i]:
+            return None
+        path = []
+        while i >= 0:
+            path.append(int(self.nseg[i]))
+            if path[-1] == end:
+                return path
+            last = i
+            i = self.down[i]
+        if self.outseg[last] != 0:
+            path.append(int(self.outseg[last]))
+            if path[-1] == end:
+                return path
+        path.append(0)
+        return path if end == 0 else None
+
+    def get_paths(self):
+        """
+        Paths of all the segments to the outlet, in the format of
+        ModflowSfr2.paths. Each path is built from the path of the
+        downstream segment.
+
+        """
+        if self._paths is not None:
+            return self._paths
+        paths = {}
+        ipaths = {}
+        # downstream segments first
+        for i in self.order[::-1].tolist():
+            d = self.down[i]
+            if d >= 0:
+                ipaths[i] = [int(self.nseg[i])] + ipaths[d]
+            elif self.outseg[i] != 0:
+                ipaths[i] = [int(self.nseg[i]), int(self.outseg[i]), 0]
+            else:
+                ipaths[i] = [int(self.nseg[i]), 0]
+        for i, s in enumerate(self.nseg.tolist()):
+            paths[s] = ipaths.get(i)
+        # outlets (0, lakes and outsegs that are not segments)
+        for o in np.unique(self.outseg[self.down < 0]).tolist():
+            paths[o] = [o, 0] if o != 0 else [0]
+        self._paths = paths
+        return paths
+
+
+class PathsView(Mapping):
+    """
+    Read-only mapping of the paths of the segments to the outlet, cached
+    by a RoutingGraph. Each path is copied when it is requested.
+
+    Parameters
+    ----------
+    paths : dict
+        {segment: path} (see RoutingGraph.get_paths)
+
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+
+    def __getitem__(self, segment):
+        path = self._paths[segment]
+        return list(path) if path is not None else None
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __repr__(self):
+        return 'PathsView({})'.format(self._paths)
+
+
 class check:
     """
     Check SFR2 package for common errors
@@ -1991,8 +2282,9 @@ class check:
             print(headertxt.strip())
 
         # txt += self.sfr.get_outlets(level=self.level, verbose=False)  # will print twice if verbose=True
-        # simpler check method using paths from routing graph
-        circular_segs = [k for k, v in self.sfr.paths.items() if v is None]
+        # simpler check method using the routing graph
+        graph = self.sfr.get_routing_graph()
+        circular_segs = graph.nseg[graph.circular].tolist()
         if len(circular_segs) > 0:
             txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
                 .format(len(circular_segs), self.sfr.nss)
@@ -2014,23 +2306,19 @@ class check:
             rd.sort(order=['reachID'])
             x0 = self.sr.xcentergrid[rd.i, rd.j]
             y0 = self.sr.ycentergrid[rd.i, rd.j]
-            loc = dict(zip(rd.reachID, zip(x0, y0)))
 
             # compute distances between node centers of connected reaches
             headertxt = 'Checking reach connections for proximity...\n'
             txt = ''
             if self.verbose:
                 print(headertxt.strip())
-            dist = []
-            for r in rd.reachID:
-                x0, y0 = loc[r]
-                outreach = rd.outreach[r - 1]
-                if outreach == 0:
-                    dist.append(0)
-                else:
-                    x1, y1 = loc[outreach]
-                    dist.append(np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2))
-            dist = np.array(dist)
+            # (reach r has index r - 1)
+            outreach = rd.outreach[rd.reachID - 1]
+            hasout = outreach != 0
+            iout = outreach[hasout] - 1
+            dist = np.zeros(len(rd))
+            dist[hasout] = np.sqrt((x0[iout] - x0[hasout]) ** 2 +
+                                   (y0[iout] - y0[hasout]) ** 2)
 
             # compute max width of reach nodes (hypotenuse for rectangular nodes)
             dx = (self.sr.delr * self.sr.length_multiplier)[rd.j]
@@ -655,6 +655,9 @@ class Mt3dms(BaseModel):
                     sys.stdout.write('Warning: external file unit " +\
                         "{} does not exist in ext_unit_dict.\n'.format(key))
 
+        # close the files of the name file entries
+        ext_unit_dict.close()
+
         # write message indicating packages that were successfully loaded
         if mt.verbose:
             print(1 * '\n')
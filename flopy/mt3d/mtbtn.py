@@ -828,16 +828,12 @@ class Mt3dBtn(Package):
         if model.verbose:
             print('   loading SCONC...')
         kwargs = {}
-        sconc = Util3d.load(f, model, (nlay, nrow, ncol), np.float32, 'sconc1',
-                             ext_unit_dict, array_format="mt3d")
-        if ncomp > 1:
-            for icomp in range(2, ncomp + 1):
-                name = "sconc" + str(icomp)
-                if model.verbose:
-                    print('   loading {}...'.format(name))
-                u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                   name, ext_unit_dict, array_format="mt3d")
-                kwargs[name] = u3d
+        names = ['sconc' + str(icomp) for icomp in range(1, ncomp + 1)]
+        u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol), np.float32,
+                                   names, ext_unit_dict, array_format="mt3d")
+        sconc = u3ds[0]
+        for name, u3d in zip(names[1:], u3ds[1:]):
+            kwargs[name] = u3d
         if model.verbose:
             print('   SCONC {}'.format(sconc))
 
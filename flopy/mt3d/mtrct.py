@@ -491,101 +491,75 @@ class Mt3dRct(Package):
         if model.verbose:
             print('   loading SRCONC...')
         if igetsc > 0:
-            srconc = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                 'srconc1', ext_unit_dict, array_format="mt3d")
+            names = ['srconc' + str(icomp) for icomp in range(1, ncomp + 1)]
+            u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol),
+                                       np.float32, names, ext_unit_dict,
+                                       array_format="mt3d")
+            srconc = u3ds[0]
+            for name, u3d in zip(names[1:], u3ds[1:]):
+                kwargs[name] = u3d
             if model.verbose:
                 print('   SRCONC {}'.format(srconc))
-            if ncomp > 1:
-                for icomp in range(2, ncomp + 1):
-                    name = "srconc" + str(icomp)
-                    if model.verbose:
-                        print('   loading {}...'.format(name))
-                    u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                      name, ext_unit_dict, array_format="mt3d")
-                    kwargs[name] = u3d
-                    if model.verbose:
-                        print('   SRCONC{} {}'.format(icomp, u3d))
 
         # Item E3: SP1
         sp1 = None
         if model.verbose:
             print('   loading SP1...')
         if isothm > 0:
-            sp1 = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                              'sp11', ext_unit_dict, array_format="mt3d")
+            names = ['sp1' + str(icomp) for icomp in range(1, ncomp + 1)]
+            u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol),
+                                       np.float32, names, ext_unit_dict,
+                                       array_format="mt3d")
+            sp1 = u3ds[0]
+            for name, u3d in zip(names[1:], u3ds[1:]):
+                kwargs[name] = u3d
             if model.verbose:
                 print('   SP1 {}'.format(sp1))
-            if ncomp > 1:
-                for icomp in range(2, ncomp + 1):
-                    name = "sp1" + str(icomp)
-                    if model.verbose:
-                        print('   loading {}...'.format(name))
-                    u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                      name, ext_unit_dict, array_format="mt3d")
-                    kwargs[name] = u3d
-                    if model.verbose:
-                        print('   SP1{} {}'.format(icomp, u3d))
 
         # Item E4: SP2
         sp2 = None
         if model.verbose:
             print('   loading SP2...')
         if isothm > 0:
-            sp2 = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                              'sp21', ext_unit_dict, array_format="mt3d")
+            names = ['sp2' + str(icomp) for icomp in range(1, ncomp + 1)]
+            u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol),
+                                       np.float32, names, ext_unit_dict,
+                                       array_format="mt3d")
+            sp2 = u3ds[0]
+            for name, u3d in zip(names[1:], u3ds[1:]):
+                kwargs[name] = u3d
             if model.verbose:
                 print('   SP2 {}'.format(sp2))
-            if ncomp > 1:
-                for icomp in range(2, ncomp + 1):
-                    name = "sp2" + str(icomp)
-                    if model.verbose:
-                        print('   loading {}...'.format(name))
-                    u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                      name, ext_unit_dict, array_format="mt3d")
-                    kwargs[name] = u3d
-                    if model.verbose:
-                        print('   SP2{} {}'.format(icomp, u3d))
 
         # Item E5: RC1
         rc1 = None
         if model.verbose:
             print('   loading RC1...')
         if ireact > 0:
-            rc1 = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                              'rc11', ext_unit_dict,
-                              array_format="mt3d")
+            names = ['rc1' + str(icomp) for icomp in range(1, ncomp + 1)]
+            u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol),
+                                       np.float32, names, ext_unit_dict,
+                                       array_format="mt3d")
+            rc1 = u3ds[0]
+            for name, u3d in zip(names[1:], u3ds[1:]):
+                kwargs[name] = u3d
             if model.verbose:
                 print('   RC1 {}'.format(rc1))
-            if ncomp > 1:
-                for icomp in range(2, ncomp + 1):
-                    name = "rc1" + str(icomp)
-                    if model.verbose:
-                        print('   loading {}...'.format(name))
-                    u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                      name, ext_unit_dict, array_format="mt3d")
-                    kwargs[name] = u3d
-                    if model.verbose:
-                        print('   RC1{} {}'.format(icomp, u3d))
 
         # Item E6: RC2
         rc2 = None
         if model.verbose:
             print('   loading RC2...')
         if ireact > 0:
-            rc2 = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                              'rc21', ext_unit_dict, array_format="mt3d")
+            names = ['rc2' + str(icomp) for icomp in range(1, ncomp + 1)]
+            u3ds = Util3d.load_species(f, model, (nlay, nrow, ncol),
+                                       np.float32, names, ext_unit_dict,
+                                       array_format="mt3d")
+            rc2 = u3ds[0]
+            for name, u3d in zip(names[1:], u3ds[1:]):
+                kwargs[name] = u3d
             if model.verbose:
                 print('   RC2 {}'.format(rc2))
-            if ncomp > 1:
-                for icomp in range(2, ncomp + 1):
-                    name = "rc2" + str(icomp)
-                    if model.verbose:
-                        print('   loading {}...'.format(name))
-                    u3d = Util3d.load(f, model, (nlay, nrow, ncol), np.float32,
-                                      name, ext_unit_dict, array_format="mt3d")
-                    kwargs[name] = u3d
-                    if model.verbose:
-                        print('   RC2{} {}'.format(icomp, u3d))
 
         # Close the file
         f.close()
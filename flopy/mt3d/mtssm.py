@@ -2,7 +2,7 @@ import sys
 import numpy as np
 import warnings
 from ..pakbase import Package
-from ..utils import Util2d, MfList, Transient2d
+from ..utils import Util2d, Util3d, MfList, Transient2d
 
 # Note: Order matters as first 6 need logical flag on line 1 of SSM file
 SsmLabels = ['WEL', 'DRN', 'RCH', 'EVT', 'RIV', 'GHB', 'BAS6', 'CHD', 'PBC']
@@ -398,6 +398,8 @@ class Mt3dSsm(Package):
 
         # Loop through each stress period and write ssm information
         nper = self.parent.nper
+        # text of the point sources reused by the next stress period
+        cache = {}
         for kper in range(nper):
             if f_ssm.closed == True:
                 f_ssm = open(f_ssm.name, 'a')
@@ -437,7 +439,8 @@ class Mt3dSsm(Package):
 
             # List of sources
             if self.stress_period_data is not None:
-                self.stress_period_data.write_transient(f_ssm, single_per=kper)
+                self.stress_period_data.write_transient(f_ssm, single_per=kper,
+                                                        cache=cache)
             else:
                 f_ssm.write('{}\n'.format(0))
 
@@ -446,7 +449,7 @@ class Mt3dSsm(Package):
 
     @staticmethod
     def load(f, model, nlay=None, nrow=None, ncol=None, nper=None,
-             ncomp=None, ext_unit_dict=None):
+             ncomp=None, ext_unit_dict=None, dedupe=False):
         """
         Load an existing package.
 
@@ -463,6 +466,11 @@ class Mt3dSsm(Package):
             handle.  In this case ext_unit_dict is required, which can be
             constructed using the function
             :class:`flopy.utils.mfreadnam.parsenamefile`.
+        dedupe : bool
+            If True, a stress period with the same list of point sources as
+            the previous stress period references the recarray of the
+            previous stress period, the list is not parsed again and the
+            recarray is not copied. (default is False)
 
         Returns
         -------
@@ -602,6 +610,8 @@ class Mt3dSsm(Package):
                     kwargs[name] = {0: t2d}
 
         stress_period_data = {}
+        # lines and recarray of the point sources of the previous period
+        last_lines, last_current = None, None
 
         for iper in range(nper):
 
@@ -620,20 +630,15 @@ class Mt3dSsm(Package):
             if incrch >= 0:
                 if model.verbose:
                     print('   loading CRCH...')
-                t = Util2d.load(f, model, (nrow, ncol), np.float32, 'crch',
-                                ext_unit_dict, array_format="mt3d")
-                crch[iper] = t
-                # Load each multispecies array
-                if ncomp > 1:
-                    for icomp in range(2, ncomp + 1):
-                        name = "crch" + str(icomp)
-                        if model.verbose:
-                            print('   loading {}...'.format(name))
-                        t = Util2d.load(f, model, (nrow, ncol),
-                                        np.float32, name, ext_unit_dict,
-                                        array_format="mt3d")
-                        crchicomp = kwargs[name]
-                        crchicomp[iper] = t
+                # load the arrays of all the species
+                names = ['crch'] + ['crch' + str(icomp)
+                                     for icomp in range(2, ncomp + 1)]
+                u2ds = Util3d.load_species(f, model, (nrow, ncol),
+                                           np.float32, names, ext_unit_dict,
+                                           array_format="mt3d")
+                crch[iper] = u2ds[0]
+                for name, t in zip(names[1:], u2ds[1:]):
+                    kwargs[name][iper] = t
 
             # Item D5: INCEVT
             incevt = -1
@@ -647,20 +652,15 @@ class Mt3dSsm(Package):
             if incevt >= 0:
                 if model.verbose:
                     print('   loading CEVT...')
-                t = Util2d.load(f, model, (nrow, ncol), np.float32, 'cevt',
-                                ext_unit_dict, array_format="mt3d")
-                cevt[iper] = t
-                # Load each multispecies array
-                if ncomp > 1:
-                    for icomp in range(2, ncomp + 1):
-                        name = "cevt" + str(icomp)
-                        if model.verbose:
-                            print('   loading {}...'.format(name))
-                        t = Util2d.load(f, model, (nrow, ncol),
-                                        np.float32, name, ext_unit_dict,
-                                        array_format="mt3d")
-                        cevticomp = kwargs[name]
-                        cevticomp[iper] = t
+                # load the arrays of all the species
+                names = ['cevt'] + ['cevt' + str(icomp)
+                                     for icomp in range(2, ncomp + 1)]
+                u2ds = Util3d.load_species(f, model, (nrow, ncol),
+                                           np.float32, names, ext_unit_dict,
+                                           array_format="mt3d")
+                cevt[iper] = u2ds[0]
+                for name, t in zip(names[1:], u2ds[1:]):
+                    kwargs[name][iper] = t
 
             # Item D7: NSS
             if model.verbose:
@@ -674,25 +674,21 @@ class Mt3dSsm(Package):
                     '   loading KSS, ISS, JSS, CSS, ITYPE, (CSSMS(n),n=1,NCOMP)...')
             current = 0
             if nss > 0:
-                current = np.empty((nss), dtype=dtype)
-                for ibnd in range(nss):
-                    line = f.readline()
-                    t = []
-                    for ivar in range(5):
-                        istart = ivar * 10
-                        istop = istart + 10
-                        t.append(line[istart:istop])
-                    ncssms = len(current.dtype.names) - 5
-                    if ncssms > 0:
-                        tt = line[istop:].strip().split()
-                        for ivar in range(ncssms):
-                            t.append(tt[ivar])
-                    current[ibnd] = tuple(t[:len(current.dtype.names)])
-                # convert indices to zero-based
-                current['k'] -= 1
-                current['i'] -= 1
-                current['j'] -= 1
-                current = current.view(np.recarray)
+                lines = [f.readline() for ibnd in range(nss)]
+                if dedupe and lines == last_lines:
+                    current = last_current
+                else:
+                    # parse the block at once
+                    current = np.zeros((nss), dtype=dtype).view(np.recarray)
+                    current = Mt3dSsm._read_point_sources(lines, current)
+                    # convert indices to zero-based
+                    current['k'] -= 1
+                    current['i'] -= 1
+                    current['j'] -= 1
+                    if dedupe:
+                        last_lines, last_current = lines, current
+            else:
+                last_lines, last_current = None, None
             stress_period_data[iper] = current
 
         # set package unit number
@@ -709,6 +705,73 @@ class Mt3dSsm(Package):
                       unitnumber=unitnumber, filenames=filenames, **kwargs)
         return ssm
 
+    @staticmethod
+    def _read_point_sources(lines, current):
+        """
+        Parse the point source lines of a stress period (item D8) into the
+        recarray current. As in MT3DMS, KSS, ISS, JSS, CSS and ITYPE are
+        read as five 10 character fields and the CSSMS values that follow
+        as free format. The values of all the lines are converted in bulk,
+        lines that can not be converted this way are parsed line by line.
+
+        """
+        names = current.dtype.names
+        nss = len(lines)
+        ncssms = len(names) - 5
+        try:
+            fixed = ''.join([line[:50].rstrip('\r\n').ljust(50)
+                             for line in lines]).encode('ascii')
+            if len(fixed) != nss * 50:
+                raise ValueError
+            # one row of bytes per field, followed by a separating blank
+            fields = np.frombuffer(fixed, dtype=np.uint8).reshape(-1, 10)
+            sep = np.empty((nss * 5, 11), dtype=np.uint8)
+            sep[:, :10] = fields
+            sep[:, 10] = ord(' ')
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                values = np.fromstring(sep.tobytes(), dtype=np.float64,
+                                       sep=' ')
+            if values.shape[0] != nss * 5:
+                raise ValueError
+            values = values.reshape(nss, 5)
+            # KSS, ISS, JSS and ITYPE are integers
+            ints = values[:, [0, 1, 2, 4]]
+            if not np.array_equal(ints, np.floor(ints)):
+                raise ValueError
+            if ncssms > 0:
+                tokens = [line[50:].split()[:ncssms] for line in lines]
+                if any([len(t) != ncssms for t in tokens]):
+                    raise ValueError
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    cssms = np.fromstring(' '.join([' '.join(t)
+                                                    for t in tokens]),
+                                          dtype=np.float64, sep=' ')
+                if cssms.shape[0] != nss * ncssms:
+                    raise ValueError
+                cssms = cssms.reshape(nss, ncssms)
+            for ivar, name in enumerate(names[:5]):
+                current[name] = values[:, ivar]
+            for ivar, name in enumerate(names[5:]):
+                current[name] = cssms[:, ivar]
+            return current
+        except (UnicodeError, ValueError):
+            pass
+
+        for ibnd, line in enumerate(lines):
+            t = []
+            for ivar in range(5):
+                istart = ivar * 10
+                istop = istart + 10
+                t.append(line[istart:istop])
+            if ncssms > 0:
+                tt = line[istop:].strip().split()
+                for ivar in range(ncssms):
+                    t.append(tt[ivar])
+            current[ibnd] = tuple(t[:len(names)])
+        return current
+
     @staticmethod
     def ftype():
         return 'SSM'
@@ -9,14 +9,72 @@ from __future__ import print_function
 
 import os
 import sys
+import hashlib
+import numbers
 import platform
+import warnings
 import webbrowser as wb
 
 import numpy as np
 from numpy.lib.recfunctions import stack_arrays
 
+from .mbase import BaseModel
 from .modflow.mfparbc import ModflowParBc as mfparbc
-from .utils import Util2d, Util3d, Transient2d, MfList, check
+from .utils import Util2d, Util3d, Transient2d, MfList, check, \
+    neighbor_reduce
+
+
+def _update_hash(h, value, memo):
+    """
+    Update the hash object h with the content of value. Models and packages
+    referenced by value are not included, only their class names. memo
+    holds the objects that are already included by id (the objects are
+    kept alive so that ids of temporary objects are not reused).
+
+    """
+    if value is None or isinstance(value, (numbers.Number, str, bytes,
+                                           type(u''), np.generic)):
+        h.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, np.ndarray):
+        h.update(repr(('ndarray', value.dtype.str, value.shape)).encode())
+        if value.dtype.hasobject:
+            h.update(repr(value.tolist()).encode())
+        else:
+            h.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif id(value) in memo:
+        h.update(b'ref')
+    elif isinstance(value, (list, tuple, set)):
+        memo[id(value)] = value
+        h.update(type(value).__name__.encode())
+        items = sorted(value, key=repr) if isinstance(value, set) else value
+        for v in items:
+            _update_hash(h, v, memo)
+    elif isinstance(value, dict):
+        memo[id(value)] = value
+        h.update(type(value).__name__.encode())
+        for k in sorted(value, key=repr):
+            _update_hash(h, k, memo)
+            _update_hash(h, value[k], memo)
+    elif isinstance(value, (Package, BaseModel)):
+        h.update(type(value).__name__.encode())
+    elif isinstance(value, Util2d) and value.vtype == str and \
+            os.path.isfile(value.python_file_path):
+        # the array is in an external file
+        memo[id(value)] = value
+        st = os.stat(value.python_file_path)
+        _update_hash(h, value.__getstate__(), memo)
+        _update_hash(h, (st.st_size, st.st_mtime), memo)
+    elif hasattr(value, '__dict__'):
+        memo[id(value)] = value
+        h.update(type(value).__name__.encode())
+        # cached attributes are not part of the state
+        getstate = getattr(type(value), '__getstate__', None)
+        if getstate is not None:
+            _update_hash(h, getstate(value), memo)
+        else:
+            _update_hash(h, value.__dict__, memo)
+    else:
+        h.update(type(value).__name__.encode())
 
 
 class Package(object):
@@ -267,27 +325,41 @@ class Package(object):
 
             # check for zero or negative values of hydraulic conductivity, anisotropy,
             # and quasi-3D confining beds
+            # (the rules are functions returning the cells that violate
+            # them, so that they are timed by the checker)
             kparams = {'hk': 'horizontal hydraulic conductivity',
                        'vka': 'vertical hydraulic conductivity'}
             for kp, name in kparams.items():
-                chk.values(self.__dict__[kp].array,
-                           active & (self.__dict__[kp].array <= 0),
+                a = self.__dict__[kp].array
+                chk.values(a, lambda: active & (a <= 0),
                            'zero or negative {} values'.format(name), 'Error')
 
             # check for negative hani
-            chk.values(self.__dict__['hani'].array,
-                       active & (self.__dict__['hani'].array < 0),
+            a = self.__dict__['hani'].array
+            chk.values(a, lambda: active & (a < 0),
                        'negative horizontal anisotropy values', 'Error')
 
-            def check_thresholds(array, active, thresholds, name):
-                """Checks array against min and max threshold values."""
+            def check_thresholds(array, active, thresholds, name,
+                                 contrast=None):
+                """Checks array against min and max threshold values,
+                and optionally against a maximum ratio between the values
+                of neighboring active cells."""
                 mn, mx = thresholds
-                chk.values(array, active & (array < mn),
+                chk.values(array, lambda: active & (array < mn),
                            '{} values below checker threshold of {}'
                            .format(name, mn), 'Warning')
-                chk.values(array, active & (array > mx),
+                chk.values(array, lambda: active & (array > mx),
                            '{} values above checker threshold of {}'
                            .format(name, mx), 'Warning')
+                if contrast is not None:
+                    # stencil comparison with the neighbors, the array of
+                    # neighbor values is not built
+                    chk.values(array, lambda: active & neighbor_reduce(
+                        array, lambda v, n: v > contrast * n, how='any',
+                        edge=False, active=active),
+                               '{} contrast with neighbors above checker '
+                               'threshold of {}'.format(name, contrast),
+                               'Warning')
 
             # check for unusually high or low values of hydraulic conductivity
             if self.layvka.sum() > 0:  # convert vertical anistropy to Kv for checking
@@ -302,7 +374,8 @@ class Package(object):
             for kp, name in kparams.items():
                 check_thresholds(self.__dict__[kp].array, active,
                                  chk.property_threshold_values[kp],
-                                 name)
+                                 name, chk.property_threshold_values.get(
+                                     '{}_contrast'.format(kp)))
 
             # check vkcb if there are any quasi-3D layers
             if self.parent.dis.laycbd.sum() > 0:
@@ -322,7 +395,7 @@ class Package(object):
                                  'quasi-3D confining bed Kv')
 
             if not np.all(
-                    self.parent.dis.steady):  # only check storage if model is transient
+                    self.parent.dis.steady.array):  # only check storage if model is transient
 
                 # do the same for storage if the model is transient
                 sarrays = {'ss': self.ss.array, 'sy': self.sy.array}
@@ -609,6 +682,29 @@ class Package(object):
             wb.open(
                 'http://water.usgs.gov/ogw/modflow-nwt/MODFLOW-NWT-Guide/' + self.url)
 
+    def get_content_hash(self):
+        """
+        Get a hash of the content of the package (the attributes of the
+        package, including the values of the Util2d, Util3d, Transient2d and
+        MfList attributes) and of the model settings used to write the
+        package file.  The hash changes if any of the package data changes.
+
+        Returns
+        -------
+        hash : str
+            hexadecimal digest of the content of the package
+
+        """
+        h = hashlib.md5()
+        model = self.parent
+        settings = [type(self).__name__, model.model_ws,
+                    model.external_path, model.array_free_format,
+                    model.free_format_input, model.version]
+        memo = {}
+        _update_hash(h, settings, memo)
+        _update_hash(h, self.__dict__, memo)
+        return h.hexdigest()
+
     def write_file(self, check=False):
         """
         Every Package needs its own write_file function
@@ -715,6 +811,8 @@ class Package(object):
         # read data for every stress period
         bnd_output = None
         stress_period_data = {}
+        # OPEN/CLOSE (BINARY) files kept as file names (model.mmap_load)
+        mapped = False
         for iper in range(nper):
             if model.verbose:
                 print(
@@ -739,33 +837,38 @@ class Package(object):
             elif itmp > 0:
                 current = pack_type.get_empty(itmp, aux_names=aux_names,
                                               structured=model.structured)
-                for ibnd in range(itmp):
-                    line = f.readline()
-                    if "open/close" in line.lower():
-                        binary = False
-                        if '(binary)' in line.lower():
-                            binary = True
-                        # need to strip out existing path seps and
-                        # replace current-system path seps
-                        raw = line.strip().split()
-                        fname = raw[1]
-                        if '/' in fname:
-                            raw = fname.split('/')
-                        elif '\\' in fname:
-                            raw = fname.split('\\')
-                        else:
-                            raw = [fname]
-                        fname = os.path.join(*raw)
-                        oc_filename = os.path.join(model.model_ws, fname)
-                        assert os.path.exists(
-                            oc_filename), "Package.load() error: open/close filename " + \
-                                          oc_filename + " not found"
+                line = f.readline()
+                if "open/close" in line.lower():
+                    binary = False
+                    if '(binary)' in line.lower():
+                        binary = True
+                    # need to strip out existing path seps and
+                    # replace current-system path seps
+                    raw = line.strip().split()
+                    fname = raw[1]
+                    if '/' in fname:
+                        raw = fname.split('/')
+                    elif '\\' in fname:
+                        raw = fname.split('\\')
+                    else:
+                        raw = [fname]
+                    fname = os.path.join(*raw)
+                    oc_filename = os.path.join(model.model_ws, fname)
+                    assert os.path.exists(
+                        oc_filename), "Package.load() error: open/close filename " + \
+                                      oc_filename + " not found"
+                    dtype2 = np.dtype([(name, np.float32)
+                                       for name in current.dtype.names])
+                    if binary and model.mmap_load and nppak == 0 and \
+                            os.path.getsize(oc_filename) == \
+                            itmp * dtype2.itemsize:
+                        # keep the file name, the records are mapped from
+                        # the file when they are used (MfList)
+                        current = oc_filename
+                        mapped = True
+                    else:
                         try:
                             if binary:
-                                dtype2 = []
-                                for name in current.dtype.names:
-                                    dtype2.append((name, np.float32))
-                                dtype2 = np.dtype(dtype2)
                                 d = np.fromfile(oc_filename,
                                                 dtype=dtype2,
                                                 count=itmp)
@@ -791,26 +894,25 @@ class Package(object):
                                                oc_filename + " shape (" + str(current.shape) + \
                                                ") does not match itmp: {0:d}".format(
                                                    itmp)
-                        break
-                    try:
-                        t = line.strip().split()
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
-                    except:
-                        t = []
-                        for ivar in range(len(current.dtype.names)):
-                            istart = ivar * 10
-                            istop = istart + 10
-                            t.append(line[istart:istop])
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
-
-                # convert indices to zero-based
-                if model.structured:
-                    current['k'] -= 1
-                    current['i'] -= 1
-                    current['j'] -= 1
                 else:
-                    current['node'] -= 1
-                bnd_output = np.recarray.copy(current)
+                    # read the rest of the block and parse it at once
+                    lines = [line] + [f.readline() for i in range(itmp - 1)]
+                    current = Package._read_list_block(lines, current)
+
+                if isinstance(current, str):
+                    # the indices are converted when the file is read
+                    bnd_output = current
+                else:
+                    # convert indices to zero-based
+                    if model.structured:
+                        current['k'] -= 1
+                        current['i'] -= 1
+                        current['j'] -= 1
+                    else:
+                        current['node'] -= 1
+                    bnd_output = np.recarray.copy(current)
+            elif isinstance(current, str):
+                bnd_output = current
             else:
                 bnd_output = np.recarray.copy(current)
 
@@ -888,7 +990,124 @@ class Package(object):
                         stress_period_data=stress_period_data,
                         dtype=dtype, options=options,
                         unitnumber=unitnumber, filenames=filenames)
+        if mapped:
+            pak.stress_period_data.binary = True
         if check:
             pak.check(f='{}.chk'.format(pak.name[0]),
                       verbose=pak.parent.verbose, level=0)
         return pak
+
+    @staticmethod
+    def _read_list_block(lines, current):
+        """
+        Parse the lines of a list block (one line per boundary) into a
+        recarray. The first len(current.dtype.names) values on a line are
+        used. Lines with fewer values are read as fixed format (10
+        character fields).
+
+        Parameters
+        ----------
+        lines : list of str
+            lines of the block
+        current : np.recarray
+            empty recarray with one record per line
+
+        Returns
+        -------
+        current : np.recarray
+
+        """
+        names = current.dtype.names
+        ncol = len(names)
+        nlines = len(lines)
+        if nlines == 0:
+            return current
+        try:
+            text = ''.join(lines).encode('ascii')
+        except UnicodeError:
+            return Package._read_list_lines(lines, current)
+        b = np.frombuffer(text, dtype=np.uint8)
+        isspace = b <= 32
+        eol = b == 10
+        lineid = np.cumsum(eol, dtype=np.int32) - eol
+        if lineid[-1] >= nlines:
+            # the lines are not delimited by newlines
+            return Package._read_list_lines(lines, current)
+
+        # number of values on each line
+        start = ~isspace
+        start[1:] &= isspace[:-1]
+        counts = np.bincount(lineid[start], minlength=nlines)
+        fixed = counts < ncol
+        nfixed = np.count_nonzero(fixed)
+
+        data = np.empty((nlines, ncol), dtype=np.float64)
+
+        # free format: blank values after the first ncol on each line and
+        # the lines that are read as fixed format
+        if nfixed > 0 or counts.max() > ncol:
+            rank = np.cumsum(start, dtype=np.int32) - 1
+            offset = np.zeros(nlines, dtype=np.int32)
+            offset[1:] = np.cumsum(counts)[:-1]
+            rank -= offset[lineid]
+            b = b.copy()
+            b[(rank >= ncol) | fixed[lineid]] = 32
+            text = b.tobytes()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            values = np.fromstring(text, dtype=np.float64, sep=' ')
+        if values.size != (nlines - nfixed) * ncol:
+            # values that could not be parsed as numbers
+            return Package._read_list_lines(lines, current)
+        data[~fixed] = values.reshape(-1, ncol)
+
+        # fixed format
+        if nfixed > 0:
+            width = 10 * ncol
+            fl = [lines[i].rstrip('\r\n').ljust(width)[:width]
+                  for i in np.nonzero(fixed)[0]]
+            c = np.frombuffer(''.join(fl).encode('ascii'), dtype=np.uint8)
+            c = c.reshape(nfixed, ncol, 10)
+            sep = np.full((nfixed, ncol, 1), 32, dtype=np.uint8)
+            c = np.concatenate((c, sep), axis=2)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                values = np.fromstring(c.tobytes(), dtype=np.float64,
+                                       sep=' ')
+            if values.size != nfixed * ncol:
+                return Package._read_list_lines(lines, current)
+            data[fixed] = values.reshape(-1, ncol)
+
+        for idx, name in enumerate(names):
+            current[name] = data[:, idx]
+        return current
+
+    @staticmethod
+    def _read_list_lines(lines, current):
+        """
+        Parse the lines of a list block one line at a time.
+
+        Parameters
+        ----------
+        lines : list of str
+            lines of the block
+        current : np.recarray
+            empty recarray with one record per line
+
+        Returns
+        -------
+        current : np.recarray
+
+        """
+        for ibnd, line in enumerate(lines):
+            try:
+                t = line.strip().split()
+                current[ibnd] = tuple(t[:len(current.dtype.names)])
+            except:
+                t = []
+                for ivar in range(len(current.dtype.names)):
+                    istart = ivar * 10
+                    istop = istart + 10
+                    t.append(line[istart:istop])
+                current[ibnd] = tuple(t[:len(current.dtype.names)])
+        return current
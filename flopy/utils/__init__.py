@@ -33,7 +33,7 @@ from .observationfile import HydmodObs, SwrObs
 from .reference import SpatialReference, crs, TemporalReference
 from .mflistfile import MfListBudget, MfusgListBudget, SwtListBudget, \
     SwrListBudget, Mf6ListBudget
-from .check import check, get_neighbors
+from .check import check, get_neighbors, neighbor_reduce
 from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
 from .zonbud import ZoneBudget, read_zbarray, write_zbarray
@@ -42,3 +42,4 @@ from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
 from .recarray_utils import create_empty_recarray, ra_slice
 from .mtlistfile import MtListBudget
+from .arraypool import ArrayPool
@@ -0,0 +1,117 @@
+"""
+Module with a pool of read-only arrays that can be shared by the Util2d and
+Util3d instances of several models.
+
+Arrays are identified by their content (dtype, shape and a hash of the
+data), so identical arrays loaded or created for different models (for
+example, the realisations of an ensemble built from the same base model)
+are stored once. The pooled arrays are read-only, assigning new values to a
+Util2d or a Util3d layer creates a new array for that instance only
+(copy-on-write).
+
+"""
+
+import hashlib
+import weakref
+
+import numpy as np
+
+
+class ArrayPool(object):
+    """
+    Content-addressed pool of read-only arrays.
+
+    Arrays are only referenced weakly by the pool, an array is removed from
+    the pool when it is no longer used.
+
+    Attributes
+    ----------
+    nbytes : int
+        the number of bytes of the pooled arrays
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> pool = flopy.utils.ArrayPool()
+    >>> models = [flopy.modflow.Modflow.load('model.nam', array_pool=pool)
+    ...           for i in range(100)]
+    >>> models[1].lpf.hk[0] = hk  # only changes the array of models[1]
+
+    """
+
+    def __init__(self):
+        # pooled arrays by content key and by id
+        self._arrays = weakref.WeakValueDictionary()
+        self._ids = weakref.WeakValueDictionary()
+
+    def __getstate__(self):
+        # the pooled arrays are stored by the instances that use them
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __contains__(self, a):
+        return self._ids.get(id(a)) is a
+
+    @property
+    def nbytes(self):
+        nbytes = 0
+        bases = set()
+        for a in list(self._arrays.values()):
+            base = a if a.base is None else a.base
+            if id(base) not in bases:
+                bases.add(id(base))
+                nbytes += base.nbytes
+        return nbytes
+
+    @staticmethod
+    def _get_bytes(a):
+        return np.ascontiguousarray(a).reshape(-1).view(np.uint8)
+
+    def intern(self, a):
+        """
+        Get the pooled read-only array with the content of an array. The
+        array is added to the pool if the pool does not have an array with
+        the same content.
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+
+        Returns
+        -------
+        a : numpy.ndarray
+            read-only array with the same dtype, shape and content as a.
+            Arrays with a dtype of object are returned unchanged.
+
+        """
+        if a.dtype.hasobject or a in self:
+            return a
+        data = self._get_bytes(a)
+        key = (a.dtype.str, a.shape, hashlib.sha1(data).hexdigest())
+        pooled = self._arrays.get(key)
+        if pooled is not None and \
+                np.array_equal(self._get_bytes(pooled), data):
+            return pooled
+        if a.flags.writeable or a.base is None or a.base not in self:
+            # the array (or the array it is a view of) can still be
+            # modified, the pool has its own copy
+            a = a.copy()
+        a.flags.writeable = False
+        self._arrays[key] = a
+        self._ids[id(a)] = a
+        return a
+
+    def clear(self):
+        """
+        Remove all the arrays from the pool. Arrays that are already shared
+        are not copied.
+
+        """
+        self._arrays.clear()
+        self._ids.clear()
@@ -1542,9 +1542,52 @@ class HeadUFile(BinaryLayerFile):
                 raise Exception()
         self.header_dtype = BinaryHeader.set_dtype(bintype='Head',
                                                    precision=precision)
+        self._mmap = None
         super(HeadUFile, self).__init__(filename, precision, verbose, kwargs)
         return
 
+    def _build_index(self):
+        """
+        Build the recordarray and iposarray, and the lookup tables that map
+        each node to its layer record and offset.
+
+        """
+        super(HeadUFile, self)._build_index()
+        ilay = self.recordarray['ilay'] - 1
+        itimes = dict((totim, i) for i, totim in enumerate(self.times))
+        itim = np.array([itimes[totim] for totim in
+                         self.recordarray['totim']], dtype=int)
+
+        # index of the record for each time and layer (-1 if not saved)
+        self.recidx = np.full((len(self.times), self.nlay), -1, dtype=int)
+        self.recidx[itim, ilay] = np.arange(self.recordarray.shape[0])
+
+        # zero-based first and last (exclusive) node of each layer; for
+        # unstructured grids ncol and nrow hold the one-based node range
+        self.nodestrt = np.zeros(self.nlay, dtype=int)
+        self.nodeend = np.zeros(self.nlay, dtype=int)
+        k, irec = np.unique(ilay, return_index=True)
+        self.nodestrt[k] = self.recordarray['ncol'][irec] - 1
+        self.nodeend[k] = self.recordarray['nrow'][irec]
+        return
+
+    def _get_memmap(self):
+        if self._mmap is None:
+            self._mmap = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        return self._mmap
+
+    def _read_values(self, ipos):
+        """
+        Read the values starting at each of the byte positions in ipos
+        with a single gather from the memory-mapped file.
+
+        """
+        nbytes = self.realtype(1).nbytes
+        mm = self._get_memmap()
+        ipos = np.asarray(ipos, dtype=np.int64)
+        b = mm[ipos[:, np.newaxis] + np.arange(nbytes)]
+        return b.view(self.realtype)[:, 0]
+
     def _get_data_array(self, totim=0.):
         """
         Get a list of 1D arrays for the
@@ -1572,9 +1615,9 @@ class HeadUFile(BinaryLayerFile):
                 msg = 'Byte position in file: {} for '.format(ipos) + \
                       'layer {}'.format(ilay)
                 print(msg)
-            self.file.seek(ipos, 0)
-            data[ilay - 1] = binaryread(self.file, self.realtype,
-                                        shape=(npl, ))
+            nbytes = npl * self.realtype(1).nbytes
+            data[ilay - 1] = self._get_memmap()[ipos:ipos + nbytes].view(
+                self.realtype).copy()
         return data
 
     def get_databytes(self, header):
@@ -1599,5 +1642,60 @@ class HeadUFile(BinaryLayerFile):
         return npl * np.int64(self.realtype(1).nbytes)
 
     def get_ts(self, idx):
-        raise NotImplementedError()
+        """
+        Get a time series from the binary file.
+
+        Parameters
+        ----------
+        idx : int or list of ints
+            idx can be a zero-based node number or a list of zero-based
+            node numbers.
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (ntimes, nnodes + 1).  The first column in the
+            data array will contain time (totim).  Nodes in layers that were
+            not saved for a time are set to nan.
+
+        Notes
+        -----
+        The values for all of the nodes and times are read with a single
+        gather from the memory-mapped file.
+
+        Examples
+        --------
+        >>> hdobj = flopy.utils.HeadUFile('model.hds')
+        >>> ts = hdobj.get_ts([0, 100, 1000])
+
+        """
+        nodes = np.atleast_1d(np.asarray(idx, dtype=int))
+        if nodes.shape[0] == 0:
+            return self._init_result(0)
+        nnodes = self.nodeend.max()
+        if nodes.min() < 0 or nodes.max() > nnodes - 1:
+            errmsg = 'Invalid node number. Nodes must be within ' + \
+                     '0 <= node < {}'.format(nnodes)
+            raise Exception(errmsg)
+
+        # layer record and offset of each node
+        k = np.searchsorted(self.nodeend, nodes, side='right')
+        ioffset = (nodes - self.nodestrt[k]) * self.realtype(1).nbytes
+        irec = self.recidx[:, k]
+        valid = irec >= 0
+
+        result = self._init_result(nodes.shape[0])
+        ipos = self.iposarray[irec[valid]] + \
+               np.broadcast_to(ioffset, irec.shape)[valid]
+        result[:, 1:][valid] = self._read_values(ipos)
+        return result
+
+    def close(self):
+        """
+        Close the file handle and the memory-mapped file.
+
+        """
+        self._mmap = None
+        super(HeadUFile, self).close()
+        return
 
@@ -1,4 +1,7 @@
 import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 import numpy as np
 from numpy.lib import recfunctions
 from ..utils.recarray_utils import recarray
@@ -36,9 +39,22 @@ class check:
         sy : tuple
             Reasonable minimum/maximum specific storage values;
             Default is (3.3e-6, 2e-2) after Anderson, Woessner and Hunt (2015, Table 5.2).
+        hk_contrast : float
+            Maximum ratio between the horizontal hydraulic conductivity of
+            neighboring active cells; larger contrasts will be flagged.
+            Default is None (contrasts are not checked).
     thin_cell_threshold : float
         Minimum cell thickness in model units. Thicknesses below this value will be flagged (default 1.0).
 
+    Attributes
+    ----------
+    summary_array : record array
+        Errors and warnings found by the checks. The violations of each
+        rule are stored separately and concatenated once when the summary
+        array is accessed.
+    timings : OrderedDict
+        Time in seconds spent on each rule, by rule name (error name).
+
     Notes
     -----
     Anderson, M.P, Woessner, W.W. and Hunt, R.J., 2015. Applied Groundwater Modeling: Simulation of Flow
@@ -60,7 +76,8 @@ class check:
                                  'vka': (1e-11, 1e5),
                                  'vkcb': (1e-11, 1e5),
                                  'ss': (1e-6, 1e-2),
-                                 'sy': (0.01, 0.5)}
+                                 'sy': (0.01, 0.5),
+                                 'hk_contrast': None}
 
     # which versions is pks compatible with?
     solver_packages = {'mf2k': ['DE4', 'SIP', 'SOR', 'GMG', 'PCG', 'PCGN'],
@@ -86,9 +103,10 @@ class check:
         self.verbose = verbose
         self.level = level
         self.passed = []
+        self.timings = OrderedDict()
         self.property_threshold_values.update(property_threshold_values)
 
-        self.summary_array = self._get_summary_array()
+        self._summary = []
 
         self.f = None
         if f is not None:
@@ -106,11 +124,57 @@ class check:
                         value=0, desc='', package=None):
         if package is None:
             package = self.package.name[0]
-        col_list = [type, package]
-        col_list += [k, i, j] if self.structured else [node]
-        col_list += [value, desc]
-        sa = self._get_summary_array(np.array(col_list))
-        self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        inds = (k, i, j) if self.structured else (node,)
+        self._append_to_summary(self._get_summary_rows(1, type, package, inds,
+                                                       value, desc))
+
+    @property
+    def summary_array(self):
+        if len(self._summary) != 1:
+            # concatenate the violations of all the rules
+            if len(self._summary) == 0:
+                sa = self._get_summary_array()
+            else:
+                sa = np.concatenate(self._summary).view(np.recarray)
+            self._summary = [sa]
+        return self._summary[0]
+
+    @summary_array.setter
+    def summary_array(self, summary_array):
+        self._summary = [summary_array.view(np.recarray)]
+
+    def _append_to_summary(self, summary_array):
+        """Add the rows of a summary array (for example the summary array
+        of a package check) to the summary."""
+        if len(summary_array) > 0:
+            self._summary.append(summary_array)
+
+    def _get_summary_rows(self, n, type, package, inds, value, desc):
+        """Summary array with n rows for the violations of a rule. inds
+        are the (k, i, j) or (node) indices, missing leading k, i indices
+        are set to 0. The other columns can be a scalar or an array."""
+        sa = np.zeros(n, dtype=self._get_summary_array().dtype)
+        names = ['k', 'i', 'j'] if self.structured else ['node']
+        inds = list(inds)
+        if len(inds) < len(names):
+            inds = [0] * (len(names) - len(inds)) + inds
+        sa['type'] = type
+        sa['package'] = package
+        for name, ind in zip(names, inds):
+            sa[name] = ind
+        sa['value'] = value
+        sa['desc'] = desc
+        return sa.view(np.recarray)
+
+    @contextmanager
+    def _timer(self, name):
+        """Add the time spent in the with block to the timings of a rule."""
+        t0 = time.time()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.) + \
+                                 time.time() - t0
 
     def _boolean_compare(self, array, col1, col2,
                          level0txt='{} violations encountered.',
@@ -250,12 +314,14 @@ class check:
                 stress_period_data.i,
                 stress_period_data.j) if self.structured else (stress_period_data.node)
 
-        isvalid = self.isvalid(inds)
-        if not np.all(isvalid):
-            sa = self._list_spd_check_violations(stress_period_data, ~isvalid,
-                                                 error_name='invalid BC index',
-                                                 error_type='Error')
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        with self._timer('invalid BC index'):
+            isvalid = self.isvalid(inds)
+            isinvalid = ~isvalid
+            if np.any(isinvalid):
+                self._append_to_summary(self._list_spd_check_violations(
+                    stress_period_data, isinvalid,
+                    error_name='invalid BC index', error_type='Error'))
+        if np.any(isinvalid):
             spd_inds_valid = False
             self.remove_passed('BC indices valid')
         if spd_inds_valid:
@@ -264,15 +330,15 @@ class check:
 
     def _stress_period_data_nans(self, stress_period_data):
         """Check for and list any nans in stress period data."""
-        isnan = np.array([np.isnan(stress_period_data[c])
-                          for c in stress_period_data.dtype.names]).transpose()
-        if np.any(isnan):
-            row_has_nan = np.any(isnan, axis=1)
-            sa = self._list_spd_check_violations(stress_period_data,
-                                                 row_has_nan,
-                                                 error_name='Not a number',
-                                                 error_type='Error')
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        with self._timer('Not a number'):
+            row_has_nan = np.zeros(len(stress_period_data), dtype=bool)
+            for c in stress_period_data.dtype.names:
+                row_has_nan |= np.isnan(stress_period_data[c])
+            if np.any(row_has_nan):
+                self._append_to_summary(self._list_spd_check_violations(
+                    stress_period_data, row_has_nan,
+                    error_name='Not a number', error_type='Error'))
+        if np.any(row_has_nan):
             self.remove_passed('not a number (Nan) entries')
         else:
             self.append_passed('not a number (Nan) entries')
@@ -283,14 +349,13 @@ class check:
         inds = (spd.k, spd.i, spd.j) if self.structured else (spd.node)
         msg = 'BC in inactive cell'
         if 'BAS6' in self.model.get_package_list():
-            ibnd = self.package.parent.bas6.ibound.array[inds]
-
-            if np.any(ibnd == 0):
-                sa = self._list_spd_check_violations(stress_period_data,
-                                                     ibnd == 0,
-                                                     error_name=msg,
-                                                     error_type='Warning')
-                self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+            with self._timer(msg):
+                inactive = self.package.parent.bas6.ibound.array[inds] == 0
+                if np.any(inactive):
+                    self._append_to_summary(self._list_spd_check_violations(
+                        stress_period_data, inactive, error_name=msg,
+                        error_type='Warning'))
+            if np.any(inactive):
                 self.remove_passed(msg + 's')
             else:
                 self.append_passed(msg + 's')
@@ -301,25 +366,12 @@ class check:
         values, and description of error for each row in stress_period_data where criteria=True.
         """
         inds_col = ['k', 'i', 'j'] if self.structured else ['node']
-        #inds = stress_period_data[criteria][inds_col]\
-        #    .reshape(stress_period_data[criteria].shape + (-1,))
-        #inds = np.atleast_2d(np.squeeze(inds.tolist()))
-        inds = stress_period_data[criteria]
-        a = inds[inds_col[0]]
-        if len(inds_col) > 1:
-            for n in inds_col[1:]:
-                a = np.concatenate((a, inds[n]))
-        inds = a.view(int)
-        inds = inds.reshape(stress_period_data[criteria].shape + (-1,))
-
-        if col is not None:
-            v = stress_period_data[criteria][col]
-        else:
-            v = np.zeros(len(stress_period_data[criteria]))
-        pn = [self.package.name] * len(v)
-        en = [error_name] * len(v)
-        tp = [error_type] * len(v)
-        return self._get_summary_array(np.column_stack([tp, pn, inds, v, en]))
+        failed = stress_period_data[criteria]
+        inds = [failed[n] for n in inds_col]
+        v = failed[col] if col is not None else 0.
+        return self._get_summary_rows(len(failed), error_type,
+                                      self.package.name[0], inds, v,
+                                      error_name)
 
     def append_passed(self, message):
         """Add a check to the passed list if it isn't already in there."""
@@ -347,13 +399,13 @@ class check:
 
         if 'DIS' in self.model.get_package_list() and len(inds) == 3:
             dis = self.model.dis
-            k = inds[0] < dis.nlay
-            i = inds[1] < dis.nrow
-            j = inds[2] < dis.ncol
-            return k | i | j
+            k = (inds[0] >= 0) & (inds[0] < dis.nlay)
+            i = (inds[1] >= 0) & (inds[1] < dis.nrow)
+            j = (inds[2] >= 0) & (inds[2] < dis.ncol)
+            return k & i & j
 
         elif 'DISU' in self.model.get_package_list() and len(inds) == 1:
-            return inds < self.model.disu.nodes
+            return (inds[0] >= 0) & (inds[0] < self.model.disu.nodes)
 
         else:
             return np.zeros(inds[0].shape, dtype=bool)
@@ -406,6 +458,16 @@ class check:
         return _print_rec_array(sa, cols=cols, delimiter=delimiter,
                                 float_format=float_format)
 
+    def print_timings(self, delimiter=',', float_format='{:.6f}'):
+        """Return the time spent on each rule as a string, slowest
+        rule first."""
+        timings = sorted(self.timings.items(), key=lambda t: -t[1])
+        txt = 'rule{}seconds\n'.format(delimiter)
+        txt += ''.join(['{}{}{}\n'.format(name.strip(), delimiter,
+                                          float_format.format(t))
+                        for name, t in timings])
+        return txt
+
     def stress_period_data_values(self, stress_period_data, criteria, col=None,
                                   error_name='', error_type='Warning'):
         """If criteria contains any true values, return the error_type, package name, k,i,j indicies,
@@ -420,33 +482,40 @@ class check:
         # next check for BCs in inactive cells
         #self._stress_period_data_inactivecells(stress_period_data)
 
-        if np.any(criteria):
-            # list the values that met the criteria
-            sa = self._list_spd_check_violations(stress_period_data, criteria, col,
-                                                 error_name=error_name, error_type=error_type)
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        with self._timer(error_name):
+            if callable(criteria):
+                criteria = criteria()
+            failed = np.any(criteria)
+            if failed:
+                # list the values that met the criteria
+                self._append_to_summary(self._list_spd_check_violations(
+                    stress_period_data, criteria, col, error_name=error_name,
+                    error_type=error_type))
+        if failed:
             self.remove_passed(error_name)
         else:
             self.append_passed(error_name)
 
     def values(self, a, criteria, error_name='', error_type='Warning'):
         """If criteria contains any true values, return the error_type, package name, indices,
-        array values, and description of error for each True value in criteria."""
-        if np.any(criteria):
-            inds = np.where(criteria)
-            v = a[inds] # works with structured or unstructured
-            pn = [self.package.name] * len(v)
-            en = [error_name] * len(v)
-            tp = [error_type] * len(v)
-            indsT = np.transpose(inds)
-            # _get_summary_array requires 3 columns for k, i, j,
-            # but indsT will only have two columns if a 2-D array is being compared
-            # pad indsT with a column of zeros for k
-            if indsT.shape[1] == 2:
-                indsT = np.column_stack([np.zeros(indsT.shape[0], dtype=int), indsT])
-            sa = np.column_stack([tp, pn, indsT, v, en])
-            sa = self._get_summary_array(sa)
-            self.summary_array = np.append(self.summary_array, sa).view(np.recarray)
+        array values, and description of error for each True value in criteria.
+
+        criteria can be a boolean array or a function without arguments that
+        returns the boolean array, the time spent evaluating the function
+        is then included in the timings of the rule."""
+        with self._timer(error_name):
+            if callable(criteria):
+                criteria = criteria()
+            inds = np.nonzero(criteria)
+            n = len(inds[0]) if len(inds) > 0 else 0
+            if n > 0:
+                # inds has two arrays if a 2-D array is being compared,
+                # k is set to zero
+                v = a[inds] # works with structured or unstructured
+                self._append_to_summary(self._get_summary_rows(
+                    n, error_type, self.package.name[0], inds, v,
+                    error_name))
+        if n > 0:
             self.remove_passed(error_name)
         else:
             self.append_passed(error_name)
@@ -467,23 +536,31 @@ class check:
         txt = ''
         # tweak screen output for model-level to report package for each error
         if 'MODEL' in self.prefix: # add package name for model summary output
-            packages = self.summary_array.package
-            desc = self.summary_array.desc
+            # (each package/description pair is only formatted once)
+            fmt = {}
+            for p, d in zip(self.summary_array.package,
+                            self.summary_array.desc):
+                if (p, d) not in fmt:
+                    fmt[(p, d)] = '\r    {} package: {}'.format(p, d.strip()) \
+                        if p != 'model' else d
             self.summary_array['desc'] = \
-                ['\r    {} package: {}'.format(packages[i], d.strip())
-                 if packages[i] != 'model' else d
-                 for i, d in enumerate(desc)]
+                [fmt[pd] for pd in zip(self.summary_array.package,
+                                       self.summary_array.desc)]
 
         for etype in ['Error', 'Warning']:
             a = self.summary_array[self.summary_array.type == etype]
-            desc = a.desc
             t = ''
             if len(a) > 0:
                 t += '  {} {}s:\n'.format(len(a), etype)
                 if len(a) == 1:
                     t = t.replace('s', '') #grammer
-                for e in np.unique(desc):
-                    n = np.sum(desc == e)
+                # count the instances of each description by hashing,
+                # sorting the object array is much slower
+                counts = {}
+                for e in a.desc:
+                    counts[e] = counts.get(e, 0) + 1
+                for e in sorted(counts):
+                    n = counts[e]
                     if n > 1:
                         t += '    {} instances of {}\n'.format(n, e)
                     else:
@@ -589,13 +666,92 @@ def get_neighbors(a):
         Nan is returned for values at edges.
     """
     nk, ni, nj = a.shape
-    tmp = np.empty((nk+2, ni+2, nj+2), dtype=float)
-    tmp[:, :, :] = np.nan
-    tmp[1:-1, 1:-1, 1:-1] = a[:, :, :]
-    neighbors = np.vstack([tmp[0:-2, 1:-1, 1:-1].ravel(), # k-1
-                           tmp[2:, 1:-1, 1:-1].ravel(), # k+1
-                           tmp[1:-1, 0:-2, 1:-1].ravel(), # i-1
-                           tmp[1:-1, 2:, 1:-1].ravel(), # i+1
-                           tmp[1:-1, 1:-1, :-2].ravel(), # j-1
-                           tmp[1:-1, 1:-1, 2:].ravel()]) # j+1
-    return neighbors.reshape(6, nk, ni, nj)
\ No newline at end of file
+    neighbors = np.empty((6, nk, ni, nj), dtype=float)
+    neighbors[:] = np.nan
+    for n, (cells, nbrs) in enumerate(_neighbor_slices(3)):
+        neighbors[n][cells] = a[nbrs]
+    return neighbors
+
+def _neighbor_slices(ndim):
+    """Yield the slices of the cells and of their neighbors for the 2 *
+    ndim directions (k-1, k+1, i-1, i+1, j-1, j+1 for 3-D arrays). Cells
+    at the edge that do not have a neighbor in a direction are not
+    included in the slices for that direction."""
+    for axis in range(ndim):
+        for cells, nbrs in ((slice(1, None), slice(None, -1)), # -1
+                            (slice(None, -1), slice(1, None))): # +1
+            cell_slice = [slice(None)] * ndim
+            nbr_slice = [slice(None)] * ndim
+            cell_slice[axis] = cells
+            nbr_slice[axis] = nbrs
+            yield tuple(cell_slice), tuple(nbr_slice)
+
+def neighbor_reduce(a, func, how='all', edge=True, active=None):
+    """Test each value in a against its 6 neighboring values (4 for 2-D
+    arrays) and combine the results for each value.
+
+    The neighbors are compared with strided views of a (one for the cells
+    and one for their neighbors in each direction), so unlike
+    get_neighbors, the (6, nlay, nrow, ncol) array of neighboring values
+    is never built. Only the boolean result and the temporary result of
+    func for one direction are allocated.
+
+    Parameters
+    ----------
+    a : 2-D or 3-D array
+        Model array in layer, row, column order.
+    func : function
+        func(values, neighbor_values) returning a boolean array, for
+        example lambda v, n: n < 1 or lambda v, n: v > 1e3 * n.
+    how : str
+        'all' if the values are True where func is True for all
+        neighbors, 'any' if the values are True where func is True for at
+        least one neighbor. (default is 'all')
+    edge : bool
+        Result of func for the missing neighbors at the edges of the
+        grid, and for inactive neighbors. (default is True)
+    active : boolean array, optional
+        Cells that are used as neighbors. Inactive neighbors are handled
+        like missing neighbors at the edges. (default is None, all cells
+        are used)
+
+    Returns
+    -------
+    result : boolean array
+        Array of the same shape as a.
+
+    Examples
+    --------
+    >>> # active cells without active neighbors
+    >>> isolated = (ibound > 0) & neighbor_reduce(ibound, lambda v, n: n < 1)
+    >>> # cells with a hk contrast over 1e4 with one of their neighbors
+    >>> contrast = neighbor_reduce(hk, lambda v, n: v > 1e4 * n, how='any',
+    ...                            edge=False)
+    """
+    a = np.asarray(a)
+    if how == 'all':
+        result = np.ones(a.shape, dtype=bool)
+        combine = np.logical_and
+    elif how == 'any':
+        result = np.zeros(a.shape, dtype=bool)
+        combine = np.logical_or
+    else:
+        raise Exception('neighbor_reduce: how must be \'all\' or ' +
+                        '\'any\', not {}'.format(how))
+    # the missing neighbors only change the result if edge is False for
+    # 'all', or True for 'any'
+    set_edges = (how == 'all') != bool(edge)
+    for cells, nbrs in _neighbor_slices(a.ndim):
+        if set_edges:
+            # cells without a neighbor in this direction
+            # (the first cells for -1 and the last cells for +1)
+            missing = tuple(slice(None) if s == slice(None)
+                            else slice(0, 1) if s.start == 1
+                            else slice(-1, None) for s in cells)
+            result[missing] = bool(edge)
+        value = func(a[cells], a[nbrs])
+        if active is not None:
+            value = np.where(active[nbrs], value, bool(edge))
+        r = result[cells]
+        combine(r, value, out=r)
+    return result
\ No newline at end of file
@@ -22,6 +22,14 @@ class MfGrdFile(FlopyBinaryData):
         self._datadict = collections.OrderedDict()
         self._recordkeys = []
 
+        # cached grid connectivity and geometry
+        self._ia = None
+        self._ja = None
+        self._iavert = None
+        self._javert = None
+        self._vertices = None
+        self._centroids = None
+
         self.file = open(filename, 'rb')
         """
         # read header information
@@ -119,6 +127,8 @@ class MfGrdFile(FlopyBinaryData):
         return self.sr
 
     def get_centroids(self):
+        if self._centroids is not None:
+            return self._centroids
         x, y = None, None
         try:
             if self._grid == 'DISV':
@@ -131,47 +141,97 @@ class MfGrdFile(FlopyBinaryData):
         except:
             print('could not return centroids' +
                   ' for {}'.format(self.file.name))
-        return np.column_stack((x, y))
+        self._centroids = np.column_stack((x, y))
+        return self._centroids
 
-    def get_verts(self):
-        if self._grid == 'DISV':
-            try:
-                iverts = []
-                iavert = self._datadict['IAVERT']
-                javert = self._datadict['JAVERT']
+    def get_adjacency(self):
+        """
+        Get the cell connectivity in compressed sparse row (CSR) format.
+        The cells connected to zero-based cell n are ja[ia[n]:ia[n + 1]].
+        The arrays are built from the IA and JA records once and cached.
+
+        Returns
+        -------
+        ia : numpy.ndarray
+            zero-based row pointers of size ncells + 1
+        ja : numpy.ndarray
+            zero-based connected cell numbers, excluding the cell itself
+
+        """
+        if self._ia is None:
+            if 'IA' not in self._datadict or 'JA' not in self._datadict:
+                print('could not return connectivity for {}'.format(
+                    self.file.name))
+                return None, None
+            ia = self._datadict['IA'] - 1
+            ja = self._datadict['JA'] - 1
+            ncells = ia.shape[0] - 1
+            rows = np.repeat(np.arange(ncells), np.diff(ia))
+            # the first connection of each cell is the cell itself
+            keep = ja != rows
+            counts = np.bincount(rows[keep], minlength=ncells)
+            self._ia = np.concatenate(([0], np.cumsum(counts)))
+            self._ja = ja[keep]
+        return self._ia, self._ja
+
+    def get_cell_vertices(self):
+        """
+        Get the cell polygons as flat offset arrays.  The vertex numbers of
+        zero-based cell n are javert[iavert[n]:iavert[n + 1]] and the
+        coordinates of the vertices are vertices[javert]. The arrays are
+        built once and cached.
+
+        Returns
+        -------
+        iavert : numpy.ndarray
+            zero-based offsets into javert of size ncells + 1
+        javert : numpy.ndarray
+            zero-based vertex numbers of each cell polygon
+        vertices : numpy.ndarray
+            vertex coordinates of shape (nvert, 2)
+
+        """
+        if self._iavert is None:
+            if self._grid == 'DISV':
                 shpvert = self._recorddict['VERTICES'][2]
-                for ivert in range(self._datadict['NCPL']):
-                    i0 = iavert[ivert] - 1
-                    i1 = iavert[ivert+1] - 1
-                    iverts.append((javert[i0:i1]-1).tolist())
-                if self.verbose:
-                    print('returning vertices for {}'.format(self.file.name))
-                return iverts, self._datadict['VERTICES'].reshape(shpvert)
-            except:
-                print('could not return vertices for {}'.format(self.file.name))
-        elif self._grid == 'DIS':
-            try:
+                iavert = self._datadict['IAVERT'] - 1
+                javert = self._datadict['JAVERT'] - 1
+                vertices = self._datadict['VERTICES'].reshape(shpvert)
+            elif self._grid == 'DIS' and self.sr is not None:
                 nlay, nrow, ncol = self._datadict['NLAY'], \
                                    self._datadict['NROW'], \
                                    self._datadict['NCOL']
-                iv = 0
-                verts = []
-                iverts = []
-                for k in range(nlay):
-                    for i in range(nrow):
-                        for j in range(ncol):
-                            ivlist = []
-                            v = self.sr.get_vertices(i, j)
-                            for (x, y) in v:
-                                verts.append((x, y))
-                                ivlist.append(iv)
-                                iv += 1
-                            iverts.append(ivlist)
-                verts = np.array(verts)
-                return iverts, verts
-            except:
-                print('could not return vertices for {}'.format(self.file.name))
-
-
-
+                # closed polygons of the shared cell corners, in the
+                # same order as SpatialReference.get_vertices()
+                ii, jj = np.meshgrid(np.arange(nrow), np.arange(ncol),
+                                     indexing='ij')
+                iv = (ii * (ncol + 1) + jj).ravel()
+                javert = np.column_stack((iv, iv + ncol + 1,
+                                          iv + ncol + 2, iv + 1, iv))
+                javert = np.tile(javert.ravel(), nlay)
+                iavert = np.arange(0, javert.shape[0] + 1, 5)
+                vertices = np.column_stack((self.sr.xgrid.ravel(),
+                                            self.sr.ygrid.ravel()))
+            else:
+                # DISU grids, or a DIS grid without a spatial reference
+                print('could not return vertices for {}'.format(
+                    self.file.name))
+                return None, None, None
+            self._iavert = iavert
+            self._javert = javert
+            self._vertices = vertices
+        return self._iavert, self._javert, self._vertices
 
+    def get_verts(self):
+        iavert, javert, vertices = self.get_cell_vertices()
+        if iavert is None:
+            return
+        if self._grid == 'DISV':
+            iverts = [v.tolist() for v in np.split(javert, iavert[1:-1])]
+            if self.verbose:
+                print('returning vertices for {}'.format(self.file.name))
+            return iverts, vertices
+        elif self._grid == 'DIS':
+            verts = vertices[javert]
+            iverts = np.arange(verts.shape[0]).reshape(-1, 5).tolist()
+            return iverts, verts
@@ -8,6 +8,10 @@ MODFLOW Guide
 
 """
 import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
 
 class NamData(object):
     """
@@ -22,15 +26,21 @@ class NamData(object):
     name : string
         Filename of the package file identified in the name file
     handle : file handle
-        File handle referring to the file identified by `name`
+        File handle referring to the file identified by `name`. If None,
+        the file is opened when filehandle is first used.
     packages : dictionary
         Dictionary of package objects as defined in the
         `mfnam_packages` attribute of :class:`flopy.modflow.mf.Modflow`.
+    pool : FilePool
+        Pool that limits the number of open files (optional). The file is
+        opened by the pool when filehandle is used and can be closed by the
+        pool when other files are opened.
 
     Attributes
     ----------
     filehandle : file handle
-        File handle to the package file. Read from `handle`.
+        File handle to the package file. Read from `handle`, or opened when
+        it is first used. None if the file can not be opened.
     filename : string
         Filename of the package file identified in the name file.
         Read from `name`.
@@ -54,18 +64,242 @@ class NamData(object):
     --------
 
     """
-    def __init__(self, pkgtype, name, handle, packages):
-        self.filehandle = handle
+    def __init__(self, pkgtype, name, handle, packages, pool=None):
+        self._filehandle = handle
+        # position of the file when it was closed by the pool
+        self._position = 0
+        # number of users of the file handle, see handle()
+        self._pins = 0
+        # threads reading the file take turns, see handle()
+        self._lock = threading.RLock()
+        self._pool = pool
         self.filename = name
         self.filetype = pkgtype
+        self.openmode = 'r'
+        if pkgtype.upper() == 'DATA(BINARY)':
+            self.openmode = 'rb'
         self.package = None
         if self.filetype.lower() in packages:
             self.package = packages[self.filetype.lower()]
 
+    @property
+    def filehandle(self):
+        if self._filehandle is None or self._filehandle.closed:
+            if self._pool is not None:
+                return self._pool.open(self)
+            self._open()
+        return self._filehandle
+
+    @filehandle.setter
+    def filehandle(self, handle):
+        self._filehandle = handle
+        self._position = 0
+
+    @contextmanager
+    def handle(self):
+        """
+        Context manager with the file handle. The file is not closed by the
+        pool while it is used, and other threads wait until it is no longer
+        used.
+
+        Examples
+        --------
+
+        >>> with ext_unit_dict[nunit].handle() as f:
+        ...     line = f.readline()
+
+        """
+        with self._lock:
+            self._pin(1)
+            try:
+                yield self.filehandle
+            finally:
+                self._pin(-1)
+
+    def _pin(self, n):
+        # the pins are read by the pool when it closes files
+        if self._pool is not None:
+            with self._pool._lock:
+                self._pins += n
+        else:
+            self._pins += n
+
+    def _open(self):
+        # open the file at the position it was closed
+        try:
+            self._filehandle = open(self.filename, self.openmode)
+        except:
+            self._filehandle = None
+            return
+        if self._position:
+            self._filehandle.seek(self._position)
+
+    def _close(self):
+        # close the file and keep the position
+        if self._filehandle is not None and not self._filehandle.closed:
+            self._position = self._filehandle.tell()
+            self._filehandle.close()
 
     def __repr__(self):
         return "filename:{0}, filetype:{1}".format(self.filename,self.filetype)
 
+
+class FilePool(object):
+    """
+    Pool of the files of the entries of a name file that are open.
+
+    The files are opened when they are used. When more than maxopen files
+    are open, the least recently used files are closed, a closed file is
+    opened again at the same position when it is used again.
+
+    Parameters
+    ----------
+    maxopen : int
+        maximum number of open files (default is 64). Files that are used
+        (NamData.handle()) are not closed.
+
+    """
+
+    def __init__(self, maxopen=64):
+        self.maxopen = maxopen
+        # NamData instances with an open file, least recently used first
+        self._open = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._open)
+
+    def open(self, namdata):
+        """
+        Get the file handle of a NamData instance, the file is opened if
+        needed.
+
+        Parameters
+        ----------
+        namdata : NamData
+
+        Returns
+        -------
+        filehandle : file handle
+            None if the file can not be opened.
+
+        """
+        with self._lock:
+            key = id(namdata)
+            self._open.pop(key, None)
+            f = namdata._filehandle
+            if f is None or f.closed:
+                namdata._open()
+                f = namdata._filehandle
+                if f is None:
+                    return None
+            self._open[key] = namdata
+            self._close_lru()
+            return f
+
+    def _close_lru(self):
+        n = len(self._open) - self.maxopen
+        if n <= 0:
+            return
+        for key, namdata in list(self._open.items())[:-1]:
+            if namdata._pins == 0:
+                namdata._close()
+                del self._open[key]
+                n -= 1
+                if n == 0:
+                    break
+
+    def close(self):
+        """
+        Close all the files. The files are opened again when they are used.
+
+        """
+        with self._lock:
+            for namdata in self._open.values():
+                namdata._close()
+            self._open.clear()
+
+
+class ExtUnitDict(dict):
+    """
+    Dictionary of the NamData instances of a name file keyed by unit
+    number, with an index of the unit numbers by file name.
+
+    Parameters
+    ----------
+    pool : FilePool
+        pool of the open files of the entries (optional)
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.pool = kwargs.pop('pool', None)
+        super(ExtUnitDict, self).__init__(*args, **kwargs)
+        self._units = None
+
+    def __setitem__(self, key, value):
+        self._units = None
+        super(ExtUnitDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._units = None
+        super(ExtUnitDict, self).__delitem__(key)
+
+    def pop(self, *args):
+        self._units = None
+        return super(ExtUnitDict, self).pop(*args)
+
+    def popitem(self):
+        self._units = None
+        return super(ExtUnitDict, self).popitem()
+
+    def setdefault(self, key, default=None):
+        self._units = None
+        return super(ExtUnitDict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._units = None
+        super(ExtUnitDict, self).update(*args, **kwargs)
+
+    def clear(self):
+        self._units = None
+        super(ExtUnitDict, self).clear()
+
+    def get_unit(self, filename):
+        """
+        Get the unit number of a file.
+
+        Parameters
+        ----------
+        filename : str
+            file name of the entry (NamData.filename)
+
+        Returns
+        -------
+        unit : int
+            unit number of the first entry of the name file with this file
+            name, None if the file is not in the name file.
+
+        """
+        units = self._units
+        if units is None:
+            units = {}
+            for key, value in list(self.items()):
+                units.setdefault(value.filename, key)
+            self._units = units
+        return units.get(filename)
+
+    def close(self):
+        """
+        Close the files of the entries. The files are opened again when
+        they are used.
+
+        """
+        if self.pool is not None:
+            self.pool.close()
+        for value in list(self.values()):
+            value._close()
+
 def getfiletypeunit(nf, filetype):
     """
     Method to return unit number of a package from a NamData instance
@@ -95,7 +329,7 @@ def testint(cval):
         return False
     
 # function to parse the name file
-def parsenamefile(namfilename, packages, verbose=True):
+def parsenamefile(namfilename, packages, verbose=True, maxopen=64):
     """
     Function to parse the nam file and return a dictionary with types,
     names, units and handles
@@ -109,10 +343,14 @@ def parsenamefile(namfilename, packages, verbose=True):
         attribute of :class:`flopy.modflow.mf.Modflow`.
     verbose : logical
         Print messages to screen.  Default is True.
+    maxopen : int
+        Maximum number of files of the name file that are open at the same
+        time. The files are opened when their handle is first used.
+        Default is 64.
 
     Returns
     ----------
-    ext_unit_dict : dictionary
+    ext_unit_dict : ExtUnitDict
         For each file listed in the name file, a
         :class:`flopy.utils.mfreadnam.NamData` instance
         is stored in the ext_unit_dict dictionary keyed by unit number
@@ -123,7 +361,8 @@ def parsenamefile(namfilename, packages, verbose=True):
             namfilename += '.nam'
     
     # initiate the ext_unit_dict dictionary
-    ext_unit_dict = dict()
+    pool = FilePool(maxopen)
+    ext_unit_dict = ExtUnitDict(pool=pool)
 
     if verbose:
         print('Parsing the namefile --> {0:s}'.format(namfilename))
@@ -166,17 +405,10 @@ def parsenamefile(namfilename, packages, verbose=True):
                     if bname.lower() in lownams:
                         idx = lownams.index(bname.lower())
                         fname = os.path.join(dn, fls[idx])
-                # parse the line
-                openmode = 'r'
-                if tmp[0].upper() == 'DATA(BINARY)':
-                    openmode = 'rb'
-                try:
-                    filehandle = open(fname, openmode)
-                except:
-                    if verbose:
-                        print('could not set filehandle for {0:s}'\
-                            .format(tmp[2]))
-                    filehandle = None
+                # parse the line, the file is opened when it is used
+                if not os.path.isfile(fname) and verbose:
+                    print('could not set filehandle for {0:s}'\
+                        .format(tmp[2]))
                 # populate the dictionary
                 key = int(tmp[1])
                 #
@@ -190,7 +422,7 @@ def parsenamefile(namfilename, packages, verbose=True):
                         key = packages[ftype].reservedunit()
                     else:
                         key = tmp[0]
-                ext_unit_dict[key] = NamData(tmp[0].upper(), fname, filehandle,
-                                             packages)
+                ext_unit_dict[key] = NamData(tmp[0].upper(), fname, None,
+                                             packages, pool=pool)
     return ext_unit_dict
 
@@ -4,7 +4,9 @@ Support SFT budget also
 
 """
 import os
+import re
 import sys
+import mmap
 import warnings
 from datetime import timedelta
 import numpy as np
@@ -28,7 +30,8 @@ class MtListBudget(object):
     --------
     >>> mt_list = MtListBudget("my_mt3d.list")
     >>> incremental, cumulative = mt_list.get_budget()
-    >>> df_in, df_out = mt_list.get_dataframes(start_datetime="10-21-2015")
+    >>> df_gw, df_sw = mt_list.parse(start_datetime="10-21-2015")
+    >>> df_gw, df_sw = mt_list.parse(components=[2], start_totim=100.)
 
     """
 
@@ -50,11 +53,103 @@ class MtListBudget(object):
         self.sw_budget_key = "STREAM MASS BUDGETS AT END OF TRANSPORT STEP".lower()
         self.time_key = "TOTAL ELAPSED TIME SINCE BEGINNING OF SIMULATION".lower()
 
+        self.idx_map = None
+
         return
 
+    def build_index(self):
+        """build an index of the mass budget blocks in the list file.  The
+        file is memory-mapped and scanned once for the budget headers, so
+        that individual components or time windows can be parsed without
+        reading the entire file.
+
+        Returns
+        -------
+        idx_map : numpy.recarray
+            one record per budget block with fields 'sw' (True for the
+            surface-water budget), 'comp', 'totim', 'kper', 'kstp', 'tkstp'
+            and 'offset' (byte offset of the block header line).  totim,
+            kper, kstp and tkstp are -1 if they could not be read (e.g.
+            truncated file).  Surface-water blocks are assigned the totim of
+            the matching groundwater block.
+        """
+        dtype = np.dtype([('sw', bool), ('comp', int), ('totim', float),
+                          ('kper', int), ('kstp', int), ('tkstp', int),
+                          ('offset', np.int64)])
+        pattern = re.compile('({0})|({1})'.format(
+            re.escape(self.gw_budget_key),
+            re.escape(self.sw_budget_key)).encode('ascii'), re.IGNORECASE)
+        entries = []
+        with open(self.file_name, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self.idx_map = np.recarray((0,), dtype=dtype)
+                return self.idx_map
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for m in pattern.finditer(mm):
+                    sw = m.lastindex == 2
+                    offset = mm.rfind(b'\n', 0, m.start()) + 1
+                    line = self._seek_block(mm, offset)
+                    totim, kper, kstp, tkstp = -1., -1, -1, -1
+                    try:
+                        if sw:
+                            comp, kper, kstp, tkstp = \
+                                self._parse_sw_header(line)
+                        else:
+                            comp, totim, kper, kstp, tkstp = \
+                                self._parse_gw_header(mm, line)
+                    except Exception:
+                        # truncated block - keep it in the index so that
+                        # parse() reports the failure
+                        comp = self._parse_comp(line, sw)
+                    entries.append((sw, comp, totim, kper, kstp, tkstp,
+                                    offset))
+            finally:
+                mm.close()
+        idx_map = np.array(entries, dtype=dtype).view(np.recarray)
+
+        # surface-water blocks do not report the elapsed time
+        gw = idx_map[~idx_map.sw]
+        times = {(c, p, s, t): tt for c, p, s, t, tt in
+                 zip(gw.comp, gw.kper, gw.kstp, gw.tkstp, gw.totim)}
+        for i in np.where(idx_map.sw)[0]:
+            rec = idx_map[i]
+            key = (rec.comp, rec.kper, rec.kstp, rec.tkstp)
+            idx_map.totim[i] = times.get(key, -1.)
+        self.idx_map = idx_map
+        return idx_map
+
+    def get_components(self):
+        """get the component numbers in the list file
+
+        Returns
+        -------
+        comps : list of ints
+
+        """
+        if self.idx_map is None:
+            self.build_index()
+        return sorted(set(self.idx_map.comp.tolist()))
+
+    def get_times(self):
+        """get the unique simulation times of the groundwater mass budgets
+        in the list file
+
+        Returns
+        -------
+        totim : list of floats
+
+        """
+        if self.idx_map is None:
+            self.build_index()
+        gw = self.idx_map[~self.idx_map.sw]
+        return sorted(set(gw.totim[gw.totim >= 0.].tolist()))
+
     def parse(self, forgive=True, diff=True, start_datetime=None,
-              time_unit='d'):
-        """main entry point for parsing the list file.
+              time_unit='d', components=None, start_totim=None,
+              end_totim=None):
+        """main entry point for parsing the list file.  Only the budget
+        blocks selected by components, start_totim and end_totim are read.
 
         Parameters
         ----------
@@ -67,6 +162,14 @@ class MtListBudget(object):
             Default is None.
         time_unit : str
             str to pass to pandas.to_timedelta.  Default is 'd' (days)
+        components : list of ints
+            component numbers to parse.  Default is None (all components)
+        start_totim : float
+            only parse budgets at or after this simulation time.  Default is
+            None.
+        end_totim : float
+            only parse budgets at or before this simulation time.  Default is
+            None.
 
         Returns
         -------
@@ -82,34 +185,39 @@ class MtListBudget(object):
         self.gw_data = {}
         self.sw_data = {}
         self.lcount = 0
-        with open(self.file_name) as f:
-            while True:
-                line = self._readline(f)
-
-                if line is None:
-                    break
-                if self.gw_budget_key in line:
-                    if forgive:
-                        try:
-                            self._parse_gw(f, line)
-                        except Exception as e:
-                            warnings.warn(
-                                "error parsing GW mass budget starting on line {0}: {1} ".
-                                format(self.lcount, str(e)))
-                            break
+        if self.idx_map is None:
+            self.build_index()
+        idx_map = self.idx_map
+        if components is not None:
+            idx_map = idx_map[np.in1d(idx_map.comp, components)]
+        if start_totim is not None:
+            idx_map = idx_map[idx_map.totim >= start_totim]
+        if end_totim is not None:
+            idx_map = idx_map[(idx_map.totim <= end_totim) &
+                              (idx_map.totim >= 0.)]
+        if idx_map.shape[0] == 0:
+            raise Exception("no groundwater budget info found...")
+        with open(self.file_name, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for rec in idx_map:
+                    line = self._seek_block(mm, int(rec.offset))
+                    if rec.sw:
+                        parser, label = self._parse_sw, 'SW'
                     else:
-                        self._parse_gw(f, line)
-                elif self.sw_budget_key in line:
+                        parser, label = self._parse_gw, 'GW'
                     if forgive:
                         try:
-                            self._parse_sw(f, line)
+                            parser(mm, line)
                         except Exception as e:
                             warnings.warn(
-                                "error parsing SW mass budget starting on line {0}: {1} ".
-                                format(self.lcount, str(e)))
+                                "error parsing {0} mass budget starting on line {1}: {2} ".
+                                format(label, self._lineno(mm), str(e)))
                             break
                     else:
-                        self._parse_sw(f, line)
+                        parser(mm, line)
+            finally:
+                mm.close()
 
         if len(self.gw_data) == 0:
             raise Exception("no groundwater budget info found...")
@@ -122,7 +230,8 @@ class MtListBudget(object):
         for i, lst in self.gw_data.items():
             self.gw_data[i] = lst[:min_len]
         df_gw = pd.DataFrame(self.gw_data)
-        df_gw.loc[:, "totim"] = df_gw.pop("totim_1")
+        totim_col = [c for c in df_gw.columns if c.startswith("totim_")][0]
+        df_gw.loc[:, "totim"] = df_gw.pop(totim_col)
 
 
         # if cumulative:
@@ -206,16 +315,41 @@ class MtListBudget(object):
 
         return pd.DataFrame(new,index=df.index)
 
+    @staticmethod
+    def _decode(line):
+        if not isinstance(line, str):
+            line = line.decode('ascii', 'replace')
+        return line.lower()
+
     def _readline(self, f):
-        line = f.readline().lower()
+        line = self._decode(f.readline())
         self.lcount += 1
         if line == '':
             return None
         return line
 
-    def _parse_gw(self, f, line):
-        raw = line.strip().split()
-        comp = int(raw[-1][:2])
+    def _seek_block(self, f, offset):
+        self._block_offset = offset
+        self._block_line = None
+        self.lcount = 0
+        f.seek(offset)
+        return self._readline(f)
+
+    def _lineno(self, f):
+        # line numbers are only needed for error messages, so the line
+        # count up to the current block is computed on demand
+        if self._block_line is None:
+            self._block_line = f[:self._block_offset].count(b'\n')
+        return self._block_line + self.lcount
+
+    @staticmethod
+    def _parse_comp(line, sw=False):
+        if sw:
+            return int(line.split()[-1])
+        return int(line.strip().split()[-1][:2])
+
+    def _parse_gw_header(self, f, line):
+        comp = self._parse_comp(line)
         for _ in range(7):
             line = self._readline(f)
             if line is None:
@@ -225,7 +359,7 @@ class MtListBudget(object):
             totim = float(line.split()[-2])
         except Exception as e:
             raise Exception("error parsing totim on line {0}: {1}".
-                            format(self.lcount, str(e)))
+                            format(self._lineno(f), str(e)))
 
         for _ in range(3):
             line = self._readline(f)
@@ -238,7 +372,11 @@ class MtListBudget(object):
             tkstp = int(raw[-7][:-1])
         except Exception as e:
             raise Exception("error parsing time step info on line {0}: {1}".
-                            format(self.lcount, str(e)))
+                            format(self._lineno(f), str(e)))
+        return comp, totim, kper, kstp, tkstp
+
+    def _parse_gw(self, f, line):
+        comp, totim, kper, kstp, tkstp = self._parse_gw_header(f, line)
         for lab, val in zip(["totim", "kper", "kstp", "tkstp"],
                             [totim, kper, kstp, tkstp]):
             lab += '_{0}'.format(comp)
@@ -259,7 +397,7 @@ class MtListBudget(object):
                 item, ival, oval = self._parse_gw_line(line)
             except Exception as e:
                 raise Exception("error parsing GW items on line {0}: {1}".
-                                format(self.lcount, str(e)))
+                                format(self._lineno(f), str(e)))
             item += "_{0}".format(comp)
             for lab, val in zip(["_in", "_out"], [ival, oval]):
                 iitem = item + lab + "_cum"
@@ -274,15 +412,19 @@ class MtListBudget(object):
         oval = -1.0 * float(raw[1].split()[1])
         return item, ival, oval
 
-    def _parse_sw(self, f, line):
+    def _parse_sw_header(self, line):
         raw = line.split()
-        comp = int(raw[-1])
+        comp = self._parse_comp(line, sw=True)
         kper = int(raw[-4])
         kstp = int(raw[-7][:-1])
         tkstp = int(raw[-10][:-1])
+        return comp, kper, kstp, tkstp
+
+    def _parse_sw(self, f, line):
+        comp, kper, kstp, tkstp = self._parse_sw_header(line)
         for lab, val in zip(["kper", "kstp", "tkstp"], [kper, kstp, tkstp]):
             lab += '_{0}'.format(comp)
-            if lab not in self.gw_data.keys():
+            if lab not in self.sw_data.keys():
                 self.sw_data[lab] = []
             self.sw_data[lab].append(val)
         for _ in range(4):
@@ -301,7 +443,7 @@ class MtListBudget(object):
             except Exception as e:
                 raise Exception(
                     "error parsing 'in' SW items on line {0}: {1}".format(
-                        self.lcountm, str(e)))
+                        self._lineno(f), str(e)))
             item += '_{0}_{1}'.format(comp, 'in')
             for lab, val in zip(['_cum', '_flx'], [cval, fval]):
                 iitem = item + lab
@@ -326,7 +468,7 @@ class MtListBudget(object):
             except Exception as e:
                 raise Exception(
                     "error parsing 'out' SW items on line {0}: {1}".format(
-                        self.lcount, str(e)))
+                        self._lineno(f), str(e)))
             item += '_{0}_{1}'.format(comp, 'out')
             for lab, val in zip(['_cum', '_flx'], [cval, fval]):
                 iitem = item + lab
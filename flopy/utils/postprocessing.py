@@ -1,4 +1,5 @@
 import numpy as np
+from .datafile import LayerFile
 
 def get_transmissivities(heads, m,
                          r=None, c=None, x=None, y=None,
@@ -55,102 +56,122 @@ def get_transmissivities(heads, m,
     assert heads.shape == botm.shape, 'Shape of heads array must be nlay x nhyd'
 
     # set open interval tops/bottoms to model top/bottom if None
+    top = m.dis.top.array[r, c]
     if sctop is None:
-        sctop = m.dis.top.array[r, c]
+        sctop = top
     if scbot is None:
-        scbot = m.dis.botm.array[-1, r, c]
-
-    # make an array of layer tops
-    tops = np.empty_like(botm, dtype=float)
-    tops[0, :] = m.dis.top.array[r, c]
-    tops[1:, :] = botm[:-1]
-
-    # expand top and bottom arrays to be same shape as botm, thickness, etc.
-    # (so we have an open interval value for each layer)
-    sctoparr = np.zeros(botm.shape)
-    sctoparr[:] = sctop
-    scbotarr = np.zeros(botm.shape)
-    scbotarr[:] = scbot
-
-    # start with layer tops
-    # set tops above heads to heads
-    # set tops above screen top to screen top
-    # (we only care about the saturated open interval)
-    openinvtop = tops.copy()
-    openinvtop[openinvtop > heads] = heads[openinvtop > heads]
-    openinvtop[openinvtop > sctoparr] = sctoparr[openinvtop > sctop]
-
-    # start with layer bottoms
-    # set bottoms below screened interval to screened interval bottom
-    # set screen bottoms below bottoms to layer bottoms
-    openinvbotm = botm.copy()
-    openinvbotm[openinvbotm < scbotarr] = scbotarr[openinvbotm < scbot]
-    openinvbotm[scbotarr < botm] = botm[scbotarr < botm]
-
-    # compute thickness of open interval in each layer
-    thick = openinvtop - openinvbotm
+        scbot = botm[-1]
+    sctop = np.asarray(sctop, dtype=float)
+    scbot = np.asarray(scbot, dtype=float)
+
+    # the saturated open interval in each layer is bounded above by the
+    # layer top, the heads and the open interval top, and below by the
+    # layer bottom and the open interval bottom
+    thick = np.empty(botm.shape, dtype=float)
+    thick[0] = top
+    thick[1:] = botm[:-1]
+    np.minimum(thick, heads, out=thick)
+    np.minimum(thick, sctop, out=thick)
+    thick -= np.maximum(botm, scbot)
 
     # assign open intervals above or below model to closest cell in column
-    not_in_layer = np.sum(thick < 0, axis=0)
-    not_in_any_layer = not_in_layer == thick.shape[0]
-    for i, n in enumerate(not_in_any_layer):
-        if n:
-            closest = np.argmax(thick[:, i])
-            thick[closest, i] = 1.
+    not_in_any_layer = np.where(np.all(thick < 0, axis=0))[0]
+    closest = np.argmax(thick[:, not_in_any_layer], axis=0)
+    thick[closest, not_in_any_layer] = 1.
     thick[thick < 0] = 0
     thick[heads == nodata] = 0  # exclude nodata cells
 
     # compute transmissivities
-    T = thick * hk
-    return T
+    thick *= hk
+    return thick
 
-def get_water_table(heads, nodata, per_idx=None):
+def _get_heads(heads, per_idx=None):
+    """Return a 4D (ntimes, nlay, nrow, ncol) heads array for the
+    selected times.
+
+    Parameters
+    ----------
+    heads : 3 or 4-D np.ndarray or flopy.utils.HeadFile
+        Heads array, or a head file from which the times are read.
+    per_idx : int or sequence of ints
+        times to return. If None, returns all times (default).
+
+    Returns
+    -------
+    heads : 4-D np.ndarray
+        Without per_idx, array input is returned as a view (no copy).
+    """
+    if isinstance(heads, LayerFile):
+        times = heads.get_times()
+        if per_idx is None:
+            per_idx = list(range(len(times)))
+        elif np.isscalar(per_idx):
+            per_idx = [per_idx]
+        hds = None
+        for i, per in enumerate(per_idx):
+            data = heads.get_data(totim=times[per])
+            if hds is None:
+                hds = np.empty((len(per_idx),) + data.shape,
+                               dtype=data.dtype)
+            hds[i] = data
+        return hds
+    heads = np.array(heads, ndmin=4, copy=False)
+    if per_idx is None:
+        return heads
+    elif np.isscalar(per_idx):
+        return heads[per_idx:per_idx + 1]
+    return heads[list(per_idx)]
+
+
+def _get_out(out, shape, dtype=float):
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError('out array has shape {}; '
+                         'expected {}'.format(out.shape, shape))
+    return out
+
+
+def get_water_table(heads, nodata, per_idx=None, out=None):
     """Get a 2D array representing the water table
     elevation for each stress period in heads array.
     
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or flopy.utils.HeadFile
+        Heads array, or a head file (all times are read by default).
     nodata : real
         HDRY value indicating dry cells.
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    out : 3-D np.ndarray
+        optional array of shape (number of stress periods, nrow, ncol)
+        to write the results into.
     Returns
     -------
     wt : 2 or 3-D np.ndarray of water table elevations
         for each stress period.
     """
-    heads = np.array(heads, ndmin=4)
+    heads = _get_heads(heads, per_idx)
     nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
-    wt = []
-    for per in per_idx:
-        wt_per = []
-        for i in range(nrow):
-            for j in range(ncol):
-                for k in range(nlay):
-                    if heads[per, k, i, j] != nodata:
-                        wt_per.append(heads[per, k, i, j])
-                        break
-                    elif k == nlay - 1:
-                        wt_per.append(nodata)
-        assert len(wt_per) == nrow * ncol
-        wt.append(np.reshape(wt_per, (nrow, ncol)))
+    wet = heads != nodata
+    # index of the first wet layer in each column
+    k = np.argmax(wet, axis=1)
+    t, i, j = np.ogrid[:nper, :nrow, :ncol]
+    wt = _get_out(out, (nper, nrow, ncol), dtype=heads.dtype)
+    wt[:] = heads[t, k, i, j]
+    wt[~wet[t, k, i, j]] = nodata
     return np.squeeze(wt)
 
-def get_saturated_thickness(heads, m, nodata, per_idx=None):
+def get_saturated_thickness(heads, m, nodata, per_idx=None, out=None):
     """Calculates the saturated thickness for each cell from the heads
     array for each stress period.
 
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or flopy.utils.HeadFile
+        Heads array, or a head file (all times are read by default).
     m : flopy.modflow.Modflow object
         Must have a flopy.modflow.ModflowDis object attached.
     nodata : real
@@ -158,38 +179,32 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    out : 4-D np.ndarray
+        optional float array of shape (number of stress periods, nlay,
+        nrow, ncol) to write the results into.
     Returns
     -------
     sat_thickness : 3 or 4-D np.ndarray
         Array of saturated thickness
     """
-    heads = np.array(heads, ndmin=4)
+    heads = _get_heads(heads, per_idx)
     botm = m.dis.botm.array
     thickness = m.dis.thickness.array
-    nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
-
-    heads[heads == nodata] = np.nan
-    sat_thickness = []
-    for per in per_idx:
-        hds = heads[per]
-        perthickness = hds - botm
-        conf = perthickness > thickness
-        perthickness[conf] = thickness[conf]
-        sat_thickness.append(perthickness)
+
+    sat_thickness = _get_out(out, heads.shape)
+    np.subtract(heads, botm, out=sat_thickness)
+    np.minimum(sat_thickness, thickness, out=sat_thickness)
+    sat_thickness[heads == nodata] = np.nan
     return np.squeeze(sat_thickness)
 
-def get_gradients(heads, m, nodata, per_idx=None):
+def get_gradients(heads, m, nodata, per_idx=None, out=None):
     """Calculates the hydraulic gradients from the heads
     array for each stress period.
 
     Parameters
     ----------
-    heads : 3 or 4-D np.ndarray
-        Heads array.
+    heads : 3 or 4-D np.ndarray or flopy.utils.HeadFile
+        Heads array, or a head file (all times are read by default).
     m : flopy.modflow.Modflow object
         Must have a flopy.modflow.ModflowDis object attached.
     nodata : real
@@ -197,28 +212,23 @@ def get_gradients(heads, m, nodata, per_idx=None):
     per_idx : int or sequence of ints
         stress periods to return. If None,
         returns all stress periods (default).
+    out : 4-D np.ndarray
+        optional float array of shape (number of stress periods, nlay - 1,
+        nrow, ncol) to write the results into.
     Returns
     -------
     grad : 3 or 4-D np.ndarray
         Array of hydraulic gradients
     """
-    heads = np.array(heads, ndmin=4)
+    heads = _get_heads(heads, per_idx)
     nper, nlay, nrow, ncol = heads.shape
-    if per_idx is None:
-        per_idx = list(range(nper))
-    elif np.isscalar(per_idx):
-        per_idx = [per_idx]
-
-    heads[heads == nodata] = np.nan
-    grad = []
-    for per in per_idx:
-        hds = heads[per]
-        zcnt_per = m.dis.zcentroids.copy()
-        unsat = zcnt_per > hds
-        zcnt_per[np.isnan(hds)] = np.nan
-        zcnt_per[unsat] = hds[unsat]
-
-        dz = np.diff(zcnt_per, axis=0)
-        dh = np.diff(hds, axis=0)
-        grad.append(dh/dz)
+    hds = np.where(heads == nodata, np.nan, heads)
+
+    # cell centers above the water table are moved to the water table
+    zcnt = np.minimum(m.dis.zcentroids, hds)
+    dz = np.diff(zcnt, axis=1)
+
+    grad = _get_out(out, (nper, nlay - 1, nrow, ncol))
+    np.subtract(hds[:, 1:], hds[:, :-1], out=grad)
+    np.divide(grad, dz, out=grad)
     return np.squeeze(grad)
@@ -940,15 +940,25 @@ class SpatialReference(object):
         -------
         r : row or sequence of rows (zero-based)
         c : column or sequence of columns (zero-based)
+
+        Notes
+        -----
+        The points are transformed to model coordinates and located by a
+        binary search of the cell edges, so memory use scales with the
+        number of points only.  Points outside of the grid are assigned to
+        the nearest row or column.
         """
-        if np.isscalar(x):
-            c = (np.abs(self.xcentergrid[0] - x)).argmin()
-            r = (np.abs(self.ycentergrid[:, 0] - y)).argmin()
-        else:
-            xcp = np.array([self.xcentergrid[0]] * (len(x)))
-            ycp = np.array([self.ycentergrid[:, 0]] * (len(x)))
-            c = (np.abs(xcp.transpose() - x)).argmin(axis=0)
-            r = (np.abs(ycp.transpose() - y)).argmin(axis=0)
+        scalar = np.isscalar(x)
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        xm, ym = self.transform(x, y, inverse=True)
+        c = np.searchsorted(self.xedge, xm, side='right') - 1
+        # y edges decrease from the top of the grid
+        r = np.searchsorted(-self.yedge, -ym, side='right') - 1
+        c = np.clip(c, 0, self.ncol - 1)
+        r = np.clip(r, 0, self.nrow - 1)
+        if scalar:
+            return r[0], c[0]
         return r, c
 
     def get_grid_map_plotter(self):
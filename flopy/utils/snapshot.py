@@ -0,0 +1,490 @@
+"""
+Module to save and load snapshots of flopy models.
+
+A snapshot is a JSON manifest that describes the state of a model (the
+attributes of the model, packages, Util2d, Util3d, Transient2d, MfList
+instances, ...) and a binary file with the numpy arrays of the model stored
+one after the other so that they can be memory mapped when the snapshot is
+loaded. The snapshot is pickle-free, only flopy classes are created when a
+snapshot is loaded.
+
+The manifest includes the fingerprint (size and modification time) of the
+model input files, a snapshot is only loaded if the input files have not
+changed since the snapshot was saved.
+
+A snapshot is written to temporary files that replace the data file and then
+the manifest, so the memory maps of a replaced data file stay valid. The
+manifest and the header of the data file have the same random token, a data
+file is only read with the manifest it was saved with.
+
+"""
+
+import os
+import sys
+import json
+import uuid
+import tempfile
+import datetime
+import importlib
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from enum import Enum
+except ImportError:
+    Enum = None
+
+__all__ = ['fingerprint', 'save_snapshot', 'load_snapshot']
+
+# snapshot format version
+_version = 2
+
+# the data file starts with this magic followed by the token of the snapshot
+_magic = b'FLOPYSNAPSHOT'
+
+# arrays are aligned on this number of bytes in the data file
+_align = 64
+
+# modules classes and types can be imported from when loading a snapshot
+_modules = ('flopy', 'numpy', 'builtins', '__builtin__', 'collections',
+            'datetime')
+
+if sys.version_info[0] > 2:
+    _str_types = (str,)
+    _int_types = (int,)
+else:
+    _str_types = (str, unicode)
+    _int_types = (int, long)
+
+
+def fingerprint(files):
+    """
+    Get the fingerprint of a list of files.
+
+    Parameters
+    ----------
+    files : list of str
+        paths of the files
+
+    Returns
+    -------
+    fp : list
+        [file path, size, modification time] for each file. The size and
+        modification time are None if the file does not exist.
+
+    """
+    fp = []
+    for fpth in files:
+        fpth = os.path.abspath(fpth)
+        if os.path.isfile(fpth):
+            st = os.stat(fpth)
+            fp.append([fpth, st.st_size, st.st_mtime])
+        else:
+            fp.append([fpth, None, None])
+    return fp
+
+
+def _snapshot_files(f):
+    base = os.path.splitext(f)[0] if f.endswith('.json') else f
+    return base + '.json', base + '.dat'
+
+
+def _header(token):
+    # header of the data file, the arrays start at the next aligned offset
+    header = _magic + token.encode('ascii')
+    return header + b'\0' * (-len(header) % _align)
+
+
+def _replace(src, dst):
+    # rename src to dst, replacing dst. An existing dst is unlinked, not
+    # truncated, so memory maps of dst stay valid.
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if os.path.exists(dst) and sys.platform.startswith('win'):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _temp_file(f, mode):
+    # temporary file in the directory of f
+    fd, fpth = tempfile.mkstemp(prefix=os.path.basename(f) + '.',
+                                suffix='.tmp',
+                                dir=os.path.dirname(os.path.abspath(f)))
+    return os.fdopen(fd, mode), fpth
+
+
+def _class_name(cls):
+    name = getattr(cls, '__qualname__', cls.__name__)
+    return '{}:{}'.format(cls.__module__, name)
+
+
+def _import_class(name):
+    module, qualname = name.split(':')
+    if module.split('.')[0] not in _modules:
+        raise Exception('snapshot: cannot load class {} '.format(name) +
+                        'from module {}'.format(module))
+    obj = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _is_flopy(cls):
+    return cls.__module__.split('.')[0] == 'flopy'
+
+
+def _get_state(value):
+    # objects can exclude cached attributes from their state
+    getstate = getattr(type(value), '__getstate__', None)
+    if getstate is not None:
+        state = getstate(value)
+        if isinstance(state, dict):
+            return state
+    return value.__dict__
+
+
+def _dtype_descr(dtype):
+    if dtype.fields is None:
+        return dtype.str
+    return np.lib.format.dtype_to_descr(dtype)
+
+
+def _descr_dtype(descr):
+    def totuple(d):
+        if isinstance(d, list):
+            return tuple(totuple(i) for i in d)
+        return d
+
+    if isinstance(descr, list):
+        descr = [totuple(d) for d in descr]
+    return np.dtype(descr)
+
+
+class _Encoder(object):
+    """
+    Encode an object graph to JSON compatible values and a list of arrays.
+
+    """
+
+    def __init__(self, fdata):
+        self.fdata = fdata
+        self.objects = []
+        self.arrays = []
+        self.memo = {}
+        self.keep = []
+
+    def encode(self, value, path='obj'):
+        if value is None or isinstance(value, bool):
+            return value
+        elif isinstance(value, _str_types):
+            return value
+        elif isinstance(value, _int_types) or isinstance(value, float):
+            return value
+        elif isinstance(value, np.ndarray):
+            return self.encode_array(value, path)
+        elif isinstance(value, np.generic):
+            return {'npscalar': _dtype_descr(value.dtype),
+                    'value': value.item()}
+        elif isinstance(value, np.dtype):
+            return {'dtype': _dtype_descr(value)}
+        elif isinstance(value, type):
+            return {'class': _class_name(value)}
+        elif Enum is not None and isinstance(value, Enum):
+            return {'enum': _class_name(type(value)), 'name': value.name}
+        elif isinstance(value, datetime.datetime):
+            return {'datetime': value.isoformat()}
+        elif _is_flopy(type(value)) and hasattr(value, '__dict__'):
+            return self.encode_object(value, path)
+        elif isinstance(value, list):
+            return [self.encode(v, '{}[{}]'.format(path, i))
+                    for i, v in enumerate(value)]
+        elif isinstance(value, tuple):
+            return {'tuple': [self.encode(v, '{}[{}]'.format(path, i))
+                              for i, v in enumerate(value)]}
+        elif isinstance(value, (set, frozenset)):
+            return {'set': [self.encode(v, path) for v in value]}
+        elif isinstance(value, dict):
+            tag = 'odict' if isinstance(value, OrderedDict) else 'dict'
+            return {tag: [[self.encode(k, path),
+                           self.encode(v, '{}[{!r}]'.format(path, k))]
+                          for k, v in value.items()]}
+        raise Exception('snapshot: cannot save {} '.format(path) +
+                        'of type {}'.format(type(value)))
+
+    def encode_object(self, value, path):
+        key = id(value)
+        if key in self.memo:
+            return {'ref': self.memo[key]}
+        idx = len(self.objects)
+        self.memo[key] = idx
+        self.keep.append(value)
+        entry = {'class': _class_name(type(value))}
+        self.objects.append(entry)
+        entry['state'] = [[k, self.encode(v, '{}.{}'.format(path, k))]
+                          for k, v in _get_state(value).items()]
+        # flopy subclasses of dict and list also store their items
+        if isinstance(value, dict):
+            entry['items'] = [[self.encode(k, path),
+                               self.encode(v, '{}[{!r}]'.format(path, k))]
+                              for k, v in dict.items(value)]
+        elif isinstance(value, list):
+            entry['items'] = [self.encode(v, '{}[{}]'.format(path, i))
+                              for i, v in enumerate(list.__iter__(value))]
+        return {'ref': idx}
+
+    def encode_array(self, value, path):
+        key = id(value)
+        if key in self.memo:
+            return {'array': self.memo[key]}
+        if isinstance(value, np.ma.MaskedArray):
+            raise Exception('snapshot: cannot save masked array ' +
+                            '{}'.format(path))
+        idx = len(self.arrays)
+        self.memo[key] = idx
+        self.keep.append(value)
+        kind = 'recarray' if isinstance(value, np.recarray) else 'ndarray'
+        if value.dtype.hasobject:
+            # arrays of python objects are stored in the manifest
+            entry = {'dtype': _dtype_descr(value.dtype),
+                     'shape': list(value.shape),
+                     'type': kind}
+            self.arrays.append(entry)
+            entry['values'] = self.encode(value.ravel().tolist(), path)
+            return {'array': idx}
+        pos = self.fdata.tell()
+        pad = -pos % _align
+        if pad:
+            self.fdata.write(b'\0' * pad)
+            pos += pad
+        a = np.ascontiguousarray(value)
+        self.fdata.write(a.tobytes())
+        self.arrays.append({'offset': pos,
+                            'dtype': _dtype_descr(value.dtype),
+                            'shape': list(value.shape),
+                            'type': kind})
+        return {'array': idx}
+
+
+class _Decoder(object):
+    """
+    Decode the values written by _Encoder.
+
+    """
+
+    def __init__(self, manifest, fdata, mmap=True):
+        self.fdata = fdata
+        self.mmap = mmap
+        self.object_entries = manifest['objects']
+        self.array_entries = manifest['arrays']
+        self.objects = [None] * len(self.object_entries)
+        self.arrays = [None] * len(self.array_entries)
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(v) for v in value]
+        elif not isinstance(value, dict):
+            return value
+        elif 'ref' in value:
+            return self.decode_object(value['ref'])
+        elif 'array' in value:
+            return self.decode_array(value['array'])
+        elif 'tuple' in value:
+            return tuple(self.decode(v) for v in value['tuple'])
+        elif 'dict' in value:
+            return dict((self.decode(k), self.decode(v))
+                        for k, v in value['dict'])
+        elif 'odict' in value:
+            return OrderedDict((self.decode(k), self.decode(v))
+                               for k, v in value['odict'])
+        elif 'set' in value:
+            return set(self.decode(v) for v in value['set'])
+        elif 'npscalar' in value:
+            return _descr_dtype(value['npscalar']).type(value['value'])
+        elif 'dtype' in value:
+            return _descr_dtype(value['dtype'])
+        elif 'enum' in value:
+            return getattr(_import_class(value['enum']), value['name'])
+        elif 'datetime' in value:
+            v = value['datetime']
+            fmt = '%Y-%m-%dT%H:%M:%S'
+            if '.' in v:
+                fmt += '.%f'
+            return datetime.datetime.strptime(v, fmt)
+        elif 'class' in value:
+            return _import_class(value['class'])
+        raise Exception('snapshot: unknown entry {}'.format(value))
+
+    def decode_object(self, idx):
+        obj = self.objects[idx]
+        if obj is None:
+            entry = self.object_entries[idx]
+            cls = _import_class(entry['class'])
+            if not _is_flopy(cls):
+                raise Exception('snapshot: cannot create instance of ' +
+                                '{}'.format(entry['class']))
+            obj = cls.__new__(cls)
+            if issubclass(cls, (dict, list)):
+                # initialize the builtin base class without calling the
+                # flopy constructor
+                base = [b for b in cls.__mro__ if not _is_flopy(b)][0]
+                base.__init__(obj)
+            # register the object before the state is decoded, the state
+            # can reference the object
+            self.objects[idx] = obj
+            state = dict((k, self.decode(v)) for k, v in entry['state'])
+            setstate = getattr(cls, '__setstate__', None)
+            if setstate is not None:
+                setstate(obj, state)
+            else:
+                obj.__dict__.update(state)
+            if isinstance(obj, dict):
+                for k, v in entry['items']:
+                    base.__setitem__(obj, self.decode(k), self.decode(v))
+            elif isinstance(obj, list):
+                list.extend(obj, [self.decode(v) for v in entry['items']])
+        return obj
+
+    def decode_array(self, idx):
+        a = self.arrays[idx]
+        if a is None:
+            entry = self.array_entries[idx]
+            dtype = _descr_dtype(entry['dtype'])
+            shape = tuple(entry['shape'])
+            count = int(np.prod(shape))
+            if 'values' in entry:
+                values = self.decode(entry['values'])
+                a = np.empty(count, dtype=dtype)
+                for i, v in enumerate(values):
+                    a[i] = v
+                a = a.reshape(shape)
+            elif count == 0:
+                a = np.empty(shape, dtype=dtype)
+            elif self.mmap:
+                # copy-on-write memory map, changes are not written to the
+                # snapshot
+                a = np.memmap(self.fdata, dtype=dtype, mode='c',
+                              offset=entry['offset'], shape=shape)
+            else:
+                self.fdata.seek(entry['offset'])
+                a = np.fromfile(self.fdata, dtype=dtype, count=count)
+                a = a.reshape(shape)
+            if entry['type'] == 'recarray':
+                a = a.view(np.recarray)
+            self.arrays[idx] = a
+        return a
+
+
+def save_snapshot(obj, f, files=None):
+    """
+    Save a snapshot of a flopy object.
+
+    Parameters
+    ----------
+    obj : object
+        flopy object (model, simulation, package, ...)
+    f : str
+        path of the snapshot, without extension. The manifest is written to
+        f + '.json' and the arrays to f + '.dat'.
+    files : list of str
+        input files the object was loaded from. The fingerprints of the
+        files are stored in the manifest. (default is None)
+
+    Notes
+    -----
+    An existing snapshot is replaced, not overwritten: the objects loaded
+    from it keep using its data file.
+
+    """
+    fjson, fdata = _snapshot_files(f)
+    if files is None:
+        files = []
+    fp = fingerprint(files)
+    token = uuid.uuid4().hex
+    fd, ftmp = _temp_file(fdata, 'wb')
+    fjtmp = None
+    try:
+        try:
+            fd.write(_header(token))
+            encoder = _Encoder(fd)
+            root = encoder.encode(obj)
+        finally:
+            fd.close()
+        manifest = OrderedDict()
+        manifest['version'] = _version
+        manifest['token'] = token
+        manifest['fingerprint'] = fp
+        manifest['root'] = root
+        manifest['objects'] = encoder.objects
+        manifest['arrays'] = encoder.arrays
+        fj, fjtmp = _temp_file(fjson, 'w')
+        try:
+            json.dump(manifest, fj)
+        finally:
+            fj.close()
+    except:
+        for fpth in (ftmp, fjtmp):
+            if fpth is not None and os.path.isfile(fpth):
+                os.remove(fpth)
+        raise
+    # the data first, the manifest last
+    _replace(ftmp, fdata)
+    _replace(fjtmp, fjson)
+
+
+def load_snapshot(f, files=None, mmap=True):
+    """
+    Load a snapshot saved with save_snapshot.
+
+    Parameters
+    ----------
+    f : str
+        path of the snapshot, without extension.
+    files : list of str
+        input files the snapshot is keyed on. If the files are not the files
+        the snapshot was saved with, or if any of the files has changed
+        since the snapshot was saved, None is returned. If None, the files
+        stored in the snapshot are checked. (default is None)
+    mmap : bool
+        Memory map the arrays (copy-on-write) instead of reading them.
+        (default is True)
+
+    Returns
+    -------
+    obj : object
+        the flopy object, or None if there is no valid snapshot
+
+    """
+    fjson, fdata = _snapshot_files(f)
+    if not os.path.isfile(fjson) or not os.path.isfile(fdata):
+        return None
+    fj = open(fjson, 'r')
+    try:
+        manifest = json.load(fj)
+    except ValueError:
+        return None
+    finally:
+        fj.close()
+    if manifest.get('version') != _version:
+        return None
+    fp = manifest['fingerprint']
+    if files is None:
+        files = [item[0] for item in fp]
+    if fingerprint(files) != fp:
+        return None
+    try:
+        fd = open(fdata, 'rb')
+    except IOError:
+        return None
+    try:
+        # the data file may have been replaced by a newer snapshot after
+        # the manifest was read
+        header = _header(manifest['token'])
+        if fd.read(len(header)) != header:
+            return None
+        decoder = _Decoder(manifest, fd, mmap=mmap)
+        obj = decoder.decode(manifest['root'])
+    finally:
+        fd.close()
+    return obj
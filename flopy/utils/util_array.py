@@ -9,13 +9,21 @@ from __future__ import division, print_function
 # from future.utils import with_metaclass
 
 import os
+import re
 import shutil
+import hashlib
 import copy
 import numbers
+import warnings
 import numpy as np
 from ..utils.binaryfile import BinaryHeader
 from ..utils.flopy_io import line_parse
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 
 class ArrayFormat(object):
     """
@@ -472,6 +480,9 @@ class Util3d(object):
     ----------
     array : np.ndarray
         the array representation of the 3-D object
+    array_view : np.ndarray
+        read-only view of the array representation of the 3-D object, built
+        once and reset when a layer, value or cnstnt is assigned
 
 
     Methods
@@ -490,6 +501,10 @@ class Util3d(object):
     --------
 
     """
+    # contiguous (nlay, nrow, ncol) array of which the layers are views
+    _buffer = None
+    # cached layer views and read-only array
+    _array_view_cache = None
 
     def __init__(self, model, shape, dtype, value, name,
                  fmtin=None, cnstnt=1.0, iprn=-1, locat=None,
@@ -555,6 +570,7 @@ class Util3d(object):
             assert k in range(0, self.shape[
                 0]), "Util3d error: k not in range nlay"
             self.util_2ds[k] = new_u2d(self.util_2ds[k], value)
+            self._array_view_cache = None
         else:
             raise NotImplementedError(
                 "Util3d doesn't support setitem indices" + str(k))
@@ -564,6 +580,7 @@ class Util3d(object):
             # set the cnstnt for each u2d
             for u2d in self.util_2ds:
                 u2d.cnstnt = value
+            super(Util3d, self).__setattr__("_array_view_cache", None)
         elif hasattr(self, "util_2ds") and key == "fmtin":
             for u2d in self.util_2ds:
                 u2d.format = ArrayFormat(u2d, fortran=value,
@@ -719,7 +736,11 @@ class Util3d(object):
                 np.issubdtype(getattr(k, 'dtype', None), np.integer)):
             return self.util_2ds[k]
         elif len(k) == 3:
-            return self.array[k[0], k[1], k[2]]
+            # index the read-only view and only copy the selected values
+            item = self.array_view[k[0], k[1], k[2]]
+            if isinstance(item, np.ndarray):
+                item = item.copy()
+            return item
         else:
             raise Exception("Util3d error: unsupported indices:" + str(k))
 
@@ -760,6 +781,81 @@ class Util3d(object):
                 istart = istop
         return a
 
+    @property
+    def array_view(self):
+        """
+        Get a read-only view of the array representation of the 3-D object
+        with the effects of the control record multipliers applied.
+
+        If the layers are views of a single contiguous 3-D array without
+        multipliers, a view of that array is returned, changes made in
+        place to the layers are seen by the view. Otherwise the array is
+        built once from the layer views and reused until a layer, value or
+        cnstnt is assigned.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            read-only array with the multipliers applied.
+
+        """
+        views = [u2d.array_view for u2d in self.util_2ds]
+        if self._array_view_cache is not None:
+            cached_views, a = self._array_view_cache
+            if len(cached_views) == len(views) and \
+                    all(v1 is v2 for v1, v2 in zip(cached_views, views)):
+                return a
+        a = None
+        buf = self._buffer
+        if buf is not None and len(views) == buf.shape[0]:
+            # check if the layers are views of the 3-D array
+            if all(v.ctypes.data == buf[k].ctypes.data and
+                   v.strides == buf[k].strides
+                   for k, v in enumerate(views)):
+                a = buf.view()
+        if a is None:
+            nlay, nrow, ncol = self.shape
+            if nrow is not None:
+                a = np.empty(self.shape, dtype=self.dtype)
+                for k, v in enumerate(views):
+                    a[k] = v
+            else:
+                a = np.concatenate([v.ravel() for v in views]).astype(
+                    self.dtype)
+        a.flags.writeable = False
+        self._array_view_cache = (views, a)
+        return a
+
+    def __getstate__(self):
+        # the cached read-only array is not part of the state
+        state = self.__dict__.copy()
+        state.pop('_array_view_cache', None)
+        return state
+
+    def _share_layers(self, u2ds):
+        """
+        store the arrays of the layers in a single contiguous 3-D array, the
+        layers become views of this array. Only done if all the layers are
+        arrays of the same shape and type.
+        """
+        nlay, nrow, ncol = self.shape
+        if nrow is None or len(u2ds) != nlay or nlay == 0 or \
+                len(set([id(u2d) for u2d in u2ds])) != nlay:
+            return None
+        for u2d in u2ds:
+            if u2d.vtype != np.ndarray or u2d.dtype != self.dtype or \
+                    tuple(u2d.shape) != (nrow, ncol):
+                return None
+        buf = np.empty(self.shape, dtype=self.dtype)
+        for k, u2d in enumerate(u2ds):
+            buf[k] = u2d._array
+        array_pool = getattr(self.model, 'array_pool', None)
+        if array_pool is not None:
+            buf = array_pool.intern(buf)
+        for k, u2d in enumerate(u2ds):
+            u2d._Util2d__value = buf[k]
+        return buf
+
     def build_2d_instances(self):
         u2ds = []
         # if value is not enumerable, then make a list of something
@@ -813,6 +909,15 @@ class Util3d(object):
                                     'value.shape[[1,2]] != self.shape[[1,2]]' +
                                     str(self.__value.shape) + ' ' + str(
                         self.shape))
+            else:
+                # store the layers in a single contiguous array, the layers
+                # are views of this array
+                self.__value = np.ascontiguousarray(self.__value,
+                                                    dtype=self.dtype)
+                array_pool = getattr(self.model, 'array_pool', None)
+                if array_pool is not None:
+                    self.__value = array_pool.intern(self.__value)
+                self._buffer = self.__value
             for i, a in enumerate(self.__value):
                 a = np.atleast_2d(a)
                 ext_filename = None
@@ -830,6 +935,8 @@ class Util3d(object):
         else:
             raise Exception('util_array_3d: value attribute must be list ' +
                             ' or ndarray, not' + str(type(self.__value)))
+        if self._buffer is None:
+            self._buffer = self._share_layers(u2ds)
         return u2ds
 
     @staticmethod
@@ -853,6 +960,112 @@ class Util3d(object):
         u3d = Util3d(model, shape, dtype, u2ds, name)
         return u3d
 
+    @staticmethod
+    def load_species(f_handle, model, shape, dtype, names,
+                     ext_unit_dict=None, array_format=None):
+        """
+        Load the arrays of several species (for example the SCONC arrays of
+        the MT3D BTN package) that follow each other in a file.
+
+        The control records are read in one pass through the file. The
+        values of the internal free format arrays are only collected during
+        this pass and are converted together by numpy in one call, instead
+        of one conversion per layer and species.
+
+        Parameters
+        ----------
+        f_handle : file handle
+            file positioned at the control record of the array of the first
+            species
+        model : model object
+        shape : tuple
+            (nlay, nrow, ncol) for Util3d arrays or (nrow, ncol) for Util2d
+            arrays
+        dtype : numpy dtype
+        names : list of str
+            names of the arrays, one per species
+        ext_unit_dict : dict
+            external unit dictionary (see flopy.utils.mfreadnam)
+        array_format : str
+            array control record format (e.g. "mt3d")
+
+        Returns
+        -------
+        arrays : list of Util3d or Util2d instances
+            arrays in the order of names
+
+        """
+        if len(shape) == 3:
+            nlay, nrow, ncol = shape
+            layers = []
+            for k in range(nlay):
+                if nrow is None:
+                    layers.append(('_Layer_{0}'.format(k), (1, ncol[k])))
+                else:
+                    layers.append(('_Layer_{0}'.format(k), (nrow, ncol)))
+        else:
+            layers = [('', tuple(shape))]
+        bulk = np.dtype(dtype).kind in 'iuf'
+
+        # the layer arrays of all the species in the order of the file.
+        # internal free format arrays are converted after the pass
+        u2ds, pending = [], []
+        for name in names:
+            if model.verbose:
+                print('   loading {}...'.format(name))
+            for suffix, u2d_shape in layers:
+                if u2d_shape == (0, 0):
+                    raise IndexError('No information on model grid '
+                                     'dimensions. Need nrow, ncol to load '
+                                     'a Util2d array.')
+                cr_dict = Util2d._read_control_record(f_handle, dtype,
+                                                      ext_unit_dict,
+                                                      array_format)
+                if bulk and cr_dict['type'] == 'internal' and \
+                        ArrayFormat.decode_fortran_descriptor(
+                            cr_dict['fmtin'])[0] == 'free':
+                    n = u2d_shape[0] * u2d_shape[1]
+                    lines, block, repeat = Util2d._scan_txt_free(n, f_handle)
+                    pending.append((len(u2ds), name + suffix, u2d_shape,
+                                    cr_dict, lines, block, repeat))
+                    u2ds.append(None)
+                else:
+                    u2ds.append(Util2d._load_array(f_handle, model,
+                                                   u2d_shape, dtype,
+                                                   name + suffix, cr_dict,
+                                                   ext_unit_dict=ext_unit_dict))
+
+        # convert the values of the collected arrays in one call
+        values = None
+        simple = [p for p in pending if p[5] is not None and not p[6]]
+        if simple:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                values = np.fromstring(' '.join([' '.join(p[5])
+                                                 for p in simple]),
+                                       dtype=dtype, sep=' ')
+            if values.shape[0] != sum([p[2][0] * p[2][1] for p in simple]):
+                values = None
+        istart = 0
+        for idx, u2d_name, u2d_shape, cr_dict, lines, block, repeat in \
+                pending:
+            n = u2d_shape[0] * u2d_shape[1]
+            if values is not None and block is not None and not repeat:
+                data = values[istart:istart + n].reshape(u2d_shape)
+                istart += n
+            else:
+                data = Util2d.load_txt(u2d_shape, StringIO(''.join(lines)),
+                                       dtype, cr_dict['fmtin'])
+            u2ds[idx] = Util2d(model, u2d_shape, dtype, data, name=u2d_name,
+                               iprn=cr_dict['iprn'], fmtin="(FREE)",
+                               cnstnt=cr_dict['cnstnt'], locat=None)
+
+        if len(shape) == 2:
+            return u2ds
+        nlay = len(layers)
+        return [Util3d(model, shape, dtype, u2ds[i * nlay:(i + 1) * nlay],
+                       name) for i, name in enumerate(names)]
+
     def __mul__(self, other):
         if np.isscalar(other):
             new_u2ds = []
@@ -1134,6 +1347,11 @@ class Transient2d(object):
     bin : bool
         flag to control writing external arrays as binary (optional)
         (the default is False)
+    compact : bool
+        flag to store the transient sequence compactly (optional): a stress
+        period with the same value as the previous entry reuses the
+        previous array (itmp = -1) and arrays with the same value in every
+        cell are stored as constants. (the default is False)
 
     Attributes
     ----------
@@ -1161,7 +1379,7 @@ class Transient2d(object):
 
     def __init__(self, model, shape, dtype, value, name, fmtin=None,
                  cnstnt=1.0, iprn=-1, ext_filename=None, locat=None,
-                 bin=False,array_free_format=None):
+                 bin=False,array_free_format=None, compact=False):
 
         if isinstance(value, Transient2d):
             for attr in value.__dict__.items():
@@ -1195,6 +1413,7 @@ class Transient2d(object):
         self.iprn = iprn
         self.locat = locat
         self.array_free_format = array_free_format
+        self.compact = compact
         if model.external_path is not None:
             self.ext_filename_base = \
                 os.path.join(model.external_path,
@@ -1207,8 +1426,17 @@ class Transient2d(object):
     @staticmethod
     def masked4d_array_to_kper_dict(m4d):
         assert m4d.ndim == 4
+        if isinstance(m4d, Transient4dView):
+            # only the stress periods where the array changes
+            kper_index = m4d.kper_index
+            kpers = [kper for kper in range(len(kper_index))
+                     if kper == 0 or kper_index[kper] != kper_index[kper - 1]]
+            arrays = [m4d.arrays[kper_index[kper]] for kper in kpers]
+        else:
+            kpers = range(m4d.shape[0])
+            arrays = m4d
         kper_dict = {}
-        for kper, arr in enumerate(m4d):
+        for kper, arr in zip(kpers, arrays):
             if np.all(np.isnan(arr)):
                 continue
             elif np.any(np.isnan(arr)):
@@ -1224,7 +1452,7 @@ class Transient2d(object):
         ----------
             model : flopy.mbase derived type
             pak_name : str package name (e.g. RCH)
-            m4ds : dict(name,(masked) 4d numpy.ndarray)
+            m4ds : dict(name,(masked) 4d numpy.ndarray or Transient4dView)
                 each ndarray must have shape (nper,1,nrow,ncol).
                 if an entire (nrow,ncol) slice is np.NaN, then
                 that kper is skipped.
@@ -1244,11 +1472,12 @@ class Transient2d(object):
         assert m4d.shape[1] == 1
         assert m4d.shape[2] == model.nrow
         assert m4d.shape[3] == model.ncol
-        m4d = m4d.astype(np.float32)
+        if not isinstance(m4d, Transient4dView):
+            m4d = m4d.astype(np.float32)
         kper_dict = Transient2d.masked4d_array_to_kper_dict(m4d)
         return cls(model=model, shape=(model.nrow, model.ncol),
                    value=kper_dict,
-                   dtype=m4d.dtype.type, name=name)
+                   dtype=np.float32, name=name)
 
     def __setattr__(self, key, value):
         if hasattr(self, "transient_2ds") and key == "cnstnt":
@@ -1461,11 +1690,67 @@ class Transient2d(object):
     def array(self):
         arr = np.zeros((self.model.nper, 1, self.shape[0], self.shape[1]),
                        dtype=self.dtype)
-        for kper in range(self.model.nper):
-            u2d = self[kper]
-            arr[kper, 0, :, :] = u2d.array
+        kper_index, arrays = self.get_compact()
+        for kper, idx in enumerate(kper_index):
+            arr[kper, 0, :, :] = arrays[idx]
         return arr
 
+    @property
+    def array_view(self):
+        """
+        Read-only view of the transient arrays with the shape of
+        Transient2d.array, (nper, 1, nrow, ncol). Only the distinct arrays
+        are stored, stress periods that reuse an array refer to the same
+        array and constant arrays are broadcast from a scalar.
+
+        Returns
+        -------
+        view : Transient4dView
+
+        """
+        kper_index, arrays = self.get_compact()
+        return Transient4dView(kper_index, arrays, (1,) + tuple(self.shape),
+                               self.dtype)
+
+    def get_compact(self):
+        """
+        Get a compact representation of the transient arrays: the distinct
+        arrays and the array of each stress period.
+
+        Returns
+        -------
+        kper_index : np.ndarray of ints, shape (nper,)
+            index in arrays of the array of each stress period
+        arrays : list of read-only np.ndarrays of shape (nrow, ncol)
+            distinct arrays with the multiplier applied. Constant arrays
+            are read-only broadcast views of a scalar.
+
+        """
+        nper = self.model.nper
+        kpers = sorted(self.transient_2ds.keys())
+        kper_index = np.zeros(nper, dtype=np.int)
+        arrays = []
+        indices = {}
+        ikey = -1
+        for kper in range(nper):
+            while ikey + 1 < len(kpers) and kpers[ikey + 1] <= kper:
+                ikey += 1
+            if ikey < 0:
+                # stress periods before the first entry are zero
+                u2d = None
+            else:
+                u2d = self.transient_2ds[kpers[ikey]]
+            if id(u2d) not in indices:
+                indices[id(u2d)] = len(arrays)
+                if u2d is None:
+                    a = np.broadcast_to(np.zeros((), dtype=self.dtype),
+                                        self.shape)
+                else:
+                    a = u2d.array_view
+                arrays.append(a)
+            kper_index[kper] = indices[id(u2d)]
+        return kper_index, arrays
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.transient2d_helper(f, self, **kwargs)
@@ -1489,7 +1774,7 @@ class Transient2d(object):
 
         # a dict keyed on kper (zero-based)
         if isinstance(self.__value, dict):
-            tran_seq = {}
+            values = {}
             for key, val in self.__value.items():
                 try:
                     key = int(key)
@@ -1499,6 +1784,18 @@ class Transient2d(object):
                 if key < 0:
                     raise Exception("Transient2d error: key can't be " +
                                     " negative: " + str(key))
+                values[key] = val
+            tran_seq = {}
+            last = None
+            for key in sorted(values.keys()):
+                val = values[key]
+                if self.compact:
+                    val = self._compact_value(val)
+                    # a stress period with the same value as the previous
+                    # entry reuses the previous array (itmp = -1)
+                    if last is not None and self._is_same_value(val, last):
+                        continue
+                    last = val
                 try:
                     u2d = self.__get_2d_instance(key, val)
                 except Exception as e:
@@ -1529,6 +1826,34 @@ class Transient2d(object):
             raise Exception("Transient2d error: value type not " +
                             " recognized: " + str(type(self.__value)))
 
+    @staticmethod
+    def _is_same_value(value, other):
+        """
+        check if two values of the transient sequence are the same
+        """
+        if value is other:
+            return True
+        elif isinstance(value, np.ndarray) and isinstance(other, np.ndarray):
+            return value.shape == other.shape and \
+                   np.array_equal(value, other)
+        elif np.isscalar(value) and np.isscalar(other):
+            return type(value) == type(other) and value == other
+        return False
+
+    def _compact_value(self, value):
+        """
+        replace an array with the same value in every cell with the
+        (scalar) value
+        """
+        if isinstance(value, np.ndarray) and value.size > 0 and \
+                value.shape[-2:] == tuple(self.shape) and \
+                value.size == self.shape[0] * self.shape[1] and \
+                self.dtype in [np.int, np.float32]:
+            v = value.flat[0]
+            if np.all(value == v):
+                return v
+        return value
+
     def __get_2d_instance(self, kper, arg):
         """
         parse an argument into a Util2d instance
@@ -1544,6 +1869,87 @@ class Transient2d(object):
         return u2d
 
 
+class Transient4dView(object):
+    """
+    Read-only view of transient arrays with the shape (nper, nlay, nrow,
+    ncol) that only stores the distinct arrays and the index of the array
+    of each stress period.
+
+    Parameters
+    ----------
+    kper_index : np.ndarray of ints
+        index in arrays of the array of each stress period
+    arrays : list of np.ndarrays
+        distinct arrays of each stress period
+    shape : length 3 tuple
+        shape of the array of a stress period, (1, nrow, ncol) for
+        Transient2d and (nlay, nrow, ncol) for MfList instances
+    dtype : np.dtype
+        the type of the data
+
+    Attributes
+    ----------
+    shape : tuple
+        (nper, nlay, nrow, ncol)
+
+    Examples
+    --------
+
+    >>> view = ml.rch.rech.array_view
+    >>> view[10, 0, 5, 5]
+    >>> view[10].sum()
+
+    """
+
+    def __init__(self, kper_index, arrays, shape, dtype):
+        self.kper_index = np.asarray(kper_index)
+        self.arrays = [a.reshape(shape) for a in arrays]
+        self.shape = (len(kper_index),) + tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+    @property
+    def ndim(self):
+        return 4
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __iter__(self):
+        for kper in range(self.shape[0]):
+            yield self[kper]
+
+    def __getitem__(self, item):
+        if not isinstance(item, tuple):
+            item = (item,)
+        kper, item = item[0], item[1:]
+        if isinstance(kper, (int, np.integer)):
+            # a stress period, a read-only view of the array
+            a = self.arrays[self.kper_index[kper]]
+            return a[item] if item else a
+        # several stress periods
+        kper_index = self.kper_index[kper]
+        a = np.array([self.arrays[idx] for idx in kper_index],
+                     dtype=self.dtype).reshape((len(kper_index),) +
+                                               self.shape[1:])
+        return a[(slice(None),) + item] if item else a
+
+    def __array__(self, dtype=None):
+        a = np.empty(self.shape, dtype=self.dtype)
+        for kper, idx in enumerate(self.kper_index):
+            a[kper] = self.arrays[idx]
+        if dtype is not None:
+            a = a.astype(dtype)
+        return a
+
+    def __repr__(self):
+        return 'Transient4dView: shape {}, {} distinct arrays'.format(
+            self.shape, len(self.arrays))
+
+
 class Util2d(object):
     """
     Util2d class for handling 2-D model arrays
@@ -1587,6 +1993,9 @@ class Util2d(object):
     ----------
     array : np.ndarray
         the array representation of the 2-D object
+    array_view : np.ndarray
+        read-only view of the array representation of the 2-D object, built
+        once and reset when value or cnstnt is assigned
     how : str
         the str flag to control how the array is written to the model
         input files e.g. "constant","internal","external","openclose"
@@ -1625,6 +2034,8 @@ class Util2d(object):
     --------
 
     """
+    # cached read-only array, reset when value or cnstnt is assigned
+    _array_view = None
 
     def __init__(self, model, shape, dtype, value, name, fmtin=None,
                  cnstnt=1.0, iprn=-1, ext_filename=None, locat=None, bin=False,
@@ -1878,13 +2289,15 @@ class Util2d(object):
         return True
 
     def __getitem__(self, k):
+        # index the read-only view and only copy the selected values
+        a = self.array_view
         if isinstance(k, int):
             if len(self.shape) == 1:
-                return self.array[k]
+                item = a[k]
             elif self.shape[0] == 1:
-                return self.array[0, k]
+                item = a[0, k]
             elif self.shape[1] == 1:
-                return self.array[k, 0]
+                item = a[k, 0]
             else:
                 raise Exception(
                     "Util2d.__getitem__() error: an integer was passed, " +
@@ -1892,11 +2305,16 @@ class Util2d(object):
         else:
             if isinstance(k, tuple):
                 if len(k) == 2:
-                    return self.array[k[0], k[1]]
-                if len(k) == 1:
-                    return self.array[k]
+                    item = a[k[0], k[1]]
+                elif len(k) == 1:
+                    item = a[k]
+                else:
+                    return None
             else:
-                return self.array[(k,)]
+                item = a[(k,)]
+        if isinstance(item, np.ndarray):
+            item = item.copy()
+        return item
 
     def __setitem__(self, k, value):
         """
@@ -1919,6 +2337,10 @@ class Util2d(object):
             value = value.lower()
             assert value in self._acceptable_hows
             self._how = value
+        elif key in ["cnstnt", "_Util2d__value", "_Util2d__value_built"]:
+            # reset the cached read-only array
+            super(Util2d, self).__setattr__(key, value)
+            super(Util2d, self).__setattr__("_array_view", None)
         else:
             super(Util2d, self).__setattr__(key, value)
 
@@ -2115,16 +2537,10 @@ class Util2d(object):
 
             # write a file if needed
             if self.vtype != str:
-                if self.format.binary:
-                    self.write_bin(self.shape, self.python_file_path,
-                                   self._array,
-                                   bintype="head")
-                else:
-                    self.write_txt(self.shape, self.python_file_path,
-                                   self._array,
-                                   fortran_format=self.format.fortran)
+                self._write_external_file()
 
-            elif self.__value != self.python_file_path:
+            elif os.path.abspath(self.__value) != \
+                    os.path.abspath(self.python_file_path):
                 if os.path.exists(self.python_file_path):
                     # if the file already exists, remove it
                     if self.model.verbose:
@@ -2164,6 +2580,31 @@ class Util2d(object):
             raise Exception("Util2d.get_file_entry() error: " + \
                             "unrecognized 'how':{0}".format(how))
 
+    def _write_external_file(self):
+        """
+        write the array to the external file. If the model is written
+        with write_input(incremental=True), the file is only written if
+        the array or the format changed since the file was last written.
+        """
+        incremental = getattr(self.model, '_incremental_write', False)
+        if incremental:
+            h = hashlib.md5()
+            h.update(repr((self.format.fortran, self.shape)).encode())
+            h.update(np.ascontiguousarray(self._array).view(np.uint8).data)
+            content_hash = h.hexdigest()
+            if self.model.is_written(self.python_file_path, content_hash):
+                return
+        if self.format.binary:
+            self.write_bin(self.shape, self.python_file_path,
+                           self._array,
+                           bintype="head")
+        else:
+            self.write_txt(self.shape, self.python_file_path,
+                           self._array,
+                           fortran_format=self.format.fortran)
+        if incremental:
+            self.model.set_written(self.python_file_path, content_hash)
+
     @property
     def string(self):
         """
@@ -2210,6 +2651,53 @@ class Util2d(object):
         # multiplied
         return (self._array * cnstnt).astype(self.dtype)
 
+    @property
+    def array_view(self):
+        """
+        Get a read-only view of the array representation of value attribute
+        with the effects of the control record multiplier applied.
+
+        The view is built once and reused until value or cnstnt is
+        assigned. Arrays without a multiplier are not copied, so changes
+        made in place to the array are seen by the view. The array of a
+        constant is a broadcast view of the constant and an array with a
+        multiplier is multiplied once, changes made in place to these
+        arrays are only seen by .array.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            read-only array with the multiplier applied.
+
+        Note
+        ----
+            use .array to get a copy of the array that can be modified.
+
+        """
+        if self._array_view is None:
+            if isinstance(self.cnstnt, str):
+                a = self.array
+            else:
+                cnstnt = self.cnstnt
+                if not isinstance(cnstnt, int) and cnstnt == 0.0:
+                    cnstnt = 1.0
+                if self.vtype not in [str, np.ndarray]:
+                    value = np.array(self.__value * cnstnt).astype(self.dtype)
+                    a = np.broadcast_to(value, self.shape)
+                elif cnstnt == 1 and self._array.dtype == self.dtype:
+                    a = self._array.view()
+                else:
+                    a = (self._array * cnstnt).astype(self.dtype)
+            a.flags.writeable = False
+            self._array_view = a
+        return self._array_view
+
+    def __getstate__(self):
+        # the cached read-only array is not part of the state
+        state = self.__dict__.copy()
+        state.pop('_array_view', None)
+        return state
+
     @property
     def _array(self):
         """
@@ -2223,13 +2711,18 @@ class Util2d(object):
         """
         if self.vtype == str:
             if self.__value_built is None:
-                file_in = open(self.__value, 'r')
+                if self.format.binary:
+                    file_in = open(self.__value, 'rb')
+                else:
+                    file_in = open(self.__value, 'r')
 
                 if self.format.binary:
+                    mmap = getattr(self.model, 'mmap_load', False)
                     header, self.__value_built = Util2d.load_bin(self.shape,
                                                                  file_in,
                                                                  self.dtype,
-                                                                 bintype="head")
+                                                                 bintype="head",
+                                                                 mmap=mmap)
                 else:
                     self.__value_built = Util2d.load_txt(self.shape, file_in,
                                                          self.dtype,
@@ -2264,12 +2757,10 @@ class Util2d(object):
         for n in range(nblock):
             line = file_in.readline()
             raw = line.strip('\n').split()
-            i1, i2, j1, j2, v = int(raw[0])-1, int(raw[1])-1, \
-                                int(raw[2])-1, int(raw[3])-1, \
+            i1, i2, j1, j2, v = int(raw[0])-1, int(raw[1]), \
+                                int(raw[2])-1, int(raw[3]), \
                                 dtype(raw[4])
-            for j in range(j1, j2+1):
-                for i in range(i1, i2+1):
-                    data[i, j] = v
+            data[i1:i2, j1:j2] = v
         if np.isnan(np.sum(data)):
             raise Exception("Util2d.load_block() error: np.NaN in data array")
         return data
@@ -2283,6 +2774,143 @@ class Util2d(object):
         made static to support the load functionality 
         this routine now supports fixed format arrays where the numbers
         may touch.
+        the lines holding the array are read as a block and converted
+        by numpy in one call; lines that can not be converted this way are
+        parsed by the token-by-token _load_txt_fallback().
+        """
+        nrow, ncol = shape
+        npl, fmt, width, decimal = ArrayFormat.decode_fortran_descriptor(fmtin)
+        if not hasattr(file_in, 'read'):
+            file_in = open(file_in, 'r')
+        if npl == 'free':
+            lines, data = Util2d._read_txt_free(nrow * ncol, file_in, dtype)
+        else:
+            lines, data = Util2d._read_txt_fixed(nrow * ncol, file_in, dtype,
+                                                 npl, width)
+        if data is None:
+            data = Util2d._load_txt_fallback(shape, StringIO(''.join(lines)),
+                                             dtype, fmtin)
+        return data.reshape(nrow, ncol)
+
+    @staticmethod
+    def _scan_txt_free(n, file_in):
+        """
+        read the lines holding n free format values from file_in without
+        converting them.  Returns the lines read, the lines holding only the
+        values of the array (or None if the number of values could not be
+        counted) and a flag for n*value repeat tokens.
+        """
+        lines, block = [], []
+        repeat = False
+        count = 0
+        while count < n:
+            line = file_in.readline()
+            if line in [None, '']:
+                break
+            lines.append(line)
+            if ',' in line:
+                line = line.replace(',', ' ')
+            raw = line.split()
+            if '*' in line:
+                repeat = True
+                try:
+                    count += sum([int(t.split('*')[0]) if '*' in t else 1
+                                  for t in raw])
+                except ValueError:
+                    return lines, None, repeat
+            elif count + len(raw) > n:
+                # only the values needed to complete the array
+                line = ' '.join(raw[:n - count])
+                count = n
+            else:
+                count += len(raw)
+            block.append(line)
+        if count < n:
+            return lines, None, repeat
+        return lines, block, repeat
+
+    @staticmethod
+    def _read_txt_free(n, file_in, dtype):
+        """
+        read the lines holding n free format values from file_in and
+        convert them in bulk.  Returns the lines read and the values, or
+        None for the values if they could not be converted in bulk.
+        """
+        lines, block, repeat = Util2d._scan_txt_free(n, file_in)
+        if block is None or np.dtype(dtype).kind not in 'iuf':
+            return lines, None
+
+        if repeat:
+            # expand the n*value repeat tokens
+            tokens = np.array(' '.join(block).split())
+            isrep = np.char.find(tokens, '*') >= 0
+            parts = np.char.partition(tokens[isrep], '*')
+            counts = np.ones(tokens.shape[0], dtype=int)
+            counts[isrep] = parts[:, 0].astype(int)
+            tokens[isrep] = parts[:, 2]
+            tokens = np.repeat(tokens, counts)[:n]
+            try:
+                return lines, tokens.astype(dtype)
+            except ValueError:
+                return lines, None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            data = np.fromstring(' '.join(block), dtype=dtype, sep=' ')
+        if data.shape[0] != n:
+            return lines, None
+        return lines, data
+
+    @staticmethod
+    def _read_txt_fixed(n, file_in, dtype, npl, width):
+        """
+        read the lines holding n fixed format values (npl values of the
+        given width per line) from file_in and convert them in bulk by
+        slicing the fields from a fixed-width byte buffer, so that values
+        that touch are separated.  Returns the
+        lines read and the values, or None for the values if they could
+        not be converted in bulk.
+        """
+        linewidth = npl * width
+        lines, block, nvals = [], [], []
+        count = 0
+        while count < n:
+            line = file_in.readline()
+            if line in [None, '']:
+                break
+            lines.append(line)
+            line = line.rstrip('\n')
+            # values end at the first blank field
+            nval = min(npl, -(-len(line.rstrip()) // width))
+            if nval == 0:
+                continue
+            block.append(line[:linewidth].ljust(linewidth))
+            nvals.append(nval)
+            count += nval
+        if count < n or np.dtype(dtype).kind not in 'iuf':
+            return lines, None
+        buf = ''.join(block)
+        if not isinstance(buf, bytes):
+            buf = buf.encode('ascii', 'replace')
+        # one row of bytes per field, followed by a separating blank
+        fields = np.frombuffer(buf, dtype=np.uint8).reshape(-1, width)
+        mask = np.arange(npl) < np.array(nvals)[:, np.newaxis]
+        fields = fields[mask.ravel()][:n]
+        sep = np.empty((n, width + 1), dtype=np.uint8)
+        sep[:, :width] = fields
+        sep[:, width] = ord(' ')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            data = np.fromstring(sep.tobytes(), dtype=dtype, sep=' ')
+        if data.shape[0] != n:
+            return lines, None
+        return lines, data
+
+    @staticmethod
+    def _load_txt_fallback(shape, file_in, dtype, fmtin):
+        """
+        token-by-token version of load_txt(), used when the values can not
+        be converted in bulk by numpy.
         """
         # file_in = open(self.__value,'r')
         # file_in = open(filename,'r')
@@ -2358,16 +2986,34 @@ class Util2d(object):
     @staticmethod
     def write_txt(shape, file_out, data, fortran_format="(FREE)",
                   python_format=None):
-        if fortran_format.upper() == '(FREE)' and python_format is None:
-            np.savetxt(file_out, data,
-                       ArrayFormat.get_default_numpy_fmt(data.dtype),
-                       delimiter='')
-            return
+        opened = False
         if not hasattr(file_out, "write"):
             file_out = open(file_out, 'w')
-        file_out.write(
-            Util2d.array2string(shape, data, fortran_format=fortran_format,
-                                python_format=python_format))
+            opened = True
+        if fortran_format.upper() == '(FREE)' and python_format is None:
+            # one row of the array per line, as np.savetxt
+            fmt = ArrayFormat.get_default_numpy_fmt(data.dtype)
+            if data.ndim == 1:
+                data = data.reshape(-1, 1)
+            nrow, ncol = data.shape
+            row_fmt = fmt * ncol + '\n'
+            nblock = Util2d._get_block_rows(ncol)
+            for i0 in range(0, nrow, nblock):
+                block = data[i0:i0 + nblock]
+                file_out.write((row_fmt * block.shape[0]) %
+                               tuple(block.ravel().tolist()))
+        else:
+            file_out.write(
+                Util2d.array2string(shape, data,
+                                    fortran_format=fortran_format,
+                                    python_format=python_format))
+        if opened:
+            file_out.close()
+
+    @staticmethod
+    def _get_block_rows(ncol, nvalues=1000000):
+        # number of rows that are formatted at a time
+        return max(1, nvalues // max(1, ncol))
 
     @staticmethod
     def array2string(shape, data, fortran_format="(FREE)",
@@ -2379,6 +3025,9 @@ class Util2d(object):
         made static to support the load functionality
         this routine now supports fixed format arrays where the numbers
         may touch.
+
+        The rows of the array are formatted in blocks using a single
+        format string for all of the values in a block.
         """
         if len(shape) == 2:
             nrow, ncol = shape
@@ -2386,6 +3035,42 @@ class Util2d(object):
             nrow = 1
             ncol = shape[0]
         data = np.atleast_2d(data)
+        column_length, output_fmt = Util2d._get_output_format(fortran_format,
+                                                              python_format)
+        values = data[:nrow, :ncol]
+        # format string for one row with the line breaks of the wrapped
+        # format, the value index is removed from the format of each value
+        value_fmt = re.sub(r'{0(?=[:!}])', '{', output_fmt)
+        if values.shape != (nrow, ncol) or value_fmt.count('{') != 1:
+            return Util2d._array2string_loop(nrow, ncol, data, column_length,
+                                             output_fmt)
+        row_fmt = []
+        for j in range(ncol):
+            row_fmt.append(value_fmt)
+            if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
+                row_fmt.append('\n')
+        if ncol % column_length != 0:
+            row_fmt.append('\n')
+        row_fmt = ''.join(row_fmt)
+        nblock = Util2d._get_block_rows(ncol)
+        s = []
+        try:
+            for i0 in range(0, nrow, nblock):
+                block = values[i0:i0 + nblock]
+                s.append((row_fmt * block.shape[0]).format(
+                    *block.ravel().tolist()))
+        except Exception:
+            # find and report the value that could not be formatted
+            return Util2d._array2string_loop(nrow, ncol, data, column_length,
+                                             output_fmt)
+        return ''.join(s)
+
+    @staticmethod
+    def _get_output_format(fortran_format="(FREE)", python_format=None):
+        """
+        return the number of values per line and the python format of a
+        value from a fortran format descriptor or a python format.
+        """
         if python_format is None:
             column_length, fmt, width, decimal = \
                 ArrayFormat.decode_fortran_descriptor(fortran_format)
@@ -2405,29 +3090,62 @@ class Util2d(object):
                                 + '  python_format should be a list with\n'
                                 + '   [column_length, fmt]\n'
                                 + '    e.g., [10, {0:10.2e}]')
+        return column_length, output_fmt
+
+    @staticmethod
+    def _array2string_loop(nrow, ncol, data, column_length, output_fmt):
+        """
+        return a string representation of an array, formatting one value
+        at a time.
+        """
         if ncol % column_length == 0:
             linereturnflag = False
         else:
             linereturnflag = True
         # write the array to a string
-        s = ""
+        s = []
         for i in range(nrow):
             icol = 0
             for j in range(ncol):
                 try:
-                    s = s + output_fmt.format(data[i, j])
+                    s.append(output_fmt.format(data[i, j]))
                 except Exception as e:
                     raise Exception("error writing array value" + \
                                     "{0} at r,c [{1},{2}]\n{3}".format(
                                         data[i, j], i, j, str(e)))
                 if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
-                    s += '\n'
+                    s.append('\n')
             if linereturnflag:
-                s += '\n'
-        return s
+                s.append('\n')
+        return ''.join(s)
 
     @staticmethod
-    def load_bin(shape, file_in, dtype, bintype=None):
+    def load_bin(shape, file_in, dtype, bintype=None, mmap=False):
+        """
+        Load an array from a binary file.
+
+        Parameters
+        ----------
+        shape : tuple
+            (nrow, ncol) of the array
+        file_in : file handle
+            binary file open for reading, positioned at the header (or the
+            data if bintype is None). The file is positioned after the data
+            on return.
+        dtype : numpy dtype
+        bintype : str
+            type of the header record (e.g. 'Head'). If None, or if dtype
+            is an integer type, the file does not have a header.
+        mmap : bool
+            map the data into memory instead of reading it (np.memmap).
+            The data are read from the file when they are accessed and the
+            returned array is read-only. (default is False)
+
+        Returns
+        -------
+        header_data, data : numpy.ndarray
+
+        """
         import flopy.utils.binaryfile as bf
         nrow, ncol = shape
         if bintype is not None and not np.issubdtype(dtype, np.int):
@@ -2435,14 +3153,24 @@ class Util2d(object):
             header_data = np.fromfile(file_in, dtype=header_dtype, count=1)
         else:
             header_data = None
-        data = np.fromfile(file_in, dtype=dtype, count=nrow * ncol)
-        data.resize(nrow, ncol)
+        if mmap:
+            offset = file_in.tell()
+            data = np.memmap(file_in, dtype=dtype, mode='r', offset=offset,
+                             shape=(nrow, ncol))
+            file_in.seek(offset + data.nbytes)
+            # a plain ndarray (vtype) that keeps a reference to the map
+            data = data.view(np.ndarray)
+        else:
+            data = np.fromfile(file_in, dtype=dtype, count=nrow * ncol)
+            data.resize(nrow, ncol)
         return [header_data, data]
 
     @staticmethod
     def write_bin(shape, file_out, data, bintype=None, header_data=None):
+        opened = False
         if not hasattr(file_out, 'write'):
             file_out = open(file_out, 'wb')
+            opened = True
         dtype = data.dtype
         if dtype.kind != 'i':
             if bintype is not None:
@@ -2453,6 +3181,8 @@ class Util2d(object):
             if header_data is not None:
                 header_data.tofile(file_out)
         data.tofile(file_out)
+        if opened:
+            file_out.close()
         return
 
     def parse_value(self, value):
@@ -2521,6 +3251,10 @@ class Util2d(object):
                                 str(value.shape))
             if self.dtype != value.dtype:
                 value = value.astype(self.dtype)
+            # share identical arrays between models (copy-on-write)
+            array_pool = getattr(self.model, 'array_pool', None)
+            if array_pool is not None:
+                value = array_pool.intern(value)
             self.__value = value
 
         else:
@@ -2540,14 +3274,30 @@ class Util2d(object):
         if shape == (0, 0):
             raise IndexError('No information on model grid dimensions. '
                              'Need nrow, ncol to load a Util2d array.')
+        cr_dict = Util2d._read_control_record(f_handle, dtype, ext_unit_dict,
+                                              array_format)
+        return Util2d._load_array(f_handle, model, shape, dtype, name,
+                                  cr_dict, ext_unit_dict=ext_unit_dict,
+                                  array_free_format=array_free_format)
+
+    @staticmethod
+    def _read_control_record(f_handle, dtype, ext_unit_dict=None,
+                             array_format="modflow"):
+        """
+        read and parse the array control record at the current position of
+        f_handle
+        """
         curr_unit = None
         if ext_unit_dict is not None:
             # determine the current file's unit number
             cfile = f_handle.name
-            for cunit in ext_unit_dict:
-                if cfile == ext_unit_dict[cunit].filename:
-                    curr_unit = cunit
-                    break
+            if hasattr(ext_unit_dict, 'get_unit'):
+                curr_unit = ext_unit_dict.get_unit(cfile)
+            else:
+                for cunit in ext_unit_dict:
+                    if cfile == ext_unit_dict[cunit].filename:
+                        curr_unit = cunit
+                        break
 
         # Allows for special MT3D array reader
         #array_format = None
@@ -2559,7 +3309,15 @@ class Util2d(object):
                                               dtype=dtype,
                                               ext_unit_dict=ext_unit_dict,
                                               array_format=array_format)
+        return cr_dict
 
+    @staticmethod
+    def _load_array(f_handle, model, shape, dtype, name, cr_dict,
+                    ext_unit_dict=None, array_free_format=None):
+        """
+        load the array described by the parsed control record cr_dict.
+        internal arrays are read from f_handle.
+        """
         if cr_dict['type'] == 'constant':
             u2d = Util2d(model, shape, dtype, cr_dict['cnstnt'], name=name,
                          iprn=cr_dict['iprn'], fmtin="(FREE)",
@@ -2577,6 +3335,17 @@ class Util2d(object):
             # load_txt(shape, file_in, dtype, fmtin):
             assert os.path.exists(fname), "Util2d.load() error: open/close " + \
                                           "file " + str(fname) + " not found"
+            binary = str('binary') in str(cr_dict['fmtin'].lower())
+            if model.lazy_load or (binary and model.mmap_load):
+                # keep the file name, the array is read (or mapped) when it
+                # is requested and the file is copied when the model is
+                # written to another workspace
+                u2d = Util2d(model, shape, dtype, fname, name=name,
+                             iprn=cr_dict['iprn'], cnstnt=cr_dict['cnstnt'],
+                             array_free_format=array_free_format)
+                u2d.format = ArrayFormat(u2d, fortran=cr_dict['fmtin'],
+                                         array_free_format=array_free_format)
+                return u2d
             if str('binary') not in str(cr_dict['fmtin'].lower()):
                 f = open(fname, 'r')
                 data = Util2d.load_txt(shape=shape,
@@ -2602,25 +3371,24 @@ class Util2d(object):
 
         elif cr_dict['type'] == 'external':
             if str('binary') not in str(cr_dict['fmtin'].lower()):
-                assert cr_dict['nunit'] in list(ext_unit_dict.keys())
-                data = Util2d.load_txt(shape,
-                                       ext_unit_dict[
-                                           cr_dict['nunit']].filehandle,
-                                       dtype, cr_dict['fmtin'])
+                assert cr_dict['nunit'] in ext_unit_dict
+                with ext_unit_dict[cr_dict['nunit']].handle() as f:
+                    data = Util2d.load_txt(shape, f, dtype, cr_dict['fmtin'])
             else:
-                if cr_dict['nunit'] not in list(ext_unit_dict.keys()):
+                if cr_dict['nunit'] not in ext_unit_dict:
                     cr_dict["nunit"] *= -1
-                assert cr_dict['nunit'] in list(ext_unit_dict.keys())
-                header_data, data = Util2d.load_bin(
-                    shape, ext_unit_dict[cr_dict['nunit']].filehandle, dtype,
-                    bintype='Head')
+                assert cr_dict['nunit'] in ext_unit_dict
+                with ext_unit_dict[cr_dict['nunit']].handle() as f:
+                    header_data, data = Util2d.load_bin(
+                        shape, f, dtype, bintype='Head',
+                        mmap=model.mmap_load)
             u2d = Util2d(model, shape, dtype, data, name=name,
                          iprn=cr_dict['iprn'], fmtin="(FREE)",
                          cnstnt=cr_dict['cnstnt'],
                          array_free_format=array_free_format)
             # track this unit number so we can remove it from the external
             # file list later
-            model.pop_key_list.append(cr_dict['nunit'])
+            model.add_pop_key_list(cr_dict['nunit'])
         elif cr_dict['type'] == 'block':
             data = Util2d.load_block(shape, f_handle, dtype)
             u2d = Util2d(model, shape, dtype, data, name=name,
@@ -10,8 +10,15 @@ util_list module.  Contains the mflist class.
 from __future__ import division, print_function
 
 import os
+import shutil
 import warnings
 import numpy as np
+from .util_array import Transient4dView
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 
 class MfList(object):
@@ -197,6 +204,11 @@ class MfList(object):
             return None
         # If an external file, have to load it
         if self.__vtype[kper] == str:
+            if self.__binary:
+                # the number of records of a binary file is known from
+                # the file size
+                return os.path.getsize(self.__data[kper]) // \
+                       self.__get_binary_dtype().itemsize
             return self.__fromfile(self.__data[kper]).shape[0]
         if self.__vtype[kper] == np.recarray:
             return self.__data[kper].shape[0]
@@ -532,6 +544,8 @@ class MfList(object):
 
     def __fromfile(self, f):
         # d = np.fromfile(f,dtype=self.dtype,count=count)
+        if self.__binary:
+            return self.__frombinaryfile(f)
         try:
             d = np.genfromtxt(f, dtype=self.dtype)
         except Exception as e:
@@ -539,6 +553,29 @@ class MfList(object):
                             "from file " + str(e))
         return d
 
+    def __get_binary_dtype(self):
+        # dtype of the records of a (BINARY) list file
+        return np.dtype([(name, np.float32) for name in self.dtype.names])
+
+    def __frombinaryfile(self, f):
+        # Read the recarray from the (BINARY) list file f. The file is
+        # mapped into memory (np.memmap) and the records are cast to
+        # self.dtype, the kij indices are converted to zero-based
+        dtype2 = self.__get_binary_dtype()
+        try:
+            if os.path.getsize(f) < dtype2.itemsize:
+                d = np.zeros(0, dtype=dtype2)
+            else:
+                d = np.memmap(f, dtype=dtype2, mode='r')
+            d = np.array(d, dtype=self.dtype).view(np.recarray)
+        except Exception as e:
+            raise Exception("MfList.__fromfile() error reading recarray " + \
+                            "from binary file " + str(e))
+        for idx in ['k', 'i', 'j', 'node']:
+            if idx in d.dtype.names:
+                d[idx] -= 1
+        return d
+
     def get_filenames(self):
         kpers = list(self.data.keys())
         kpers.sort()
@@ -574,11 +611,39 @@ class MfList(object):
     def binary(self):
         return bool(self.__binary)
 
-    def write_transient(self, f, single_per=None):
-        # write the transient sequence described by the data dict
+    @binary.setter
+    def binary(self, binary):
+        self.__binary = bool(binary)
+
+    def write_transient(self, f, single_per=None, dedupe=False, cache=None):
+        """
+        Write the transient sequence described by the data dict.
+
+        Parameters
+        ----------
+        f : file handle
+            open file handle of the package file. The stress period data is
+            written to f, f is not closed.
+        single_per : int or list of ints
+            stress period(s) to write. If None, all stress periods are
+            written. (default is None)
+        dedupe : bool
+            write ITMP=-1 (reuse the data of the previous stress period) for
+            a stress period with the same data as the previous stress
+            period. (default is False)
+        cache : dict
+            The text of a stress period written to f is kept in cache when
+            the next stress period references the same recarray, and is
+            written again without formatting the records. Pass the same
+            dict to write the stress periods with separate calls
+            (single_per). (default is None)
+
+        """
         nr, nc, nl, nper = self.model.get_nrow_ncol_nlay_nper()
         assert hasattr(f, "read"), "MfList.write() error: " + \
                                    "f argument must be a file handle"
+        if cache is None:
+            cache = {}
         kpers = list(self.data.keys())
         kpers.sort()
         first = kpers[0]
@@ -589,6 +654,8 @@ class MfList(object):
                 single_per = [single_per]
             loop_over_kpers = single_per
 
+        # data of the last stress period written as a recarray
+        last_data = None
         for kper in loop_over_kpers:
             # Fill missing early kpers with 0
             if (kper < first):
@@ -611,6 +678,19 @@ class MfList(object):
                 itmp = -1
                 kper_vtype = int
 
+            # reuse the data of the previous stress period
+            if kper_vtype in (np.recarray, str):
+                if dedupe and last_data is not None and \
+                        (kper_data is last_data or
+                         (kper_vtype == np.recarray and
+                          np.array_equal(kper_data, last_data))):
+                    itmp = -1
+                    kper_vtype = int
+                else:
+                    last_data = kper_data
+            elif itmp != -1:
+                last_data = None
+
             f.write(" {0:9d} {1:9d} # stress period {2:d}\n"
                     .format(itmp, 0, kper+1))
 
@@ -621,7 +701,8 @@ class MfList(object):
             if self.__binary:
                 isExternal = True
             if isExternal:
-                if kper_vtype == np.recarray:
+                if kper_vtype == np.recarray or \
+                        (kper_vtype == str and self.__binary):
                     py_filepath = ''
                     if self.model.model_ws is not None:
                         py_filepath = self.model.model_ws
@@ -634,19 +715,28 @@ class MfList(object):
                     if self.model.external_path is not None:
                         model_filepath = os.path.join(self.model.external_path,
                                                       filename)
-                    self.__tofile(py_filepath, kper_data)
+                    if kper_vtype == np.recarray:
+                        self.__tofile(py_filepath, kper_data)
+                    elif os.path.abspath(kper_data) != \
+                            os.path.abspath(py_filepath):
+                        # copy the binary file, the records are not
+                        # decoded and encoded again
+                        shutil.copyfile(kper_data, py_filepath)
                     kper_vtype = str
                     kper_data = model_filepath
 
             if kper_vtype == np.recarray:
-                name = f.name
-                f.close()
-                f = open(name, 'ab+')
-                # print(f)
-                self.__tofile(f, kper_data)
-                f.close()
-                f = open(name, 'a')
-                # print(f)
+                cached = cache.get('records')
+                if cached is not None and cached[0] is kper_data:
+                    f.write(cached[1])
+                elif self.__data.get(kper + 1) is kper_data:
+                    # the next stress period references the same recarray
+                    fs = StringIO()
+                    self.__tofile(fs, kper_data)
+                    cache['records'] = (kper_data, fs.getvalue())
+                    f.write(cache['records'][1])
+                else:
+                    self.__tofile(f, kper_data)
             elif kper_vtype == str:
                 f.write('         open/close ' + kper_data)
                 if self.__binary:
@@ -666,14 +756,26 @@ class MfList(object):
             if idx in lnames:
                 d[idx] += 1
         if self.__binary:
-            dtype2 = []
-            for name in self.dtype.names:
-                dtype2.append((name, np.float32))
-            dtype2 = np.dtype(dtype2)
-            d = np.array(d, dtype=dtype2)
+            d = np.array(d, dtype=self.__get_binary_dtype())
             d.tofile(f)
+        elif isinstance(f, str):
+            fo = open(f, 'w')
+            self.__write_records(fo, d)
+            fo.close()
         else:
-            np.savetxt(f, d, fmt=self.fmt_string, delimiter='')
+            self.__write_records(f, d)
+
+    def __write_records(self, f, d, chunksize=100000):
+        # Write the recarray d to the file handle f with fmt_string. The
+        # records are formatted in blocks of chunksize records with a
+        # single string formatting operation for each block
+        fmt = self.fmt_string + '\n'
+        names = d.dtype.names
+        for i0 in range(0, d.shape[0], chunksize):
+            block = d[i0:i0 + chunksize]
+            columns = [block[name].tolist() for name in names]
+            values = tuple(v for row in zip(*columns) for v in row)
+            f.write((fmt * block.shape[0]) % values)
 
     def check_kij(self):
         names = self.dtype.names
@@ -1001,7 +1103,7 @@ class MfList(object):
             kpers.sort()
             # if this kper is before the first entry,
             # (maybe) mask and return
-            if kper < kpers[0]:
+            if len(kpers) == 0 or kper < kpers[0]:
                 if mask:
                     for name, arr in arrays.items():
                         arrays[name][:] = np.NaN
@@ -1011,6 +1113,9 @@ class MfList(object):
                 kper = self.__find_last_kper(kper)
 
         sarr = self.data[kper]
+        if isinstance(sarr, str):
+            # stress period data in an external file
+            sarr = self[kper]
 
         if np.isscalar(sarr):
             # if there are no entries for this kper
@@ -1022,12 +1127,15 @@ class MfList(object):
             else:
                 raise Exception("MfList: something bad happened")
 
+        # accumulate the records in each cell
+        shape = (self.model.nlay, self.model.nrow, self.model.ncol)
+        node = np.ravel_multi_index((sarr['k'], sarr['i'], sarr['j']), shape)
+        size = self.model.nlay * self.model.nrow * self.model.ncol
+        cnt = np.bincount(node, minlength=size).astype(np.float)
+        cnt = cnt.reshape(shape)
         for name, arr in arrays.items():
-            cnt = np.zeros((self.model.nlay, self.model.nrow, self.model.ncol),
-                           dtype=np.float)
-            for rec in sarr:
-                arr[rec['k'], rec['i'], rec['j']] += rec[name]
-                cnt[rec['k'], rec['i'], rec['j']] += 1.
+            arr = np.bincount(node, weights=sarr[name],
+                              minlength=size).reshape(shape)
             # average keys that should not be added
             if name != 'cond' and name != 'flux':
                 idx = cnt > 0.
@@ -1042,39 +1150,89 @@ class MfList(object):
         #         arrays[name][:] = np.NaN
         return arrays
 
+    def get_compact(self, mask=False):
+        """
+        Get a compact representation of the stress period data as 3-D
+        arrays: the arrays of the distinct stress period entries and the
+        entry of each stress period.
+
+        Parameters
+        ----------
+        mask : boolean
+            return arrays with np.NaN instead of zero
+
+        Returns
+        -------
+        kper_index : np.ndarray of ints, shape (nper,)
+            index in the lists of arrays of the entry of each stress period
+        arrays : dict of lists of read-only numpy.ndarrays
+            3-D arrays (see MfList.to_array) of each distinct stress period
+            entry. The dictonary keys are the MfList dtype names for the
+            stress period data ('cond', 'flux', 'bhead', etc.).
+
+        """
+        kpers = sorted(self.data.keys())
+        kper_index = np.zeros(self.model.nper, dtype=np.int)
+        arrays = {}
+        indices = {}
+        key = None
+        ikey = 0
+        for kper in range(self.model.nper):
+            # find the stress period entry used for this stress period,
+            # skipping entries that reuse the previous entry (-1)
+            while ikey < len(kpers) and kpers[ikey] <= kper:
+                data = self.data[kpers[ikey]]
+                if not isinstance(data, int) or data != -1:
+                    key = kpers[ikey]
+                ikey += 1
+            if key is None or isinstance(self.data[key], int):
+                # no entries before this stress period or no data (0)
+                entry = None
+            else:
+                entry = id(self.data[key])
+            if entry not in indices:
+                indices[entry] = len(indices)
+                if entry is None:
+                    # the arrays of a stress period without data
+                    kper_arrays = self.to_array(kper=-1, mask=mask)
+                else:
+                    kper_arrays = self.to_array(kper=key, mask=mask)
+                for name, arr in kper_arrays.items():
+                    arr = np.asarray(arr)
+                    arr.flags.writeable = False
+                    arrays.setdefault(name, []).append(arr)
+            kper_index[kper] = indices[entry]
+        return kper_index, arrays
+
     @property
-    def masked_4D_arrays(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
+    def masked_4D_arrays_view(self):
+        """
+        Read-only views of the masked 4-D arrays (see
+        MfList.masked_4D_arrays) that only store the arrays of the distinct
+        stress period entries.
 
-        # initialize these big arrays
+        Returns
+        -------
+        out : dict of Transient4dView
+            The dictonary keys are the MfList dtype names for the stress
+            period data ('cond', 'flux', 'bhead', etc.).
+
+        """
+        kper_index, arrays = self.get_compact(mask=True)
+        shape = (self.model.nlay, self.model.nrow, self.model.ncol)
+        return {name: Transient4dView(kper_index, arrs, shape, np.float)
+                for name, arrs in arrays.items()}
+
+    @property
+    def masked_4D_arrays(self):
         m4ds = {}
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            m4ds[name] = m4d
-        for kper in range(1, self.model.nper):
-            arrays = self.to_array(kper=kper, mask=True)
-            for name, array in arrays.items():
-                m4ds[name][kper, :, :, :] = array
+        for name, m4d in self.masked_4D_arrays_view.items():
+            m4ds[name] = np.array(m4d)
         return m4ds
 
     def masked_4D_arrays_itr(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
-
-        # initialize these big arrays
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            for kper in range(1, self.model.nper):
-                arrays = self.to_array(kper=kper, mask=True)
-                for tname, array in arrays.items():
-                    if tname == name:
-                        m4d[kper, :, :, :] = array
-            yield name, m4d
+        for name, m4d in self.masked_4D_arrays_view.items():
+            yield name, np.array(m4d)
 
     @property
     def array(self):
@@ -1105,45 +1263,44 @@ class MfList(object):
         ----------
             dtype : numpy dtype
 
-            m4ds : dict {name:masked numpy 4-dim ndarray}
+            m4ds : dict {name:masked numpy 4-dim ndarray or Transient4dView}
         Returns
         -------
             dict {kper:recarray}
         """
         assert isinstance(m4ds, dict)
+        compact = {}
         for name, m4d in m4ds.items():
-            assert isinstance(m4d, np.ndarray)
+            assert isinstance(m4d, (np.ndarray, Transient4dView))
             assert name in dtype.names
             assert m4d.ndim == 4
+            if isinstance(m4d, Transient4dView):
+                compact[name] = (m4d.kper_index, m4d.arrays)
+            else:
+                compact[name] = (np.arange(m4d.shape[0]), m4d)
         keys = list(m4ds.keys())
 
-        for i1, key1 in enumerate(keys):
-            a1 = np.isnan(m4ds[key1])
-            for i2, key2 in enumerate(keys[i1:]):
-                a2 = np.isnan(m4ds[key2])
-                if not np.array_equal(a1, a2):
-                    raise Exception("Transient2d error: masking not equal" + \
-                                    " for {0} and {1}".format(key1, key2))
-
         sp_data = {}
+        last = None
         for kper in range(m4d.shape[0]):
-            vals = {}
-            for name, m4d in m4ds.items():
-                arr = m4d[kper, :, :, :]
-                isnan = np.argwhere(~np.isnan(arr))
-                v = []
-                for k, i, j in isnan:
-                    v.append(arr[k, i, j])
-                vals[name] = v
-                kk = isnan[:, 0]
-                ii = isnan[:, 1]
-                jj = isnan[:, 2]
-
-            spd = np.recarray(shape=isnan.shape[0], dtype=dtype)
+            # stress periods with the same arrays as the previous stress
+            # period reuse the previous entry
+            entry = tuple(compact[key][0][kper] for key in keys)
+            if entry == last:
+                continue
+            last = entry
+            arrays = [compact[key][1][idx] for key, idx in zip(keys, entry)]
+            isnan = np.isnan(arrays[0])
+            for key, arr in zip(keys[1:], arrays[1:]):
+                if not np.array_equal(isnan, np.isnan(arr)):
+                    raise Exception("Transient2d error: masking not equal" + \
+                                    " for {0} and {1}".format(keys[0], key))
+            kk, ii, jj = np.nonzero(~isnan)
+            spd = np.recarray(shape=kk.shape[0], dtype=dtype)
             spd["i"] = ii
             spd["k"] = kk
             spd["j"] = jj
-            for n, v in vals.items():
-                spd[n] = v
+            for name, arr in zip(keys, arrays):
+                spd[name] = np.asarray(arr)[kk, ii, jj]
             sp_data[kper] = spd
         return sp_data